@@ -20,6 +20,7 @@ from models.user import User
 from models.order import Order
 from models.payment import Payment
 from models.chat_message import ChatMessage
+from models.geocode_cache import GeocodeCacheEntry
 from config import AstroConfig
 
 # this is the Alembic Config object
@@ -0,0 +1,48 @@
+"""Add geocode_cache table
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Create geocode_cache table
+    op.create_table(
+        'geocode_cache',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('cache_key', sa.String(length=255), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('location_data', postgresql.JSON(astext_type=sa.Text()), nullable=False),
+        sa.Column('hit_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('kind', 'cache_key', name='uq_geocode_cache_kind_key')
+    )
+    
+    # Create indices
+    op.create_index(op.f('ix_geocode_cache_id'), 'geocode_cache', ['id'], unique=False)
+    op.create_index(op.f('ix_geocode_cache_hit_count'), 'geocode_cache', ['hit_count'], unique=False)
+
+
+def downgrade() -> None:
+    # Drop indices
+    op.drop_index(op.f('ix_geocode_cache_hit_count'), table_name='geocode_cache')
+    op.drop_index(op.f('ix_geocode_cache_id'), table_name='geocode_cache')
+    
+    # Drop table
+    op.drop_table('geocode_cache')
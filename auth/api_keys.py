@@ -0,0 +1,49 @@
+"""Partner API keys for the batch chart API"""
+
+import hmac
+from typing import Dict, Optional
+
+from config import AstroConfig, logger
+
+
+class ApiPartner:
+    """A B2B partner identified by an API key, with its own batch quota."""
+
+    def __init__(self, name: str, requests_per_hour: int):
+        self.name = name
+        self.requests_per_hour = requests_per_hour
+
+
+class PartnerKeyStore:
+    """API keys parsed from "name:key[:requests_per_hour],..." (malformed entries are skipped)."""
+
+    def __init__(self, spec: str, default_requests_per_hour: int):
+        self._partners: Dict[str, ApiPartner] = {}
+        for entry in filter(None, (part.strip() for part in spec.split(","))):
+            fields = entry.split(":")
+            try:
+                if len(fields) not in (2, 3) or not fields[0] or not fields[1]:
+                    raise ValueError("expected name:key[:requests_per_hour]")
+                quota = int(fields[2]) if len(fields) == 3 else default_requests_per_hour
+            except ValueError as e:
+                logger.error(f"Ignoring malformed partner API key entry for '{fields[0]}': {e}")
+                continue
+            self._partners[fields[1]] = ApiPartner(fields[0], quota)
+
+    def __len__(self) -> int:
+        return len(self._partners)
+
+    def find(self, api_key: str) -> Optional[ApiPartner]:
+        """Partner owning the key, or None (constant-time comparison against every key)."""
+        match = None
+        for key, partner in self._partners.items():
+            if hmac.compare_digest(key.encode("utf-8"), api_key.encode("utf-8")):
+                match = partner
+        return match
+
+
+# Global partner key store
+partner_api_keys = PartnerKeyStore(
+    AstroConfig.AuthConfig.PARTNER_API_KEYS,
+    default_requests_per_hour=AstroConfig.ChartEngineConfig.CHART_BATCH_REQUESTS_PER_HOUR,
+)
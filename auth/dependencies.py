@@ -1,13 +1,15 @@
 """FastAPI dependencies for authentication"""
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import APIKeyHeader, HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from typing import Optional
 from database import get_db
+from auth.api_keys import partner_api_keys
 from auth.jwt_handler import get_current_user
 
 security = HTTPBearer()
+api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
 def get_current_user_dependency(
@@ -51,3 +53,30 @@ def get_optional_user(
         return user_data
     except Exception:
         return None
+
+
+def get_batch_caller(
+    api_key: Optional[str] = Depends(api_key_header),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> dict:
+    """Dependency for the batch chart API: a partner API key (X-API-Key) or an admin token"""
+    if api_key:
+        partner = partner_api_keys.find(api_key)
+        if partner is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid API key")
+        return {"caller": f"partner:{partner.name}", "requests_per_hour": partner.requests_per_hour}
+    
+    if credentials:
+        user_data = get_current_user(credentials.credentials)
+        if user_data.get("user_type") != "admin":
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Partner API key or admin access required"
+            )
+        return {"caller": f"admin:{user_data['user_id']}", "requests_per_hour": None}
+    
+    raise HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="API key required",
+        headers={"WWW-Authenticate": "ApiKey"},
+    )
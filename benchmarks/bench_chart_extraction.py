@@ -0,0 +1,108 @@
+"""Micro-benchmark: single-pass comprehensive chart extraction vs the per-component extractors.
+
+Calculates one chart with jyotishganit (not timed), then times turning it into
+the comprehensive payload:
+
+- per-component: planetary positions, lagna, houses, dasha, shadbala,
+  divisional charts and chart summary extracted one after another, each
+  walking the chart again (how get_comprehensive_chart used to work)
+- single-pass: _comprehensive_chart_from_chart
+
+Usage:
+    python benchmarks/bench_chart_extraction.py [--repeat 200] [--vargas d1,d9,d10]
+"""
+
+import argparse
+import os
+import sys
+import timeit
+
+# Add project root to path
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+sys.path.insert(0, _project_root)
+
+from tools.vedastro_tools import (
+    COMMON_DIVISIONAL_CHARTS,
+    _calculate_chart,
+    _chart_summary_from_chart,
+    _comprehensive_chart_from_chart,
+    _dasha_details_from_chart,
+    _divisional_charts_from_chart,
+    _house_positions_from_chart,
+    _lagna_details_from_chart,
+    _planetary_positions_from_chart,
+    _shadbala_details_from_chart,
+)
+
+# A typical order: Bengaluru, morning birth
+BIRTH = ("1990-05-15", "10:30", 12.9716, 77.5946, "Bengaluru, Karnataka, India")
+
+
+def per_component(chart, date_of_birth, time_of_birth, location_name, years_ahead=10, divisional_charts=None):
+    """The comprehensive payload assembled from the seven per-component extractors."""
+    planetary = _planetary_positions_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    lagna = _lagna_details_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    houses = _house_positions_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    dasha = _dasha_details_from_chart(chart, date_of_birth, time_of_birth, location_name, years_ahead=years_ahead)
+    shadbala = _shadbala_details_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    divisional = _divisional_charts_from_chart(
+        chart, date_of_birth, time_of_birth, location_name, chart_types=divisional_charts
+    )
+    summary = _chart_summary_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return {
+        "success": True,
+        "lagna": lagna.get("lagna", {}),
+        "dasha": {
+            "current_dasha": dasha.get("current_dasha"),
+            "upcoming_dashas": dasha.get("upcoming_dashas", []),
+        },
+        "shadbala": shadbala.get("shadbala", {}),
+        "planetary_positions": planetary.get("planetary_positions", {}),
+        "house_positions": houses.get("house_details", []),
+        "divisional_charts": divisional.get("divisional_charts", {}),
+        "panchanga": summary.get("panchanga", {}),
+        "rashi": summary.get("rashi", {}),
+        "ayanamsa": summary.get("ayanamsa"),
+        "birth_time": f"{date_of_birth} {time_of_birth}",
+        "location": location_name,
+    }
+
+
+def _time_per_call(func, repeat: int) -> float:
+    """Best-of-5 average seconds per call."""
+    return min(timeit.repeat(func, number=repeat, repeat=5)) / repeat
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=200, help="Calls per timing run")
+    parser.add_argument("--vargas", default=",".join(COMMON_DIVISIONAL_CHARTS), help="Comma-separated divisional charts")
+    args = parser.parse_args()
+
+    date_of_birth, time_of_birth, latitude, longitude, location_name = BIRTH
+    vargas = [v.strip() for v in args.vargas.split(",") if v.strip()]
+
+    print("Calculating chart (not timed)...")
+    chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
+
+    def run_per_component():
+        return per_component(chart, date_of_birth, time_of_birth, location_name, divisional_charts=vargas)
+
+    def run_single_pass():
+        return _comprehensive_chart_from_chart(chart, date_of_birth, time_of_birth, location_name, divisional_charts=vargas)
+
+    if run_per_component() != run_single_pass():
+        print("WARNING: single-pass payload differs from the per-component payload")
+
+    per_component_s = _time_per_call(run_per_component, args.repeat)
+    single_pass_s = _time_per_call(run_single_pass, args.repeat)
+
+    print(f"Divisional charts: {', '.join(vargas)}")
+    print(f"per-component extraction: {per_component_s * 1e6:9.1f} us/chart")
+    print(f"single-pass extraction:   {single_pass_s * 1e6:9.1f} us/chart")
+    print(f"speedup:                  {per_component_s / single_pass_s:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
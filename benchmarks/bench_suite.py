@@ -0,0 +1,262 @@
+"""Benchmark suite for the astro hot paths, with JSON baselines and regression gates.
+
+Cases (each run over fixed birth-data fixtures spanning latitudes and centuries):
+
+- calculate_chart: jyotishganit chart calculation (_calculate_chart)
+- extract.*: each extractor in tools/vedastro_tools.py on a calculated chart
+- get_comprehensive_chart: end to end with the chart cache disabled (chart
+  engine in thread mode) and with a warm in-memory cache
+- serialize_datetime: order analysis_data serialization of a real chart payload
+- format_markdown_to_html: email rendering of a full report (data/sample_report.md)
+
+Per case it reports p50/p95/p99 latency and tracemalloc peak/retained
+allocations per call. --save writes a JSON baseline; --compare checks the
+current run against one and exits 1 if any case's p50 regressed by more than
+--threshold.
+
+Usage:
+    python benchmarks/bench_suite.py [--filter extract] [--save baseline.json]
+    python benchmarks/bench_suite.py --compare baseline.json [--threshold 0.15]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# In-process chart engine and no disk cache, so timings measure this process only
+os.environ.setdefault("CHART_WORKERS", "0")
+os.environ.setdefault("CHART_CACHE_DISK_ENABLED", "false")
+
+# Add project root to path
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+sys.path.insert(0, _project_root)
+
+import numpy as np
+
+from services.email_service import format_markdown_to_html
+from services.order_service import serialize_datetime
+from tools.chart_cache import chart_cache
+from tools.vedastro_tools import (
+    COMMON_DIVISIONAL_CHARTS,
+    _calculate_chart,
+    _chart_summary_from_chart,
+    _comprehensive_chart_from_chart,
+    _dasha_details_from_chart,
+    _divisional_charts_from_chart,
+    _house_positions_from_chart,
+    _lagna_details_from_chart,
+    _planetary_positions_from_chart,
+    _shadbala_details_from_chart,
+    get_comprehensive_chart,
+)
+
+# (date, time IST, latitude, longitude, place): tropics to high latitudes, both
+# hemispheres, 1900s to 2040s (de421 covers 1899-2053)
+BIRTH_FIXTURES: List[Tuple[str, str, float, float, str]] = [
+    ("1990-05-15", "10:30", 12.9716, 77.5946, "Bengaluru, India"),
+    ("1955-11-02", "04:10", 28.6139, 77.2090, "New Delhi, India"),
+    ("2024-02-29", "23:55", 19.0760, 72.8777, "Mumbai, India"),
+    ("1905-07-21", "06:00", 60.1699, 24.9384, "Helsinki, Finland"),
+    ("1975-03-21", "12:00", 64.1466, -21.9426, "Reykjavik, Iceland"),
+    ("1921-03-10", "18:45", -54.8019, -68.3030, "Ushuaia, Argentina"),
+    ("2001-09-09", "00:15", -0.1807, -78.4678, "Quito, Ecuador"),
+    ("2040-01-01", "08:20", -33.8688, 151.2093, "Sydney, Australia"),
+]
+
+SAMPLE_REPORT_PATH = os.path.join(_script_dir, "data", "sample_report.md")
+
+DEFAULT_THRESHOLD = 0.15
+
+
+class Case:
+    """One benchmark: call(i) runs the i-th sample (cycling through fixtures)."""
+
+    def __init__(self, name: str, call: Callable[[int], Any], iterations: int):
+        self.name = name
+        self.call = call
+        self.iterations = iterations
+
+
+def _fixture(i: int) -> Tuple[str, str, float, float, str]:
+    return BIRTH_FIXTURES[i % len(BIRTH_FIXTURES)]
+
+
+def build_cases(scale: float) -> List[Case]:
+    """Calculate the fixture charts (not timed) and build every case."""
+    print(f"Calculating {len(BIRTH_FIXTURES)} fixture charts (not timed)...")
+    charts = [_calculate_chart(*fixture) for fixture in BIRTH_FIXTURES]
+    payloads = [
+        _comprehensive_chart_from_chart(chart, dob, tob, place, divisional_charts=COMMON_DIVISIONAL_CHARTS)
+        for chart, (dob, tob, _, _, place) in zip(charts, BIRTH_FIXTURES)
+    ]
+    with open(SAMPLE_REPORT_PATH, encoding="utf-8") as f:
+        report = f.read()
+
+    def n(iterations: int) -> int:
+        return max(len(BIRTH_FIXTURES), int(iterations * scale))
+
+    def extractor_case(name: str, extractor: Callable[..., Any], **kwargs: Any) -> Case:
+        def call(i: int) -> Any:
+            dob, tob, _, _, place = _fixture(i)
+            return extractor(charts[i % len(charts)], dob, tob, place, **kwargs)
+        return Case(f"extract.{name}", call, n(500))
+
+    loop = asyncio.new_event_loop()
+
+    def comprehensive(i: int) -> Any:
+        dob, tob, lat, lon, place = _fixture(i)
+        return loop.run_until_complete(get_comprehensive_chart(dob, tob, lat, lon, place))
+
+    def comprehensive_uncached(i: int) -> Any:
+        chart_cache.enabled = False
+        try:
+            return comprehensive(i)
+        finally:
+            chart_cache.enabled = True
+
+    # Warm the in-memory cache for the cached case
+    for i in range(len(BIRTH_FIXTURES)):
+        comprehensive(i)
+
+    return [
+        Case("calculate_chart", lambda i: _calculate_chart(*_fixture(i)), n(16)),
+        extractor_case("planetary_positions", _planetary_positions_from_chart),
+        extractor_case("house_positions", _house_positions_from_chart),
+        extractor_case("lagna", _lagna_details_from_chart),
+        extractor_case("dasha", _dasha_details_from_chart),
+        extractor_case("shadbala", _shadbala_details_from_chart),
+        extractor_case("divisional_charts", _divisional_charts_from_chart, chart_types=COMMON_DIVISIONAL_CHARTS),
+        extractor_case("chart_summary", _chart_summary_from_chart),
+        extractor_case("comprehensive", _comprehensive_chart_from_chart),
+        Case("get_comprehensive_chart.uncached", comprehensive_uncached, n(16)),
+        Case("get_comprehensive_chart.cached", comprehensive, n(2000)),
+        Case("serialize_datetime", lambda i: serialize_datetime(payloads[i % len(payloads)]), n(2000)),
+        Case("format_markdown_to_html", lambda i: format_markdown_to_html(report), n(500)),
+    ]
+
+
+def run_case(case: Case) -> Dict[str, Any]:
+    """Time every call separately, then measure allocations of one call per fixture."""
+    case.call(0)  # warm-up (imports, lazy caches)
+
+    samples = np.empty(case.iterations)
+    for i in range(case.iterations):
+        start = time.perf_counter_ns()
+        case.call(i)
+        samples[i] = time.perf_counter_ns() - start
+    samples /= 1e3  # microseconds
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    try:
+        for i in range(len(BIRTH_FIXTURES)):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            result = case.call(i)
+            current, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+            retained.append(current - before)
+            del result
+    finally:
+        tracemalloc.stop()
+
+    p50, p95, p99 = np.percentile(samples, [50, 95, 99])
+    return {
+        "n": case.iterations,
+        "mean_us": float(samples.mean()),
+        "p50_us": float(p50),
+        "p95_us": float(p95),
+        "p99_us": float(p99),
+        "alloc_peak_kib": float(np.median(peaks)) / 1024,
+        "alloc_retained_kib": float(np.median(retained)) / 1024,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=_project_root,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_results(results: Dict[str, Dict[str, Any]]) -> None:
+    print(f"\n{'case':<36}{'n':>7}{'p50 us':>12}{'p95 us':>12}{'p99 us':>12}{'peak KiB':>11}{'kept KiB':>11}")
+    for name, r in results.items():
+        print(
+            f"{name:<36}{r['n']:>7}{r['p50_us']:>12.1f}{r['p95_us']:>12.1f}{r['p99_us']:>12.1f}"
+            f"{r['alloc_peak_kib']:>11.1f}{r['alloc_retained_kib']:>11.1f}"
+        )
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print p50 changes against a baseline and return the names of regressed cases."""
+    print(f"\nCompared with baseline {baseline.get('meta', {}).get('commit') or '(unknown commit)'} "
+          f"(regression threshold {threshold:.0%} on p50):")
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        if base is None:
+            print(f"  {name:<36} new case")
+            continue
+        change = r["p50_us"] / base["p50_us"] - 1 if base["p50_us"] else 0.0
+        status = "REGRESSION" if change > threshold else ""
+        print(f"  {name:<36}{base['p50_us']:>12.1f} -> {r['p50_us']:>10.1f} us  {change:+7.1%}  {status}")
+        if status:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this substring")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every case's iteration count")
+    parser.add_argument("--save", help="Write results to this JSON baseline file")
+    parser.add_argument("--compare", help="Compare against this JSON baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Allowed p50 slowdown (0.15 = 15%%)")
+    args = parser.parse_args()
+
+    cases = [case for case in build_cases(args.scale) if args.filter in case.name]
+    results = {}
+    for case in cases:
+        print(f"Running {case.name} ({case.iterations} calls)...")
+        results[case.name] = run_case(case)
+    _print_results(results)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "commit": _git_commit(),
+                    "created_at": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "platform": platform.platform(),
+                    "fixtures": len(BIRTH_FIXTURES),
+                },
+                "results": results,
+            }, f, indent=2)
+        print(f"\nSaved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} case(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
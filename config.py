@@ -43,6 +43,9 @@ class AstroConfig:
         ANALYSIS_PRICE = float(os.getenv("ANALYSIS_PRICE", "10.00"))  # Default ₹10
         QUERY_PRICE = float(os.getenv("QUERY_PRICE", "5.00"))  # Default ₹5 (50% of analysis price)
         
+        # Local directory for on-disk caches
+        CACHE_DIR = os.getenv("ASTRO_CACHE_DIR", ".cache")
+        
         @staticmethod
         def validate_google_credentials() -> bool:
             """Validate that Google AI API key is configured"""
@@ -76,6 +79,9 @@ class AstroConfig:
         # Admin
         ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@astroguru.ai")
         ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")  # Should be hashed
+        
+        # Partner API keys for the batch chart API: "name:key[:requests_per_hour],..."
+        PARTNER_API_KEYS = os.getenv("PARTNER_API_KEYS", "")
     
     class CORSConfig:
         """CORS configuration"""
@@ -88,4 +94,128 @@ class AstroConfig:
         RAZORPAY_KEY_ID = os.getenv("RAZORPAY_KEY_ID", "")
         RAZORPAY_KEY_SECRET = os.getenv("RAZORPAY_KEY_SECRET", "")
         RAZORPAY_WEBHOOK_SECRET = os.getenv("RAZORPAY_WEBHOOK_SECRET", "")
-
+    
+    class ChartEngineConfig:
+        """Chart calculation engine configuration"""
+        # Worker processes for jyotishganit calculations (0 = run in a thread instead)
+        CHART_WORKERS = int(os.getenv("CHART_WORKERS", str(min(4, os.cpu_count() or 1))))
+        # Load ephemeris data in each worker at startup instead of on the first order
+        CHART_WORKER_WARMUP = os.getenv("CHART_WORKER_WARMUP", "true").lower() == "true"
+        # Separate worker pool for the batch chart API, so batches never take workers from paid orders
+        # (default: the cores CHART_WORKERS leaves free, at least 1; 0 = run batch charts in a thread)
+        CHART_BATCH_WORKERS = int(os.getenv("CHART_BATCH_WORKERS", str(max(1, (os.cpu_count() or 1) - CHART_WORKERS))))
+        # Batch chart API (partner API keys or admins): records per request, and charts in flight
+        # across all batches (0 = one per batch worker)
+        CHART_BATCH_MAX_RECORDS = int(os.getenv("CHART_BATCH_MAX_RECORDS", "1000"))
+        CHART_BATCH_CONCURRENCY = int(os.getenv("CHART_BATCH_CONCURRENCY", "0"))
+        # Batch requests per caller per hour (0 = unlimited; partner keys may set their own)
+        CHART_BATCH_REQUESTS_PER_HOUR = int(os.getenv("CHART_BATCH_REQUESTS_PER_HOUR", "10"))
+    
+    class ChartCacheConfig:
+        """Birth chart cache configuration"""
+        CHART_CACHE_ENABLED = os.getenv("CHART_CACHE_ENABLED", "true").lower() == "true"
+        # In-memory LRU size (number of charts)
+        CHART_CACHE_MAX_ENTRIES = int(os.getenv("CHART_CACHE_MAX_ENTRIES", "256"))
+        # Decimal places kept for lat/lon in the cache key (4 = ~11 m)
+        CHART_CACHE_COORD_PRECISION = int(os.getenv("CHART_CACHE_COORD_PRECISION", "4"))
+        # Persistent SQLite tier under CACHE_DIR
+        CHART_CACHE_DISK_ENABLED = os.getenv("CHART_CACHE_DISK_ENABLED", "true").lower() == "true"
+        CHART_CACHE_DISK_MAX_ENTRIES = int(os.getenv("CHART_CACHE_DISK_MAX_ENTRIES", "10000"))
+    
+    class RouterConfig:
+        """Router node intent classification"""
+        # Classify fresh-conversation intents locally (rules + n-gram model) before asking the LLM
+        ROUTER_FAST_PATH_ENABLED = os.getenv("ROUTER_FAST_PATH_ENABLED", "true").lower() == "true"
+        # Below this confidence the router falls back to the LLM
+        ROUTER_CONFIDENCE_THRESHOLD = float(os.getenv("ROUTER_CONFIDENCE_THRESHOLD", "0.8"))
+        # Trained model (scripts/train_router_classifier.py); default CACHE_DIR/router_model.json
+        ROUTER_MODEL_PATH = os.getenv("ROUTER_MODEL_PATH", "")
+        # Append LLM routing decisions to CACHE_DIR/router_decisions.jsonl as training data
+        ROUTER_DECISION_LOG_ENABLED = os.getenv("ROUTER_DECISION_LOG_ENABLED", "false").lower() == "true"
+    
+    class MainNodeConfig:
+        """Birth-detail collection (main node)"""
+        # Give the model a schema-constrained record_birth_details function (text JSON is still parsed as a fallback)
+        MAIN_NODE_STRUCTURED_OUTPUT = os.getenv("MAIN_NODE_STRUCTURED_OUTPUT", "true").lower() == "true"
+    
+    class GeocodingConfig:
+        """Nominatim (OpenStreetMap) geocoding gateway"""
+        NOMINATIM_URL = os.getenv("NOMINATIM_URL", "https://nominatim.openstreetmap.org")
+        # Required by Nominatim's usage policy, should include contact details
+        NOMINATIM_USER_AGENT = os.getenv("NOMINATIM_USER_AGENT", "AstroGuru-AI/1.0 (Contact: support@example.com)")
+        # Process-wide token bucket (the public server allows at most 1 request per second)
+        NOMINATIM_RATE_PER_SECOND = float(os.getenv("NOMINATIM_RATE_PER_SECOND", "1.0"))
+        NOMINATIM_BURST = float(os.getenv("NOMINATIM_BURST", "1"))
+        # Retries after a 429/509 (backoff honours Retry-After, else 2 s doubling)
+        NOMINATIM_MAX_RETRIES = int(os.getenv("NOMINATIM_MAX_RETRIES", "2"))
+        NOMINATIM_TIMEOUT_SECONDS = float(os.getenv("NOMINATIM_TIMEOUT_SECONDS", "10"))
+    
+    class LocationConfig:
+        """Birth place resolution (location node)"""
+        # In-process LRU of resolved places and coordinates (in front of the geocode_cache table)
+        LOCATION_CACHE_MAX_ENTRIES = int(os.getenv("LOCATION_CACHE_MAX_ENTRIES", "2048"))
+        # Persist geocoder results in the geocode_cache table
+        GEOCODE_CACHE_DB_ENABLED = os.getenv("GEOCODE_CACHE_DB_ENABLED", "true").lower() == "true"
+        # Most-used geocode_cache rows loaded into memory at startup
+        GEOCODE_CACHE_WARM_ENTRIES = int(os.getenv("GEOCODE_CACHE_WARM_ENTRIES", "1000"))
+        # Decimal places of lat/lon in reverse-geocoding keys (4 = ~11 m)
+        GEOCODE_CACHE_COORD_PRECISION = int(os.getenv("GEOCODE_CACHE_COORD_PRECISION", "4"))
+        # Extra gazetteer TSV (scripts/build_gazetteer.py) loaded after the bundled tools/data/gazetteer.tsv
+        GAZETTEER_EXTRA_PATH = os.getenv("GAZETTEER_EXTRA_PATH", "")
+        # Timezone grid (scripts/build_timezone_grid.py); default: the bundled tools/data/timezone_grid.npy
+        TIMEZONE_GRID_PATH = os.getenv("TIMEZONE_GRID_PATH", "")
+        # Read birth times in the birthplace's zone (zoneinfo, historical offsets) instead of fixed IST;
+        # only grid/timezonefinder zones are used, anything less precise falls back to IST
+        CHART_LOCAL_TIMEZONE = os.getenv("CHART_LOCAL_TIMEZONE", "false").lower() == "true"
+        # Ask the LLM to pick among equally likely geocoder matches for an unqualified name
+        LOCATION_LLM_DISAMBIGUATION = os.getenv("LOCATION_LLM_DISAMBIGUATION", "true").lower() == "true"
+        # Fall back to the tool-calling agent when the geocoder fails
+        LOCATION_AGENT_FALLBACK = os.getenv("LOCATION_AGENT_FALLBACK", "true").lower() == "true"
+    
+    class LLMCacheConfig:
+        """Exact-match cache of node LLM responses"""
+        LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+        # In-memory LRU size (number of responses)
+        LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+        # Persistent SQLite tier under CACHE_DIR
+        LLM_CACHE_DISK_ENABLED = os.getenv("LLM_CACHE_DISK_ENABLED", "true").lower() == "true"
+        LLM_CACHE_DISK_MAX_ENTRIES = int(os.getenv("LLM_CACHE_DISK_MAX_ENTRIES", "20000"))
+        # Default entry lifetime, and per-node overrides as "node=seconds,..." (0 disables a node)
+        LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+        LLM_CACHE_NODE_TTLS = os.getenv(
+            "LLM_CACHE_NODE_TTLS",
+            "router=604800,location=604800,main=3600,chat=3600,query_chat=3600"
+        )
+    
+    class ChartReportConfig:
+        """Birth chart report (chart_format node) configuration"""
+        # The report is rendered from a template; optionally add an LLM interpretation to its Chart Summary
+        CHART_SUMMARY_LLM = os.getenv("CHART_SUMMARY_LLM", "false").lower() == "true"
+    
+    class PromptEncodingConfig:
+        """Compact prompt encoding configuration"""
+        # Fraction of prompt builds measured against the indented-JSON form for the admin stats
+        # (every build is measured when DEBUG logging is on)
+        PROMPT_COMPACTION_SAMPLE_RATE = float(os.getenv("PROMPT_COMPACTION_SAMPLE_RATE", "0.01"))
+    
+    class TransitConfig:
+        """Gochara (transit) table configuration"""
+        # Span of the precomputed ingress table (clipped to the ephemeris: de421 covers 1899-2053)
+        TRANSIT_START_YEAR = int(os.getenv("TRANSIT_START_YEAR", "1900"))
+        TRANSIT_END_YEAR = int(os.getenv("TRANSIT_END_YEAR", "2050"))
+        # Transit window rendered into prompts, from the report date
+        GOCHARA_YEARS_AHEAD = int(os.getenv("GOCHARA_YEARS_AHEAD", "7"))
+        # Transit-to-natal events: conjunction orb (degrees) and planets cited in prompts
+        TRANSIT_CONJUNCTION_ORB = float(os.getenv("TRANSIT_CONJUNCTION_ORB", "3.0"))
+        TRANSIT_EVENT_PLANETS = os.getenv("TRANSIT_EVENT_PLANETS", "Jupiter,Saturn,Rahu,Ketu").split(",")
+    
+    class GoalAnalysisConfig:
+        """Per-goal analysis configuration"""
+        # Goal LLM calls in flight at once per report
+        GOAL_ANALYSIS_CONCURRENCY = int(os.getenv("GOAL_ANALYSIS_CONCURRENCY", "4"))
+        # Cache of per-goal analyses keyed by (chart fingerprint, goal, prompt version)
+        GOAL_CACHE_ENABLED = os.getenv("GOAL_CACHE_ENABLED", "true").lower() == "true"
+        GOAL_CACHE_MAX_ENTRIES = int(os.getenv("GOAL_CACHE_MAX_ENTRIES", "512"))
+        GOAL_CACHE_DISK_ENABLED = os.getenv("GOAL_CACHE_DISK_ENABLED", "true").lower() == "true"
+        # Forecasts are relative to the report date, so cached analyses expire
+        GOAL_CACHE_TTL_DAYS = float(os.getenv("GOAL_CACHE_TTL_DAYS", "30"))
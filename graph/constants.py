@@ -1,7 +1,15 @@
 """Constants for AstroGuru AI - Gochara (Planetary Transits) Data"""
 
+from datetime import date
+from typing import Optional, Union
+
+from config import logger
+from tools.transit_engine import build_gochara_transits
+
 # Gochara (Planetary Transit) Data
-# These transits are used to provide context for predictions in goal analysis, recommendations, and summaries
+# These transits are used to provide context for predictions in goal analysis, recommendations, and summaries.
+# The transit periods are computed from the ephemeris by tools/transit_engine.py for each report's
+# window; the hand-written blocks below are only a fallback until the transit table is built.
 
 GOCHARA_JUPITER = """
 Jupiter Gochara (Transits):
@@ -53,20 +61,42 @@ Ketu Gochara (Transits):
 - Aries: From July 31, 2031 to February 16, 2033
 """
 
-# Combined gochara context for use in nodes
-GOCHARA_CONTEXT = f"""
+GOCHARA_CONTEXT_TEMPLATE = """
 **IMPORTANT: Gochara (Planetary Transit) Context for Predictions**
 
 When making predictions and recommendations, you MUST consider the following planetary transits (Gochara) along with the Dasha periods:
 
-{GOCHARA_JUPITER}
+{transits}
 
-{GOCHARA_SATURN}
+When providing dates and time periods in your analysis, reference the specific Gochara transit periods above to make accurate predictions.
+"""
 
-{GOCHARA_RAHU}
+# Static gochara context (fallback when the transit table is unavailable)
+GOCHARA_CONTEXT = GOCHARA_CONTEXT_TEMPLATE.format(
+    transits=f"{GOCHARA_JUPITER}\n\n{GOCHARA_SATURN}\n\n{GOCHARA_RAHU}\n\n{GOCHARA_KETU}"
+)
 
-{GOCHARA_KETU}
+# Marker embedded in node system prompts; replaced at call time by with_gochara_context()
+GOCHARA_PLACEHOLDER = "<<GOCHARA_CONTEXT>>"
 
-When providing dates and time periods in your analysis, reference the specific Gochara transit periods above to make accurate predictions.
-"""
+
+def get_gochara_context(start: Optional[Union[date, str]] = None) -> str:
+    """Gochara context for the window starting at `start` (default: today).
+    
+    Uses the computed transit table; falls back to the static GOCHARA_CONTEXT
+    if the table has not been built yet.
+    """
+    try:
+        transits = build_gochara_transits(start or None)
+    except Exception as e:
+        logger.warning(f"Failed to compute gochara transits, using static context: {e}")
+        transits = None
+    if not transits:
+        return GOCHARA_CONTEXT
+    return GOCHARA_CONTEXT_TEMPLATE.format(transits=transits)
+
+
+def with_gochara_context(prompt: str, start: Optional[Union[date, str]] = None) -> str:
+    """Fill the GOCHARA_PLACEHOLDER in a system prompt with the gochara context for a window."""
+    return prompt.replace(GOCHARA_PLACEHOLDER, get_gochara_context(start))
 
@@ -1,123 +1,36 @@
 """Chart node: Generates Vedic astrology charts"""
 
 from typing import Dict, Any
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
 from config import AstroConfig, logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
 
 # Import tools
 from tools.vedastro_tools import get_comprehensive_chart
+from tools.chart_snapshot import pack_chart_data
+from tools.chart_report import render_chart_markdown
 
 
-CHART_NODE_SYSTEM_PROMPT = """
+CHART_SUMMARY_SYSTEM_PROMPT = """
 You are a Professional Vedic Astrology Chart Analyst.
 
-Your role is to format raw chart data from jyotishganit into a comprehensive, readable markdown format.
+You are given a birth chart report (Lagna, Rashi, planetary positions, whole-sign houses
+and key highlights). Write the interpretation paragraph for its Chart Summary section:
+one or two short paragraphs on the overall character of the chart and its key highlights.
 
-**CRITICAL OUTPUT FORMAT REQUIREMENTS:**
-
-You MUST create a chart analysis with the following EXACT structure:
-
-# Birth Chart Analysis
-
-## Personal Information
-- **Name**: [Full Name]
-- **Date of Birth**: [YYYY-MM-DD]
-- **Time of Birth**: [HH:MM] (IST)
-- **Place of Birth**: [Location Name]
-
-## Lagna (Ascendant)
-- **Sign**: [Sign Name] (e.g., Scorpio)
-- **Degree**: [X]° [Y]′ [Z]″ (e.g., 04° 33′ 21″)
-- **Lord**: [Planet Name] (e.g., Mars for Scorpio)
-- **Nakshatra**: [Nakshatra Name] [Pada] (e.g., Anuradha 1)
-
-## Rashi (Moon Sign)
-- **Sign**: [Sign Name]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-## Planetary Positions
-
-### Sun
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Degree**: [X]° [Y]′ [Z]″
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Moon
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Mars
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Mercury
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Jupiter
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Venus
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Saturn
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Rahu
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-### Ketu
-- **Sign**: [Sign Name]
-- **House**: [House Number]
-- **Nakshatra**: [Nakshatra Name] [Pada]
-
-## House Positions
-
-[For each house (1-12), list the sign, lord, and occupants]
-
-### House 1 (Lagna)
-- **Sign**: [Sign Name]
-- **Lord**: [Planet Name]
-- **Occupants**: [List of planets]
-
-[Repeat for all 12 houses]
-
-## Chart Summary
-[Overall interpretation and key highlights]
-
-**IMPORTANT**: 
-- Use the EXACT section headers shown above
-- Calculate house positions using whole-sign house system based on Lagna sign
-- Convert degrees from decimal to degrees/minutes/seconds format (e.g., 4.555833° = 4° 33′ 21″)
-- Include ALL planets and ALL houses
-- Make it professional, clear, and well-organized
+**IMPORTANT**:
+- Output only the paragraph text - no headers, no lists, no repetition of the positions
+- Base every statement on the positions given; do not invent placements
+- Keep it professional, clear and under 200 words
 """
 
 
 def create_chart_node_llm():
     """Create the LLM for the chart node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
 
 
 async def chart_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -169,53 +82,11 @@ async def chart_node(state: AstroGuruState) -> Dict[str, Any]:
         
         logger.info(f"Chart node: Chart generated successfully - Lagna: {chart_result.get('lagna', {}).get('sign', 'N/A')}, Planets: {len(chart_result.get('planetary_positions', {}))}")
         
-        # Use LLM to format chart data into readable markdown
-        try:
-            logger.info("Chart node: Formatting chart data with LLM")
-            llm = create_chart_node_llm()
-            
-            # Build prompt with chart data
-            chart_data_json = json.dumps(chart_result, indent=2, default=str)
-            prompt = f"""Format the following chart data into a comprehensive markdown report following the EXACT format specified in the system prompt.
-
-Birth Details:
-- Name: {name}
-- Date of Birth: {date_of_birth}
-- Time of Birth: {time_of_birth} (IST)
-- Place of Birth: {place_of_birth}
-
-Chart Data:
-{chart_data_json}
-
-**CRITICAL INSTRUCTIONS**:
-- Follow the EXACT section structure from the system prompt
-- Calculate house positions using whole-sign house system based on Lagna sign
-- Convert decimal degrees to degrees/minutes/seconds format
-- Include ALL planets and ALL houses
-- Use actual values from the chart data - do NOT use placeholders
-- Make it professional, clear, and well-organized"""
-            
-            response = await llm.ainvoke([
-                SystemMessage(content=CHART_NODE_SYSTEM_PROMPT),
-                HumanMessage(content=prompt)
-            ])
-            
-            chart_analysis = response.content
-            logger.info(f"Chart node: Chart analysis generated successfully, length: {len(chart_analysis)}")
-            
-            return {
-                "chart_data": chart_result,
-                "chart_data_analysis": chart_analysis,
-                "current_step": "dasha"
-            }
-        except Exception as e:
-            logger.error(f"Chart node: Error formatting chart with LLM: {e}", exc_info=True)
-            # Return chart data even if LLM formatting fails
-            return {
-                "chart_data": chart_result,
-                "chart_data_analysis": None,
-                "current_step": "dasha"
-            }
+        # Markdown formatting happens in chart_format_node, in parallel with the dasha node
+        return {
+            "chart_data": pack_chart_data(chart_result),
+            "current_step": "dasha"
+        }
     except ValueError as e:
         logger.error(f"Chart node: Validation error during chart generation: {e}", exc_info=True)
         return {"error": f"Chart generation validation error: {str(e)}"}
@@ -223,3 +94,42 @@ Chart Data:
         logger.error(f"Chart node: Unexpected exception during chart generation: {e}", exc_info=True)
         return {"error": f"Chart generation exception: {str(e)}"}
 
+
+async def chart_format_node(state: AstroGuruState) -> Dict[str, Any]:
+    """Chart format node: Renders the calculated chart as the markdown chart report.
+    
+    The report is rendered locally from a template (tools/chart_report.py).
+    With CHART_SUMMARY_LLM enabled, an LLM-written interpretation paragraph is
+    added to the Chart Summary section. The node only needs chart_data, so the
+    full-report workflow runs it in parallel with the dasha node.
+    """
+    logger.info("Chart format node: Starting chart formatting")
+    
+    birth_details = state.get("birth_details") or {}
+    chart_data = state.get("chart_data")
+    if not chart_data:
+        logger.warning("Chart format node: No chart data found, skipping")
+        return {}
+    
+    try:
+        chart_analysis = render_chart_markdown(chart_data, birth_details)
+    except Exception as e:
+        # The report continues without the formatted chart
+        logger.error(f"Chart format node: Error rendering chart report: {e}", exc_info=True)
+        return {"chart_data_analysis": None}
+    
+    if AstroConfig.ChartReportConfig.CHART_SUMMARY_LLM:
+        try:
+            logger.info("Chart format node: Generating chart summary interpretation with LLM")
+            llm = create_chart_node_llm()
+            response = await llm_cache.ainvoke("chart_format", llm, [
+                SystemMessage(content=CHART_SUMMARY_SYSTEM_PROMPT),
+                HumanMessage(content=chart_analysis)
+            ])
+            chart_analysis = render_chart_markdown(chart_data, birth_details, interpretation=response.content)
+        except Exception as e:
+            # Keep the rendered report without the interpretation paragraph
+            logger.error(f"Chart format node: Error generating chart summary interpretation: {e}", exc_info=True)
+    
+    logger.info(f"Chart format node: Chart analysis generated successfully, length: {len(chart_analysis)}")
+    return {"chart_data_analysis": chart_analysis}
@@ -1,12 +1,13 @@
 """Chat node: Handles normal chat with context after analysis"""
 
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
-from config import AstroConfig, logger
+from config import logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
-from graph.constants import GOCHARA_CONTEXT
+from graph.constants import GOCHARA_PLACEHOLDER, with_gochara_context
 
 
 CHAT_NODE_SYSTEM_PROMPT = f"""
@@ -40,7 +41,7 @@ You are a Professional Vedic Astrology Consultant helping users with astrology q
 - **Always consider the conversation history** - follow-up questions should be answered in context
 - Maintain continuity and coherence across the conversation
 
-{GOCHARA_CONTEXT}
+{GOCHARA_PLACEHOLDER}
 
 **When answering questions about transits, predictions, or timing:**
 - Use the Gochara (planetary transit) information provided above
@@ -52,12 +53,7 @@ You are a Professional Vedic Astrology Consultant helping users with astrology q
 
 def create_chat_node_llm():
     """Create the LLM for the chat node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
 
 
 async def chat_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -93,7 +89,7 @@ Use this context to answer questions about the user's specific horoscope. For ge
 You are in general chat mode. Answer questions about Vedic astrology in general. If the user wants their horoscope analyzed, guide them to provide birth details (name, date of birth, time of birth, place of birth)."""
     
     # Build conversation - SystemMessage must be first (position 0) for Gemini
-    conversation = [SystemMessage(content=system_content)]
+    conversation = [SystemMessage(content=with_gochara_context(system_content))]
     
     # Add conversation history (all messages to maintain full context)
     # This ensures follow-up questions have complete context including initial query
@@ -116,7 +112,7 @@ You are in general chat mode. Answer questions about Vedic astrology in general.
     try:
         llm = create_chat_node_llm()
         logger.info("Chat node: Calling LLM for chat response")
-        response = await llm.ainvoke(conversation)
+        response = await llm_cache.ainvoke("chat", llm, conversation)
         response_text = response.content
         logger.debug(f"Chat node: LLM response length: {len(response_text)}")
     except Exception as e:
@@ -1,11 +1,14 @@
 """Dasha node: Generates Vimshottari Dasha reports"""
 
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
-from config import AstroConfig, logger
+from config import logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
+from tools.dasha_engine import dasha_timeline_for_birth
+from tools.prompt_encoding import encode_dasha, report_compaction
 
 
 DASHA_NODE_SYSTEM_PROMPT = """
@@ -56,12 +59,7 @@ You MUST provide a comprehensive markdown-formatted Dasha analysis with the foll
 
 def create_dasha_node_llm():
     """Create the LLM for the dasha node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
 
 
 async def dasha_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -75,14 +73,27 @@ async def dasha_node(state: AstroGuruState) -> Dict[str, Any]:
         logger.warning("Dasha node: Missing birth details or chart data, skipping")
         return {"current_step": "chart"}
     
-    # Extract dasha information from chart_data - get full dasha data
-    dasha_info = chart_data.get("dasha", {})
+    # Compute the full Vimshottari timeline (mahadasha/antardasha/pratyantardasha)
+    # from the Moon's position; fall back to the chart tool's mahadasha summary
+    timeline = dasha_timeline_for_birth(
+        birth_details.get("date_of_birth"),
+        birth_details.get("time_of_birth"),
+        chart_data=chart_data
+    )
+    if timeline is not None:
+        dasha_info = timeline.to_dict(today=birth_details.get("today_date") or None, years_ahead=10)
+    else:
+        logger.warning("Dasha node: Moon position unavailable, using chart dasha summary")
+        dasha_info = chart_data.get("dasha", {})
     current_dasha = dasha_info.get("current_dasha")
     upcoming_dashas = dasha_info.get("upcoming_dashas", [])
     
-    # Get full dasha details if available
-    import json
-    dasha_data_full = json.dumps(dasha_info, indent=2, default=str) if dasha_info else "No dasha data available"
+    # Full dasha details as compact text
+    if dasha_info:
+        dasha_data_full = encode_dasha(dasha_info)
+        report_compaction("dasha", dasha_data_full, dasha_info)
+    else:
+        dasha_data_full = "No dasha data available"
     
     logger.debug(f"Dasha node: Current dasha: {current_dasha}, Upcoming dashas count: {len(upcoming_dashas)}")
     
@@ -110,7 +121,7 @@ Complete Dasha Data:
     
     try:
         logger.info("Dasha node: Calling LLM for Dasha analysis")
-        response = await llm.ainvoke([
+        response = await llm_cache.ainvoke("dasha", llm, [
             SystemMessage(content=DASHA_NODE_SYSTEM_PROMPT),
             HumanMessage(content=prompt)
         ])
@@ -120,6 +131,7 @@ Complete Dasha Data:
         
         return {
             "dasha_data": {
+                **dasha_info,
                 "current_dasha": current_dasha,
                 "upcoming_dashas": upcoming_dashas,
                 "analysis": dasha_analysis
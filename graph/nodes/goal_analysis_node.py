@@ -1,12 +1,19 @@
 """Goal analysis node: Analyzes horoscope for specific life goals"""
 
-from typing import Dict, Any
+import asyncio
+from typing import Dict, Any, Optional
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
 from config import AstroConfig, logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
-from graph.constants import GOCHARA_CONTEXT
+from graph.constants import GOCHARA_PLACEHOLDER, with_gochara_context
+from tools.transit_events import format_transit_events
+from tools.divisional_charts import DivisionalChartSet
+from tools.prompt_encoding import encode_chart, report_compaction
+from tools.goal_cache import chart_fingerprint, goal_analysis_cache, normalize_goal
 
 
 GOAL_ANALYSIS_NODE_SYSTEM_PROMPT = f"""
@@ -20,7 +27,7 @@ love life, health, education, finance, etc.) by analyzing:
 - Shadbala (planetary strength analysis)
 - Gochara (planetary transits) - CRITICAL for accurate predictions
 
-{GOCHARA_CONTEXT}
+{GOCHARA_PLACEHOLDER}
 
 **CRITICAL OUTPUT FORMAT REQUIREMENTS:**
 
@@ -73,18 +80,55 @@ You MUST provide analysis for each goal with the following EXACT structure:
 """
 
 
+# Bump when the goal prompts change so cached goal analyses are not reused
+GOAL_ANALYSIS_PROMPT_VERSION = 2
+
+
 def create_goal_analysis_node_llm():
     """Create the LLM for the goal analysis node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
+
+
+async def _analyze_goal(
+    llm: ChatGoogleGenerativeAI,
+    semaphore: asyncio.Semaphore,
+    goal: str,
+    cache_key: Optional[str],
+    system_prompt: str,
+    prompt: str
+) -> Optional[str]:
+    """Analyze one goal (cache first); None if the LLM call fails."""
+    if cache_key:
+        cached = await goal_analysis_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Goal analysis node: Cache hit for goal '{goal}'")
+            return cached
+    
+    async with semaphore:
+        try:
+            logger.info(f"Goal analysis node: Calling LLM for goal '{goal}'")
+            response = await llm_cache.ainvoke("goal_analysis", llm, [
+                SystemMessage(content=system_prompt),
+                HumanMessage(content=prompt)
+            ], prompt_version=GOAL_ANALYSIS_PROMPT_VERSION)
+        except Exception as e:
+            logger.error(f"Goal analysis node: Error analyzing goal '{goal}': {e}", exc_info=True)
+            return None
+    
+    analysis = response.content
+    if cache_key and analysis:
+        await goal_analysis_cache.set(cache_key, analysis)
+    return analysis
 
 
 async def goal_analysis_node(state: AstroGuruState) -> Dict[str, Any]:
-    """Goal analysis node: Analyzes horoscope for specific goals"""
+    """Goal analysis node: Analyzes horoscope for specific goals.
+    
+    Each goal gets its own LLM call (up to GOAL_ANALYSIS_CONCURRENCY at once)
+    with only the vargas that goal needs, and its result is cached by
+    (chart fingerprint, goal, GOAL_ANALYSIS_PROMPT_VERSION). Results are
+    merged in the order the goals were given.
+    """
     logger.info("Goal analysis node: Starting goal analysis")
     
     birth_details = state.get("birth_details")
@@ -96,6 +140,14 @@ async def goal_analysis_node(state: AstroGuruState) -> Dict[str, Any]:
         return {"current_step": "dasha"}
     
     goals = birth_details.get("goals", [])
+    if isinstance(goals, str):
+        goals = [g.strip() for g in goals.split(",")]
+    # Drop blanks and repeats ("Career" and "career " are one goal)
+    unique_goals = {}
+    for goal in goals:
+        if normalize_goal(goal):
+            unique_goals.setdefault(normalize_goal(goal), str(goal).strip())
+    goals = list(unique_goals.values())
     if not goals:
         # Provide general life analysis
         goals = ["general"]
@@ -106,64 +158,91 @@ async def goal_analysis_node(state: AstroGuruState) -> Dict[str, Any]:
     # Use LLM to generate goal-specific analysis
     llm = create_goal_analysis_node_llm()
     
-    # Prepare FULL chart data (not truncated) - use JSON for proper structure
-    import json
-    chart_data_full = {
+    # Shared by every goal: D1 chart data (full, not truncated), dasha analysis and transit events
+    chart_data_base = {
         "lagna": chart_data.get("lagna", {}),
         "planetary_positions": chart_data.get("planetary_positions", {}),
         "house_positions": chart_data.get("house_positions", []),
-        "divisional_charts": chart_data.get("divisional_charts", {}),
         "shadbala": chart_data.get("shadbala", {}),
     }
-    chart_data_json = json.dumps(chart_data_full, indent=2, default=str)
+    divisional_charts = DivisionalChartSet.from_chart_data(chart_data)
     
     # Get full dasha analysis (not truncated)
     dasha_analysis_full = dasha_data.get('analysis', 'No dasha analysis available') if dasha_data else 'No dasha data available'
     
-    prompt = f"""Analyze the following horoscope for the specified goals and provide comprehensive analysis following the EXACT format specified in the system prompt.
+    # Transit events over the natal chart for the coming year (None until the ephemeris grid is built)
+    try:
+        transit_events = format_transit_events(chart_data, start=birth_details.get("today_date") or None)
+    except Exception as e:
+        logger.warning(f"Goal analysis node: Could not compute transit events: {e}")
+        transit_events = None
+    transit_events_section = f"\n{transit_events}\n" if transit_events else ""
+    
+    system_prompt = with_gochara_context(GOAL_ANALYSIS_NODE_SYSTEM_PROMPT, birth_details.get("today_date"))
+    fingerprint = chart_fingerprint(chart_data)
+    
+    def goal_prompt(goal: str) -> str:
+        chart_data_full = {
+            **chart_data_base,
+            # Only the vargas this goal is judged from, computed on demand
+            "divisional_charts": divisional_charts.for_goals([goal]),
+        }
+        chart_data_text = encode_chart(chart_data_full)
+        report_compaction("goal_analysis", chart_data_text, chart_data_full)
+        return f"""Analyze the following horoscope for the specified goal and provide comprehensive analysis following the EXACT format specified in the system prompt.
 
 Birth Details:
 - Name: {birth_details.get('name', 'N/A')}
 - Date of Birth: {birth_details.get('date_of_birth', 'N/A')}
 - Time of Birth: {birth_details.get('time_of_birth', 'N/A')}
 - Place: {birth_details.get('place_of_birth', 'N/A')}
-- Goals: {', '.join(goals) if isinstance(goals, list) else goals}
+- Goal: {goal}
 
 Complete Chart Data (use ALL of this data):
-{chart_data_json}
+{chart_data_text}
 
 Complete Dasha Analysis:
 {dasha_analysis_full}
-
+{transit_events_section}
 **IMPORTANT**: 
 - Use ALL the chart data provided above - analyze specific planetary positions, houses, and yogas
 - Reference the complete dasha analysis provided
 - **CRITICAL**: Consider Gochara (planetary transits) from the system prompt when making predictions
 - Combine Dasha periods with Gochara transits to provide accurate timing predictions
 - Reference specific Gochara transit dates when providing forecasts and timing suggestions
-- Follow the EXACT section structure from the system prompt for each goal
+- Where transit events over the natal chart are listed, cite them (with dates) for timing
+- Follow the EXACT section structure from the system prompt for this goal only
 - Include specific planetary names, house numbers, signs, and aspects
 - Be detailed and specific - do not provide generic analysis
 - Use proper markdown formatting with ## and ### headers as specified"""
     
-    try:
-        logger.info("Goal analysis node: Calling LLM for goal analysis")
-        response = await llm.ainvoke([
-            SystemMessage(content=GOAL_ANALYSIS_NODE_SYSTEM_PROMPT),
-            HumanMessage(content=prompt)
-        ])
-        
-        goal_analysis = response.content
-        logger.info(f"Goal analysis node: Goal analysis generated successfully, length: {len(goal_analysis)}")
-        
-        return {
-            "goal_analysis_data": {
-                "goals": goals,
-                "analysis": goal_analysis
-            },
-            "current_step": "recommendation"
-        }
-    except Exception as e:
-        logger.error(f"Goal analysis node: Error generating goal analysis: {e}", exc_info=True)
-        return {"error": f"Goal analysis failed: {str(e)}", "current_step": "dasha"}
-
+    semaphore = asyncio.Semaphore(max(1, AstroConfig.GoalAnalysisConfig.GOAL_ANALYSIS_CONCURRENCY))
+    results = await asyncio.gather(*(
+        _analyze_goal(
+            llm, semaphore, goal,
+            goal_analysis_cache.make_key(fingerprint, goal, GOAL_ANALYSIS_PROMPT_VERSION),
+            system_prompt, goal_prompt(goal)
+        )
+        for goal in goals
+    ))
+    
+    failed = [goal for goal, analysis in zip(goals, results) if analysis is None]
+    if len(failed) == len(goals):
+        return {"error": "Goal analysis failed for all goals", "current_step": "dasha"}
+    if failed:
+        logger.warning(f"Goal analysis node: Analysis failed for goals: {failed}")
+    
+    # Merge in the order the goals were given
+    goal_analysis = "\n\n".join(
+        analysis if analysis is not None else f"## Goal Analysis: {goal}\n\nAnalysis for this goal is temporarily unavailable."
+        for goal, analysis in zip(goals, results)
+    )
+    logger.info(f"Goal analysis node: Goal analysis generated successfully for {len(goals) - len(failed)}/{len(goals)} goal(s), length: {len(goal_analysis)}")
+    
+    return {
+        "goal_analysis_data": {
+            "goals": goals,
+            "analysis": goal_analysis
+        },
+        "current_step": "recommendation"
+    }
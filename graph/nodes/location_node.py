@@ -1,13 +1,21 @@
-"""Location node: Resolves geographic coordinates using agent and geocoding tools"""
+"""Location node: Resolves geographic coordinates with the deterministic location resolver.
 
-from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
+The geocoding tool-calling agent is only used when the geocoder fails.
+"""
+
+import json
+import re
+from typing import Dict, Any, Optional, Sequence
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage, ToolMessage
 from langchain_core.tools import StructuredTool
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
 from config import AstroConfig, logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
 from tools.geocoding_tools import geocode_address, reverse_geocode
+from tools.location_resolver import location_resolver
+from tools.timezone_lookup import timezone_lookup
 
 
 LOCATION_NODE_SYSTEM_PROMPT = """
@@ -102,53 +110,50 @@ def create_geocoding_tools():
     return [geocode_address_tool, reverse_geocode_tool]
 
 
+DISAMBIGUATION_SYSTEM_PROMPT = """
+You pick the birth place a user of an Indian Vedic astrology service most likely meant.
+You are given the place name as entered and a numbered list of matching places.
+Prefer well-known places, and places in India when nothing else distinguishes them.
+Reply with ONLY the number of the chosen place.
+"""
+
+
 def create_location_node_llm():
     """Create the LLM for the location node with tools"""
-    llm = ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
+    return llm_registry.get(
         temperature=0.1,  # Low temperature for accurate location resolution
         max_tokens=500,  # JSON response doesn't need many tokens
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
+        tools_key="geocoding",
+        tools=create_geocoding_tools,
     )
-    # Bind tools to the LLM
-    tools = create_geocoding_tools()
-    return llm.bind_tools(tools)
 
 
-async def location_node(state: AstroGuruState) -> Dict[str, Any]:
-    """Location node: Resolves geographic coordinates using agent with geocoding tools"""
-    logger.info("Location node: Resolving location coordinates")
-    
-    birth_details = state.get("birth_details")
-    if not birth_details:
-        logger.warning("Location node: No birth details found, routing back to main")
-        return {"current_step": "main", "user_message": ""}
-    
-    # Prepare input for agent
-    place_name = birth_details.get("place_of_birth", "")
-    existing_latitude = birth_details.get("latitude")
-    existing_longitude = birth_details.get("longitude")
-    existing_timezone = birth_details.get("timezone")
-    
-    # Build prompt for agent
-    if existing_latitude and existing_longitude:
-        # Coordinates provided - verify and get timezone
-        prompt = f"""I have coordinates: latitude={existing_latitude}, longitude={existing_longitude}
-Place name: {place_name or 'Not provided'}
+async def _disambiguate_place(place_name: str, candidates: Sequence[Dict[str, Any]]) -> Optional[int]:
+    """Ask the LLM which of several equally likely geocoder matches was meant (one call, no tools)."""
+    options = "\n".join(
+        f"{i}. {candidate.get('place_name')} ({candidate['latitude']:.4f}, {candidate['longitude']:.4f})"
+        for i, candidate in enumerate(candidates, start=1)
+    )
+    messages = [
+        SystemMessage(content=DISAMBIGUATION_SYSTEM_PROMPT),
+        HumanMessage(content=f"Place of birth: {place_name}\n\nMatches:\n{options}")
+    ]
+    llm = llm_registry.get(temperature=0.1, max_tokens=10)
+    response = await llm_cache.ainvoke("location", llm, messages)
+    match = re.search(r"\d+", response.content or "")
+    if not match:
+        logger.warning(f"Location node: Could not parse disambiguation answer: {response.content!r}")
+        return None
+    return int(match.group()) - 1
 
-Please:
-1. Use reverse_geocode_tool to get location details from these coordinates
-2. Return a JSON object with: place_name, city, state, country, latitude, longitude, timezone
-3. **IMPORTANT**: Always set timezone to "Asia/Kolkata" (IST) - this is hardcoded for consistency
 
-Return ONLY the JSON object."""
-    else:
-        # Need to geocode from place name
-        if not place_name:
-            logger.warning("Location node: No place name found, skipping")
-            return {"current_step": "main", "error": "Place of birth is required"}
-        
-        prompt = f"""I need to geocode this place: {place_name}
+async def _resolve_with_agent(place_name: str) -> Dict[str, Any]:
+    """Resolve a place name with the geocoding tool-calling agent (fallback when the geocoder fails).
+
+    Raises:
+        ValueError: If the agent does not return usable location JSON
+    """
+    prompt = f"""I need to geocode this place: {place_name}
 
 Please:
 1. Use geocode_address_tool to get coordinates for: {place_name}
@@ -162,102 +167,127 @@ Return ONLY the JSON object."""
     tools = create_geocoding_tools()
     tool_map = {tool.name: tool for tool in tools}
     
-    # Call agent with tool support
-    try:
-        messages = [
-            SystemMessage(content=LOCATION_NODE_SYSTEM_PROMPT),
-            HumanMessage(content=prompt)
-        ]
+    messages = [
+        SystemMessage(content=LOCATION_NODE_SYSTEM_PROMPT),
+        HumanMessage(content=prompt)
+    ]
+    
+    # Agent execution loop (max 3 iterations to handle tool calls)
+    max_iterations = 3
+    for iteration in range(max_iterations):
+        response = await llm_cache.ainvoke("location", llm, messages)
+        messages.append(response)
         
-        # Agent execution loop (max 3 iterations to handle tool calls)
-        max_iterations = 3
-        for iteration in range(max_iterations):
-            response = await llm.ainvoke(messages)
-            messages.append(response)
+        # Check if agent wants to call tools
+        if hasattr(response, 'tool_calls') and response.tool_calls:
+            logger.info(f"Location node: Agent calling {len(response.tool_calls)} tool(s)")
             
-            # Check if agent wants to call tools
-            if hasattr(response, 'tool_calls') and response.tool_calls:
-                logger.info(f"Location node: Agent calling {len(response.tool_calls)} tool(s)")
+            # Execute tool calls
+            for tool_call in response.tool_calls:
+                tool_name = tool_call.get("name", "")
+                tool_args = tool_call.get("args", {})
+                tool_id = tool_call.get("id", "")
                 
-                # Execute tool calls
-                for tool_call in response.tool_calls:
-                    tool_name = tool_call.get("name", "")
-                    tool_args = tool_call.get("args", {})
-                    tool_id = tool_call.get("id", "")
-                    
-                    if tool_name in tool_map:
-                        try:
-                            # Execute the tool
-                            tool_result = await tool_map[tool_name].ainvoke(tool_args)
-                            
-                            # Check if tool returned an error (rate limit, etc.)
-                            if isinstance(tool_result, str):
-                                try:
-                                    import json
-                                    tool_result_dict = json.loads(tool_result)
-                                    if not tool_result_dict.get("success", True):
-                                        error_msg = tool_result_dict.get("error", "Unknown error")
-                                        logger.warning(f"Location node: Geocoding tool returned error: {error_msg}")
-                                        # Pass error to agent so it can handle it
-                                        messages.append(ToolMessage(
-                                            content=tool_result,  # Pass full JSON error response
-                                            tool_call_id=tool_id
-                                        ))
-                                    else:
-                                        messages.append(ToolMessage(
-                                            content=tool_result,
-                                            tool_call_id=tool_id
-                                        ))
-                                except (json.JSONDecodeError, AttributeError):
-                                    # Not JSON, pass as-is
-                                    messages.append(ToolMessage(
-                                        content=tool_result,
-                                        tool_call_id=tool_id
-                                    ))
-                            else:
-                                messages.append(ToolMessage(
-                                    content=str(tool_result),
-                                    tool_call_id=tool_id
-                                ))
-                        except Exception as e:
-                            logger.error(f"Location node: Tool execution error: {e}", exc_info=True)
+                if tool_name in tool_map:
+                    try:
+                        # Execute the tool
+                        tool_result = await tool_map[tool_name].ainvoke(tool_args)
+                        
+                        # Check if tool returned an error (rate limit, etc.)
+                        if isinstance(tool_result, str):
+                            try:
+                                tool_result_dict = json.loads(tool_result)
+                                if not tool_result_dict.get("success", True):
+                                    error_msg = tool_result_dict.get("error", "Unknown error")
+                                    logger.warning(f"Location node: Geocoding tool returned error: {error_msg}")
+                            except (json.JSONDecodeError, AttributeError):
+                                pass
+                            # Pass the result (including any JSON error response) to the agent
+                            messages.append(ToolMessage(
+                                content=tool_result,
+                                tool_call_id=tool_id
+                            ))
+                        else:
                             messages.append(ToolMessage(
-                                content=json.dumps({"success": False, "error": str(e)}),
+                                content=str(tool_result),
                                 tool_call_id=tool_id
                             ))
-                    else:
-                        logger.warning(f"Location node: Unknown tool: {tool_name}")
+                    except Exception as e:
+                        logger.error(f"Location node: Tool execution error: {e}", exc_info=True)
                         messages.append(ToolMessage(
-                            content=f"Unknown tool: {tool_name}",
+                            content=json.dumps({"success": False, "error": str(e)}),
                             tool_call_id=tool_id
                         ))
-                
-                # Continue loop to let agent process tool results
-                continue
-            else:
-                # Agent returned final response (no more tool calls)
-                response_text = response.content
-                break
+                else:
+                    logger.warning(f"Location node: Unknown tool: {tool_name}")
+                    messages.append(ToolMessage(
+                        content=f"Unknown tool: {tool_name}",
+                        tool_call_id=tool_id
+                    ))
+            
+            # Continue loop to let agent process tool results
+            continue
         else:
-            # Max iterations reached
-            logger.warning("Location node: Max iterations reached, using last response")
+            # Agent returned final response (no more tool calls)
             response_text = response.content
-        
-        # Extract JSON from response
-        import json
-        import re
-        
-        # Try to find JSON in the response
-        json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
-        if not json_match:
-            logger.error("Location node: No JSON found in agent response")
-            return {"error": "Agent did not return valid JSON", "current_step": "main"}
-        
-        try:
-            location_data = json.loads(json_match.group())
-        except json.JSONDecodeError as e:
-            logger.error(f"Location node: Failed to parse JSON: {e}")
-            return {"error": "Failed to parse location data", "current_step": "main"}
+            break
+    else:
+        # Max iterations reached
+        logger.warning("Location node: Max iterations reached, using last response")
+        response_text = response.content
+    
+    # Try to find JSON in the response
+    json_match = re.search(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
+    if not json_match:
+        logger.error("Location node: No JSON found in agent response")
+        raise ValueError("Agent did not return valid JSON")
+    
+    try:
+        location_data = json.loads(json_match.group())
+    except json.JSONDecodeError as e:
+        logger.error(f"Location node: Failed to parse JSON: {e}")
+        raise ValueError("Failed to parse location data")
+    
+    location_data["source"] = "agent"
+    return location_data
+
+
+async def location_node(state: AstroGuruState) -> Dict[str, Any]:
+    """Location node: Resolves geographic coordinates (resolver first, agent only if geocoding fails)"""
+    logger.info("Location node: Resolving location coordinates")
+    
+    birth_details = state.get("birth_details")
+    if not birth_details:
+        logger.warning("Location node: No birth details found, routing back to main")
+        return {"current_step": "main", "user_message": ""}
+    
+    place_name = birth_details.get("place_of_birth", "")
+    existing_latitude = birth_details.get("latitude")
+    existing_longitude = birth_details.get("longitude")
+    location_config = AstroConfig.LocationConfig
+    
+    try:
+        if existing_latitude and existing_longitude:
+            # Coordinates provided - look up place details only
+            location_data = await location_resolver.resolve_coordinates(
+                float(existing_latitude), float(existing_longitude)
+            )
+        else:
+            if not place_name:
+                logger.warning("Location node: No place name found, skipping")
+                return {"current_step": "main", "error": "Place of birth is required"}
+            
+            location_data = await location_resolver.resolve(
+                place_name,
+                disambiguate=_disambiguate_place if location_config.LOCATION_LLM_DISAMBIGUATION else None
+            )
+            if not location_data.get("success"):
+                error_msg = location_data.get("error", "Unknown error")
+                if not location_config.LOCATION_AGENT_FALLBACK:
+                    logger.error(f"Location node: Geocoding failed: {error_msg}")
+                    return {"error": f"Location resolution failed: {error_msg}", "current_step": "main"}
+                logger.warning(f"Location node: Geocoding failed ({error_msg}), falling back to the agent")
+                location_data = await _resolve_with_agent(place_name)
         
         # Validate required fields
         required_fields = ["latitude", "longitude"]
@@ -269,7 +299,6 @@ Return ONLY the JSON object."""
         # Always use IST (Asia/Kolkata) for chart calculations to avoid confusion
         # The actual location timezone is not used - all birth times are assumed to be in IST
         location_data["timezone"] = "Asia/Kolkata"
-        logger.info(f"Location node: Using IST (Asia/Kolkata) for all chart calculations (hardcoded)")
         
         # Validate coordinate ranges
         lat = float(location_data.get("latitude", 0))
@@ -278,22 +307,26 @@ Return ONLY the JSON object."""
             logger.error(f"Location node: Invalid coordinates: lat={lat}, lon={lon}")
             return {"error": "Invalid coordinates", "current_step": "main"}
         
-        logger.info(f"Location node: Successfully resolved location: {location_data.get('place_name')} ({lat}, {lon}) with timezone {location_data.get('timezone')}")
+        # The birthplace's own zone (charts only use it when CHART_LOCAL_TIMEZONE is set)
+        location_data["local_timezone"] = timezone_lookup.timezone_at(lat, lon)
         
+        logger.info(
+            f"Location node: Resolved {location_data.get('place_name')} ({lat}, {lon}) "
+            f"via {location_data.get('source')}, timezone {location_data['timezone']} (IST, hardcoded; "
+            f"local {location_data['local_timezone']})"
+        )
+        
+    except ValueError as e:
+        return {"error": str(e), "current_step": "main"}
     except Exception as e:
-        logger.error(f"Location node: Error in agent execution: {e}", exc_info=True)
+        logger.error(f"Location node: Error resolving location: {e}", exc_info=True)
         return {"error": f"Location resolution failed: {str(e)}", "current_step": "main"}
     
-    # Ensure location_data was successfully extracted
-    if 'location_data' not in locals():
-        logger.error("Location node: location_data not defined after agent execution")
-        return {"error": "Failed to extract location data", "current_step": "main"}
-    
     # Update birth_details with location data
     updated_birth_details = {**birth_details}
     updated_birth_details.update({
-        "latitude": float(location_data.get("latitude")),
-        "longitude": float(location_data.get("longitude")),
+        "latitude": lat,
+        "longitude": lon,
         "timezone": location_data.get("timezone"),
     })
     
@@ -302,4 +335,3 @@ Return ONLY the JSON object."""
         "location_data": location_data,
         "current_step": "chart"
     }
-
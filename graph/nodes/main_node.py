@@ -1,11 +1,15 @@
 """Main node: Handles user conversations and collects birth details"""
 
+import json
+import re
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
 from config import AstroConfig, logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
+from tools.birth_details_extraction import birth_details_stats, birth_details_tool, extract_birth_details, message_text
 
 
 MAIN_NODE_SYSTEM_PROMPT = """
@@ -39,52 +43,34 @@ You are a Professional Vedic Astrology Consultant. Your role is to provide compr
      * Ask for clarification or correction
      * Wait for the user to provide correct information before proceeding
    - **Only after ALL required information is validated and complete:**
-     * Output the birth details in JSON format with key "birth_details"
+     * Call the record_birth_details function (see below)
 
 4. **Output Format (when all information is collected):**
-   When you have collected and validated ALL required information, you MUST output it in JSON format.
-   
-   **CRITICAL**: The JSON must be valid and parseable. Output it as a standalone JSON object or in a JSON code block.
-   
-   Format:
-   {
-     "birth_details": {
-       "name": "Full name",
-       "date_of_birth": "YYYY-MM-DD",
-       "time_of_birth": "HH:MM",
-       "place_of_birth": "City, State, Country",
-       "goals": ["career", "marriage", "health"],
-       "latitude": null,
-       "longitude": null,
-       "timezone": null
-     }
-   }
+   When you have collected and validated ALL required information, you MUST call the `record_birth_details` function with:
+   - name, date_of_birth (YYYY-MM-DD), time_of_birth (HH:MM, 24-hour, IST), place_of_birth ("City, State, Country")
+   - goals (list, e.g. ["career", "marriage", "health"]; empty if none given)
+   - latitude and longitude ONLY if the user provided coordinates in their message (otherwise leave them null; the location node fills them later)
    
    **IMPORTANT**: 
-   - Output ONLY the JSON object, or use: ```json\n{ "birth_details": {...} }\n```
-   - Do NOT embed the JSON in explanatory text with escaped characters
-   - If the user provides coordinates (latitude and longitude) in their message, extract and include them in birth_details
-   - If coordinates are not provided, latitude and longitude will be filled by the location node later
+   - Do NOT call the function while any required information is missing, invalid or unclear
+   - If you cannot call the function, output the details as a JSON object instead: { "birth_details": { ...same fields... } }
    - timezone will always be set to "Asia/Kolkata" (IST) - this is hardcoded for consistency
    - All birth times are assumed to be in IST regardless of actual location
-   - today_date will be automatically added by the system (do NOT include it in your output)
+   - today_date will be automatically added by the system (do NOT include it)
 
 **CRITICAL**: 
 - You handle ALL user interaction. When users say "Hi", respond with a friendly greeting and wait for them to express interest in astrology analysis.
 - **NEVER** proceed to analysis until ALL required information is collected and validated.
 - **ALWAYS** stop and ask for clarification if there are any issues with the input data.
-- **ALWAYS** output birth_details in JSON format when all information is collected.
+- **ALWAYS** call record_birth_details when all information is collected.
 """
 
 
 def create_main_node_llm():
-    """Create the LLM for the main node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    """Create the LLM for the main node (with the record_birth_details function unless disabled)"""
+    if not AstroConfig.MainNodeConfig.MAIN_NODE_STRUCTURED_OUTPUT:
+        return llm_registry.get()
+    return llm_registry.get(tools_key="birth_details", tools=lambda: [birth_details_tool()])
 
 
 async def main_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -119,123 +105,36 @@ async def main_node(state: AstroGuruState) -> Dict[str, Any]:
     conversation.append(HumanMessage(content=user_message))
     
     # Call LLM
+    response = None
     try:
         llm = create_main_node_llm()
         logger.info("Main node: Calling LLM to collect birth details")
-        response = await llm.ainvoke(conversation)
-        response_text = response.content
+        response = await llm_cache.ainvoke("main", llm, conversation)
+        response_text = message_text(response)
         logger.debug(f"Main node: LLM response length: {len(response_text)}")
     except Exception as e:
         logger.error(f"Main node: Error calling LLM: {e}", exc_info=True)
         response_text = "I apologize, but I encountered an error. Could you please provide your birth details?"
     
-    # Try to extract birth_details from response if it's in JSON format
-    import json
-    import re
-    
+    # Function call arguments first, then JSON written in the text
     birth_details_extracted = None
+    extraction_outcome = "none"
+    if response is not None:
+        birth_details_extracted, extraction_outcome = extract_birth_details(response)
     
-    # Strategy 1: Look for JSON object with "birth_details" key (handles nested JSON)
-    try:
-        # Find the start of the JSON object containing "birth_details"
-        start_idx = response_text.find('"birth_details"')
-        if start_idx != -1:
-            # Find the opening brace before "birth_details" (could be outer or inner object)
-            # Look backwards from "birth_details" to find the opening brace
-            brace_start = response_text.rfind('{', 0, start_idx)
-            if brace_start != -1:
-                # Find the matching closing brace by counting braces
-                brace_count = 0
-                brace_end = -1
-                in_string = False
-                escape_next = False
-                
-                for i in range(brace_start, len(response_text)):
-                    char = response_text[i]
-                    
-                    if escape_next:
-                        escape_next = False
-                        continue
-                    
-                    if char == '\\':
-                        escape_next = True
-                        continue
-                    
-                    if char == '"' and not escape_next:
-                        in_string = not in_string
-                        continue
-                    
-                    if not in_string:
-                        if char == '{':
-                            brace_count += 1
-                        elif char == '}':
-                            brace_count -= 1
-                            if brace_count == 0:
-                                brace_end = i + 1
-                                break
-                
-                if brace_end > brace_start:
-                    json_str = response_text[brace_start:brace_end]
-                    # Try to parse - handle escaped characters
-                    try:
-                        # First try direct parse
-                        parsed = json.loads(json_str)
-                        birth_details_extracted = parsed.get("birth_details")
-                        if birth_details_extracted:
-                            logger.info(f"Main node: Strategy 1 - Extracted birth details for {birth_details_extracted.get('name', 'Unknown')}")
-                    except json.JSONDecodeError:
-                        # If that fails, try unescaping common escape sequences
-                        try:
-                            # Replace escaped newlines and quotes
-                            json_str_unescaped = json_str.replace('\\n', '\n').replace('\\"', '"').replace('\\t', '\t')
-                            parsed = json.loads(json_str_unescaped)
-                            birth_details_extracted = parsed.get("birth_details")
-                            if birth_details_extracted:
-                                logger.info(f"Main node: Strategy 1 (unescaped) - Extracted birth details for {birth_details_extracted.get('name', 'Unknown')}")
-                        except json.JSONDecodeError as e:
-                            logger.debug(f"Main node: Strategy 1 - JSON parse error even after unescaping: {e}")
-                            logger.debug(f"Main node: JSON string: {json_str[:200]}...")
-    except Exception as e:
-        logger.debug(f"Main node: Strategy 1 failed: {e}")
-    
-    # Strategy 2: Try to find and parse JSON code blocks
-    if not birth_details_extracted:
-        try:
-            json_block_match = re.search(r'```(?:json)?\s*(\{.*?\})\s*```', response_text, re.DOTALL)
-            if json_block_match:
-                json_str = json_block_match.group(1)
-                parsed = json.loads(json_str)
-                birth_details_extracted = parsed.get("birth_details")
-                if birth_details_extracted:
-                    logger.info(f"Main node: Strategy 2 - Extracted from JSON code block for {birth_details_extracted.get('name', 'Unknown')}")
-        except Exception as e:
-            logger.debug(f"Main node: Strategy 2 failed: {e}")
-    
-    # Strategy 3: Try to find any complete JSON object in the response
-    if not birth_details_extracted:
-        try:
-            # Find all potential JSON objects
-            json_objects = re.findall(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', response_text, re.DOTALL)
-            for json_str in json_objects:
-                try:
-                    parsed = json.loads(json_str)
-                    if "birth_details" in parsed:
-                        birth_details_extracted = parsed.get("birth_details")
-                        if birth_details_extracted:
-                            logger.info(f"Main node: Strategy 3 - Extracted birth details for {birth_details_extracted.get('name', 'Unknown')}")
-                            break
-                except json.JSONDecodeError:
-                    continue
-        except Exception as e:
-            logger.debug(f"Main node: Strategy 3 failed: {e}")
-    
-    if not birth_details_extracted:
-        logger.warning("Main node: No birth_details JSON found in response, continuing conversation")
+    if birth_details_extracted:
+        logger.info(f"Main node: Extracted birth details ({extraction_outcome}) for {birth_details_extracted.get('name', 'Unknown')}")
+        if not response_text.strip():
+            # Function call without text: keep the details in the history in the format the prompt describes
+            response_text = json.dumps({"birth_details": birth_details_extracted})
+    elif extraction_outcome in ("invalid", "unparsed"):
+        logger.warning(f"Main node: Birth details offered but not usable ({extraction_outcome}), continuing conversation")
         logger.warning(f"Main node: Response preview (first 500 chars): {response_text[:500]}")
-        # Check if "birth_details" appears in the response at all
-        if '"birth_details"' in response_text or "'birth_details'" in response_text:
-            logger.warning("Main node: 'birth_details' keyword found in response but extraction failed - this is a bug!")
-            logger.warning("Main node: Please check the JSON extraction logic")
+        if not response_text.strip():
+            response_text = (
+                "I couldn't read some of your birth details. Could you please confirm your date of birth "
+                "(YYYY-MM-DD), time of birth (HH:MM, 24-hour IST) and place of birth?"
+            )
     
     # Update messages
     new_messages = messages + [
@@ -249,7 +148,6 @@ async def main_node(state: AstroGuruState) -> Dict[str, Any]:
     
     if birth_details_extracted:
         # Extract coordinates from user message if provided
-        import re
         coord_pattern = r'(?:Coordinates?|Latitude|Longitude|lat|lon|coord)[:\s]*Latitude\s*([+-]?\d+\.?\d*)[,\s]+Longitude\s*([+-]?\d+\.?\d*)'
         coord_match = re.search(coord_pattern, user_message, re.IGNORECASE)
         if coord_match:
@@ -269,6 +167,7 @@ async def main_node(state: AstroGuruState) -> Dict[str, Any]:
         missing_fields = [field for field in required_fields if not birth_details_extracted.get(field)]
         
         if missing_fields:
+            extraction_outcome = "incomplete"
             logger.warning(f"Main node: Birth details incomplete, missing: {missing_fields}")
             # Don't set birth_details - keep asking
             # Clear user_message so workflow ends and waits for user's next response
@@ -299,5 +198,6 @@ async def main_node(state: AstroGuruState) -> Dict[str, Any]:
     # If birth details not collected, result won't have birth_details, so workflow will end
     # User needs to send another message to continue the conversation
     
+    birth_details_stats.record(extraction_outcome)
     return result
 
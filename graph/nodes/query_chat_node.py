@@ -1,13 +1,17 @@
 """Query Chat node: Handles chat for query orders with chart and dasha analysis context"""
 
+from collections.abc import Mapping
 from typing import Dict, Any
 from datetime import datetime, date, timedelta
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
-from config import AstroConfig, logger
+from config import logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
-from graph.constants import GOCHARA_CONTEXT
+from graph.constants import GOCHARA_PLACEHOLDER, with_gochara_context
+from tools.dasha_engine import dasha_timeline_for_birth
+from tools.transit_events import format_transit_events
 
 
 QUERY_CHAT_NODE_SYSTEM_PROMPT = f"""
@@ -21,7 +25,7 @@ You are a friendly and approachable Vedic Astrology Consultant helping users und
 - Full conversation history
 
 Gochara transits context:
-{GOCHARA_CONTEXT}
+{GOCHARA_PLACEHOLDER}
 
 **HOW TO RESPOND:**
 - Use simple, everyday language - avoid complex astrology terms.
@@ -59,12 +63,28 @@ Gochara transits context:
 
 def create_query_chat_node_llm():
     """Create the LLM for the query chat node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
+
+
+def _format_dasha_periods(dasha_periods: Dict[str, Any]) -> str:
+    """Format computed running/upcoming dasha periods as a short context block"""
+    def _span(period: Dict[str, Any]) -> str:
+        return f"{period['planet']} ({period['start']:%Y-%m-%d} to {period['end']:%Y-%m-%d})"
+    
+    lines = [f"**CURRENT DASHA PERIODS (calculated for {dasha_periods['reference_date']}):**"]
+    for key, label in (
+        ("current_dasha", "Mahadasha"),
+        ("current_antardasha", "Antardasha (Bhukti)"),
+        ("current_pratyantardasha", "Pratyantardasha"),
+    ):
+        if dasha_periods.get(key):
+            lines.append(f"- {label}: {_span(dasha_periods[key])}")
+    upcoming = dasha_periods.get("upcoming_antardashas", [])
+    if upcoming:
+        lines.append("- Upcoming Antardashas: " + ", ".join(
+            f"{p['mahadasha']}-{_span(p)}" for p in upcoming
+        ))
+    return "\n".join(lines)
 
 
 async def query_chat_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -87,7 +107,7 @@ async def query_chat_node(state: AstroGuruState) -> Dict[str, Any]:
     chart_analysis = ""
     if chart_data:
         chart_analysis = chart_data.get("analysis", "") or chart_data.get("chart_data_analysis", "")
-        if not chart_analysis and isinstance(chart_data, dict):
+        if not chart_analysis and isinstance(chart_data, Mapping):
             # Try to get any analysis text from chart_data
             for key in ["analysis", "chart_analysis", "chart_data_analysis", "summary"]:
                 if key in chart_data and chart_data[key]:
@@ -126,6 +146,28 @@ async def query_chat_node(state: AstroGuruState) -> Dict[str, Any]:
         logger.warning("Query Chat node: No dasha analysis available - responses may be limited")
         context_parts.append("**DASHA ANALYSIS DATA:** Not available")
     
+    # Exact running periods for today from the native dasha engine (no chart recomputation)
+    birth_details = state.get("birth_details") or {}
+    try:
+        timeline = dasha_timeline_for_birth(
+            birth_details.get("date_of_birth"),
+            birth_details.get("time_of_birth"),
+            chart_data=chart_data,
+            moon_longitude=(dasha_data or {}).get("moon_longitude")
+        )
+        if timeline is not None:
+            context_parts.append(_format_dasha_periods(timeline.to_dict(years_ahead=3)))
+    except Exception as e:
+        logger.warning(f"Query Chat node: Could not compute dasha periods: {e}")
+    
+    # Transit events over the natal chart for the coming year (from the ephemeris grid)
+    try:
+        transit_events = format_transit_events(chart_data)
+        if transit_events:
+            context_parts.append(transit_events)
+    except Exception as e:
+        logger.warning(f"Query Chat node: Could not compute transit events: {e}")
+    
     analysis_context = "\n".join(context_parts)
     
     system_content = f"""{QUERY_CHAT_NODE_SYSTEM_PROMPT}
@@ -135,7 +177,7 @@ async def query_chat_node(state: AstroGuruState) -> Dict[str, Any]:
 **CRITICAL**: Use the chart and dasha analysis data above to answer questions. DO NOT make up or hallucinate information. If the data doesn't contain information about what the user is asking, clearly state that."""
     
     # Build conversation - SystemMessage must be first (position 0) for Gemini
-    conversation = [SystemMessage(content=system_content)]
+    conversation = [SystemMessage(content=with_gochara_context(system_content))]
     
     # Add conversation history (all messages to maintain full context)
     # This ensures follow-up questions have complete context including initial query
@@ -158,7 +200,7 @@ async def query_chat_node(state: AstroGuruState) -> Dict[str, Any]:
     try:
         llm = create_query_chat_node_llm()
         logger.info("Query Chat node: Calling LLM for chat response with chart and dasha context")
-        response = await llm.ainvoke(conversation)
+        response = await llm_cache.ainvoke("query_chat", llm, conversation)
         response_text = response.content
         logger.debug(f"Query Chat node: LLM response length: {len(response_text)}")
     except Exception as e:
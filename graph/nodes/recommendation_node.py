@@ -1,12 +1,13 @@
 """Recommendation node: Provides recommendations and remedies"""
 
 from typing import Dict, Any
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
-from config import AstroConfig, logger
+from config import logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
-from graph.constants import GOCHARA_CONTEXT
+from graph.constants import GOCHARA_PLACEHOLDER, with_gochara_context
 
 
 RECOMMENDATION_NODE_SYSTEM_PROMPT = f"""
@@ -15,7 +16,7 @@ You are a Professional Vedic Astrology Remedies and Recommendations Specialist.
 Your role is to provide detailed, actionable recommendations, remedies, and guidance based on 
 comprehensive horoscope analysis, Dasha periods, Gochara (planetary transits), and goal-specific insights.
 
-{GOCHARA_CONTEXT}
+{GOCHARA_PLACEHOLDER}
 
 **CRITICAL OUTPUT FORMAT REQUIREMENTS:**
 
@@ -96,12 +97,7 @@ You MUST provide recommendations with the following EXACT structure:
 
 def create_recommendation_node_llm():
     """Create the LLM for the recommendation node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
 
 
 async def recommendation_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -160,8 +156,8 @@ Complete Goal Analysis:
     
     try:
         logger.info("Recommendation node: Calling LLM for recommendations")
-        response = await llm.ainvoke([
-            SystemMessage(content=RECOMMENDATION_NODE_SYSTEM_PROMPT),
+        response = await llm_cache.ainvoke("recommendation", llm, [
+            SystemMessage(content=with_gochara_context(RECOMMENDATION_NODE_SYSTEM_PROMPT, birth_details.get("today_date"))),
             HumanMessage(content=prompt)
         ])
         
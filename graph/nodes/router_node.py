@@ -1,11 +1,14 @@
 """Router node: Intelligently routes between normal chat and analysis workflow"""
 
+import time
 from typing import Dict, Any, Literal
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
 from config import AstroConfig, logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
+from tools.intent_classifier import default_decision_log_path, intent_classifier, log_decision, router_stats
 
 
 ROUTER_SYSTEM_PROMPT = """
@@ -41,11 +44,9 @@ Respond with ONLY one word: either "analysis" or "chat"
 
 def create_router_llm():
     """Create the LLM for the router node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
+    return llm_registry.get(
         temperature=0.1,  # Low temperature for consistent routing
         max_tokens=10,  # Only need one word response
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
     )
 
 
@@ -103,6 +104,20 @@ async def router_node(state: AstroGuruState) -> Dict[str, Any]:
         logger.info("Router node: No user message, routing to chat")
         return {"request_type": "chat"}
     
+    # Fast path: local rules + n-gram model; the LLM is only asked when they are not confident
+    started = time.perf_counter()
+    if AstroConfig.RouterConfig.ROUTER_FAST_PATH_ENABLED:
+        intent = intent_classifier.classify(user_message)
+        if intent.confidence >= AstroConfig.RouterConfig.ROUTER_CONFIDENCE_THRESHOLD:
+            elapsed = time.perf_counter() - started
+            router_stats.record(intent.source, elapsed)
+            logger.info(
+                f"Router node: Routing to {intent.route} via {intent.source} (confidence {intent.confidence:.2f}) "
+                f"in {elapsed * 1000:.2f} ms; LLM fallback rate {router_stats.llm_fallback_rate:.1%}"
+            )
+            return {"request_type": intent.route}
+        logger.info(f"Router node: Low confidence ({intent.confidence:.2f} for {intent.route}), asking LLM")
+    
     # Use LLM to determine intent (only for new conversations without history)
     llm = create_router_llm()
     
@@ -137,7 +152,7 @@ Current user message: "{user_message}"
 Respond with ONLY one word: "analysis" or "chat" """
     
     try:
-        response = await llm.ainvoke([
+        response = await llm_cache.ainvoke("router", llm, [
             SystemMessage(content=ROUTER_SYSTEM_PROMPT),
             HumanMessage(content=prompt)
         ])
@@ -147,13 +162,20 @@ Respond with ONLY one word: "analysis" or "chat" """
         
         # Validate response - be more aggressive about detecting analysis
         # But only if there's no conversation history (to avoid misrouting follow-ups)
+        route = "chat"
         if not messages:
             if "analysis" in route_decision or any(keyword in user_message.lower() for keyword in ["analyze", "horoscope", "chart", "get my", "i want my", "i'd like"]):
-                logger.info(f"Router node: Routing to analysis workflow (decision: {route_decision})")
-                return {"request_type": "analysis"}
+                route = "analysis"
         
-        logger.info(f"Router node: Routing to normal chat (decision: {route_decision})")
-        return {"request_type": "chat"}
+        elapsed = time.perf_counter() - started
+        router_stats.record("llm", elapsed)
+        if AstroConfig.RouterConfig.ROUTER_DECISION_LOG_ENABLED:
+            log_decision(default_decision_log_path(), user_message, route)
+        logger.info(
+            f"Router node: Routing to {route} via llm (decision: {route_decision}) in {elapsed * 1000:.0f} ms; "
+            f"LLM fallback rate {router_stats.llm_fallback_rate:.1%}"
+        )
+        return {"request_type": route}
             
     except Exception as e:
         logger.error(f"Router node: Error determining route: {e}", exc_info=True)
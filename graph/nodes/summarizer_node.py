@@ -1,13 +1,14 @@
 """Summarizer node: Combines all analysis into a comprehensive report"""
 
 from typing import Dict, Any
-import json
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.messages import HumanMessage, SystemMessage
 from langchain_core.caches import BaseCache  # Import to resolve Pydantic v2 forward reference
-from config import AstroConfig, logger
+from config import logger
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from graph.state import AstroGuruState
-from graph.constants import GOCHARA_CONTEXT
+from tools.prompt_encoding import encode_planets, report_compaction
+from graph.constants import GOCHARA_PLACEHOLDER, with_gochara_context
 
 
 SUMMARIZER_NODE_SYSTEM_PROMPT = f"""
@@ -15,7 +16,7 @@ You are a Professional Vedic Astrology Report Summarizer.
 
 Your role is to synthesize all the specialized analysis from previous nodes (location, chart, Dasha, Gochara transits, goal analysis, and recommendations) into a clear, concise, and user-friendly astrology report that is easy to understand for general users.
 
-{GOCHARA_CONTEXT}
+{GOCHARA_PLACEHOLDER}
 
 **CRITICAL GUIDELINES:**
 
@@ -165,12 +166,7 @@ Your role is to synthesize all the specialized analysis from previous nodes (loc
 
 def create_summarizer_node_llm():
     """Create the LLM for the summarizer node"""
-    return ChatGoogleGenerativeAI(
-        model=AstroConfig.AppSettings.GEMINI_MODEL,
-        temperature=AstroConfig.AppSettings.GEMINI_TEMPERATURE,
-        max_tokens=AstroConfig.AppSettings.GEMINI_MAX_TOKENS,
-        google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
-    )
+    return llm_registry.get()
 
 
 async def summarizer_node(state: AstroGuruState) -> Dict[str, Any]:
@@ -205,7 +201,9 @@ async def summarizer_node(state: AstroGuruState) -> Dict[str, Any]:
         # Include key planetary positions
         planetary_positions = chart_data.get('planetary_positions', {})
         if planetary_positions:
-            context_parts.append(f"Key Planetary Positions: {json.dumps(planetary_positions, indent=2, default=str)}")
+            planets_text = encode_planets(planetary_positions)
+            report_compaction("summarizer", planets_text, planetary_positions)
+            context_parts.append(f"Key Planetary Positions:\n{planets_text}")
     
     # Use FULL analysis data, not truncated
     if dasha_data:
@@ -252,8 +250,8 @@ Analysis Data Available:
     
     try:
         logger.info("Summarizer node: Calling LLM for comprehensive summary")
-        response = await llm.ainvoke([
-            SystemMessage(content=SUMMARIZER_NODE_SYSTEM_PROMPT),
+        response = await llm_cache.ainvoke("summarizer", llm, [
+            SystemMessage(content=with_gochara_context(SUMMARIZER_NODE_SYSTEM_PROMPT, birth_details.get("today_date"))),
             HumanMessage(content=prompt)
         ])
         
@@ -73,6 +73,7 @@ def create_query_graph():
     )
     
     # Query workflow: location -> chart -> dasha -> chat -> end
+    # (no chart_format node - query answers use the chart data, not the markdown report)
     workflow.add_edge("location", "chart")
     workflow.add_edge("chart", "dasha")
     workflow.add_edge("dasha", "chat")
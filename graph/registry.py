@@ -0,0 +1,95 @@
+"""Process-wide registry of compiled LangGraph workflows"""
+
+import logging
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Mapping
+
+from graph.query_workflow import create_query_graph
+from graph.workflow import create_astroguru_graph
+
+logger = logging.getLogger(__name__)
+
+FULL_REPORT = "full_report"
+QUERY = "query"
+
+
+class GraphRegistry:
+    """Compiled workflows by name, each built once from its factory.
+
+    Compiled graphs hold no per-run state (no checkpointer), so concurrent
+    requests share them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._graphs: Dict[str, Any] = {}
+        self._compile_ms: Dict[str, float] = {}
+        self._lazy_compiles = 0
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Add a workflow factory (a create_*_graph function returning a compiled graph)."""
+        with self._lock:
+            self._factories[name] = factory
+            self._graphs.pop(name, None)
+
+    def _compile(self, name: str) -> Any:
+        """Compile one graph (caller holds the lock)."""
+        started = time.perf_counter()
+        graph = self._factories[name]()
+        self._compile_ms[name] = round((time.perf_counter() - started) * 1000, 3)
+        self._graphs[name] = graph
+        return graph
+
+    def compile_all(self) -> Dict[str, float]:
+        """Compile every registered graph not compiled yet; returns compile times in ms by name."""
+        with self._lock:
+            for name in self._factories:
+                if name not in self._graphs:
+                    self._compile(name)
+            return dict(self._compile_ms)
+
+    def get(self, name: str) -> Any:
+        """Compiled graph by name (compiled now if compile_all() has not run).
+
+        Raises:
+            KeyError: If no workflow is registered under that name
+        """
+        graph = self._graphs.get(name)
+        if graph is not None:
+            return graph
+        with self._lock:
+            if name not in self._factories:
+                raise KeyError(f"Unknown graph: {name}")
+            graph = self._graphs.get(name)
+            if graph is None:
+                logger.warning(f"Graph '{name}' requested before startup compilation, compiling now")
+                self._lazy_compiles += 1
+                graph = self._compile(name)
+            return graph
+
+    @property
+    def graphs(self) -> Mapping[str, Any]:
+        """Read-only view of the compiled graphs."""
+        return MappingProxyType(self._graphs)
+
+    @property
+    def ready(self) -> bool:
+        """Whether every registered graph is compiled."""
+        return bool(self._factories) and all(name in self._graphs for name in self._factories)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "compiled": sorted(self._graphs),
+                "compile_ms": dict(self._compile_ms),
+                "lazy_compiles": self._lazy_compiles,
+            }
+
+
+# Global graph registry
+graph_registry = GraphRegistry()
+graph_registry.register(FULL_REPORT, create_astroguru_graph)
+graph_registry.register(QUERY, create_query_graph)
@@ -1,9 +1,27 @@
 """LangGraph state definition for AstroGuru AI"""
 
-from typing import TypedDict, Optional, Dict, Any, List
+from typing import TypedDict, Optional, Dict, Any, List, Mapping, Annotated
 from datetime import datetime
 
 
+# Reducers for keys that parallel branches (e.g. chart_format and dasha) may
+# both write in the same step - LangGraph rejects concurrent writes otherwise
+
+def last_value(current: Any, update: Any) -> Any:
+    """Keep the most recent write"""
+    return update
+
+
+def keep_error(current: Optional[str], update: Optional[str]) -> Optional[str]:
+    """Keep the most recent error; a branch that succeeded does not clear another's error"""
+    return update if update is not None else current
+
+
+def merge_timings(current: Optional[Dict[str, Any]], update: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge per-node timing entries"""
+    return {**(current or {}), **(update or {})}
+
+
 class AstroGuruState(TypedDict):
     """State for the AstroGuru LangGraph workflow"""
     
@@ -16,7 +34,8 @@ class AstroGuruState(TypedDict):
     
     # Analysis results from each node
     location_data: Optional[Dict[str, Any]]
-    chart_data: Optional[Dict[str, Any]]
+    chart_data: Optional[Mapping[str, Any]]  # ChartSnapshot (or the plain chart dict)
+    chart_data_analysis: Optional[str]  # Markdown chart report (chart_format node)
     dasha_data: Optional[Dict[str, Any]]
     goal_analysis_data: Optional[Dict[str, Any]]
     recommendation_data: Optional[Dict[str, Any]]
@@ -26,10 +45,13 @@ class AstroGuruState(TypedDict):
     analysis_context: Optional[str]  # Combined context from all analyses
     
     # Control flow
-    current_step: Optional[str]  # Track which step we're on
+    current_step: Annotated[Optional[str], last_value]  # Track which step we're on
     analysis_complete: bool  # Whether full analysis has been completed
     request_type: Optional[str]  # "analysis" or "chat" - determined by router
     
     # Error handling
-    error: Optional[str]
+    error: Annotated[Optional[str], keep_error]
+    
+    # Observability
+    node_timings: Annotated[Dict[str, Dict[str, float]], merge_timings]  # node -> {start, end, duration}
 
@@ -0,0 +1,71 @@
+"""Per-node timings and critical path for LangGraph workflows"""
+
+import functools
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from graph.state import AstroGuruState
+
+NodeFunc = Callable[[AstroGuruState], Awaitable[Dict[str, Any]]]
+
+
+def timed_node(name: str, node: NodeFunc) -> NodeFunc:
+    """Wrap a node so its update also records {name: {start, end, duration}} in node_timings.
+
+    Times come from time.perf_counter(), so they are only comparable within one
+    process - which is all a single graph run needs.
+    """
+    @functools.wraps(node)
+    async def wrapper(state: AstroGuruState) -> Dict[str, Any]:
+        start = time.perf_counter()
+        update = await node(state)
+        end = time.perf_counter()
+        update = dict(update or {})
+        update["node_timings"] = {name: {"start": start, "end": end, "duration": end - start}}
+        return update
+    return wrapper
+
+
+def critical_path(
+    node_timings: Mapping[str, Mapping[str, float]],
+    dependencies: Mapping[str, Sequence[str]]
+) -> Tuple[List[str], float]:
+    """Chain of nodes that determined the end-to-end latency of a run.
+
+    Walks back from the node that finished last; at each join the predecessor
+    is the dependency that finished last (the one the node actually waited for).
+
+    Args:
+        node_timings: node_timings from the final graph state
+        dependencies: node -> nodes it waits for (e.g. FULL_REPORT_DEPENDENCIES)
+
+    Returns:
+        (nodes in execution order, seconds from the first node's start to the last node's end)
+    """
+    if not node_timings:
+        return [], 0.0
+
+    node: Optional[str] = max(node_timings, key=lambda n: node_timings[n]["end"])
+    path = []
+    while node is not None:
+        path.append(node)
+        ran = [dep for dep in dependencies.get(node, ()) if dep in node_timings]
+        node = max(ran, key=lambda n: node_timings[n]["end"]) if ran else None
+    path.reverse()
+
+    total = node_timings[path[-1]]["end"] - node_timings[path[0]]["start"]
+    return path, total
+
+
+def format_node_timings(
+    node_timings: Mapping[str, Mapping[str, float]],
+    dependencies: Mapping[str, Sequence[str]]
+) -> str:
+    """One-line summary for logs: critical path with durations, then the other nodes."""
+    path, total = critical_path(node_timings, dependencies)
+    on_path = " -> ".join(f"{n} {node_timings[n]['duration']:.2f}s" for n in path)
+    off_path = ", ".join(
+        f"{n} {t['duration']:.2f}s" for n, t in node_timings.items() if n not in path
+    )
+    summary = f"critical path {total:.2f}s: {on_path}"
+    return f"{summary} (parallel: {off_path})" if off_path else summary
@@ -5,15 +5,30 @@ from graph.state import AstroGuruState
 from graph.nodes.router_node import router_node
 from graph.nodes.main_node import main_node
 from graph.nodes.location_node import location_node
-from graph.nodes.chart_node import chart_node
+from graph.nodes.chart_node import chart_node, chart_format_node
 from graph.nodes.dasha_node import dasha_node
 from graph.nodes.goal_analysis_node import goal_analysis_node
 from graph.nodes.recommendation_node import recommendation_node
 from graph.nodes.summarizer_node import summarizer_node
 from graph.nodes.chat_node import chat_node
+from graph.timing import timed_node
 from config import logger
 
 
+# Full-report analysis DAG: node -> nodes it waits for. chart_format (LLM
+# markdown) and dasha (LLM analysis) both only need the raw chart, so they run
+# in parallel and join before goal analysis.
+FULL_REPORT_DEPENDENCIES = {
+    "location": [],
+    "chart": ["location"],
+    "chart_format": ["chart"],
+    "dasha": ["chart"],
+    "goal_analysis": ["chart_format", "dasha"],
+    "recommendation": ["goal_analysis"],
+    "summarizer": ["recommendation"],
+}
+
+
 def create_astroguru_graph():
     """Create and compile the AstroGuru LangGraph workflow"""
     logger.info("Creating AstroGuru LangGraph workflow")
@@ -24,12 +39,14 @@ def create_astroguru_graph():
     # Add nodes
     workflow.add_node("router", router_node)
     workflow.add_node("main", main_node)
-    workflow.add_node("location", location_node)
-    workflow.add_node("chart", chart_node)
-    workflow.add_node("dasha", dasha_node)
-    workflow.add_node("goal_analysis", goal_analysis_node)
-    workflow.add_node("recommendation", recommendation_node)
-    workflow.add_node("summarizer", summarizer_node)
+    # Analysis nodes record their timings (node_timings) for the critical path
+    workflow.add_node("location", timed_node("location", location_node))
+    workflow.add_node("chart", timed_node("chart", chart_node))
+    workflow.add_node("chart_format", timed_node("chart_format", chart_format_node))
+    workflow.add_node("dasha", timed_node("dasha", dasha_node))
+    workflow.add_node("goal_analysis", timed_node("goal_analysis", goal_analysis_node))
+    workflow.add_node("recommendation", timed_node("recommendation", recommendation_node))
+    workflow.add_node("summarizer", timed_node("summarizer", summarizer_node))
     workflow.add_node("chat", chat_node)
     
     # Set entry point to router
@@ -89,12 +106,13 @@ def create_astroguru_graph():
         }
     )
     
-    # Analysis workflow edges
-    workflow.add_edge("location", "chart")
-    workflow.add_edge("chart", "dasha")
-    workflow.add_edge("dasha", "goal_analysis")
-    workflow.add_edge("goal_analysis", "recommendation")
-    workflow.add_edge("recommendation", "summarizer")
+    # Analysis workflow edges (FULL_REPORT_DEPENDENCIES): chart fans out to
+    # chart_format and dasha, goal_analysis waits for both
+    for node, dependencies in FULL_REPORT_DEPENDENCIES.items():
+        if len(dependencies) == 1:
+            workflow.add_edge(dependencies[0], node)
+        elif dependencies:
+            workflow.add_edge(dependencies, node)
     
     # After summarizer, always end - user can ask questions in next API call
     def route_after_summary(state: AstroGuruState) -> str:
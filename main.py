@@ -8,29 +8,47 @@ import utils.llm_init
 from fastapi import FastAPI, HTTPException, Depends, status, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse, RedirectResponse, JSONResponse
+from fastapi.responses import FileResponse, RedirectResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from contextlib import asynccontextmanager
 from sqlalchemy.orm import Session
 from datetime import datetime
 import os
 import asyncio
 import json
+import time
 
 from config import logger, AstroConfig
 from database import init_database, close_database, get_db
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from graph.workflow import create_astroguru_graph
+from graph.workflow import FULL_REPORT_DEPENDENCIES
+from graph.registry import graph_registry, FULL_REPORT, QUERY
+from graph.timing import format_node_timings
 from graph.state import AstroGuruState
 from services.email_service import send_analysis_email
+from tools.chart_engine import batch_chart_engine, chart_engine
+from tools.chart_cache import chart_cache
+from tools.transit_engine import prepare_transit_table
+from tools.chart_snapshot import chart_data_from_json, chart_data_to_json
+from tools.chart_batch import batch_rate_limiter, iter_comprehensive_charts
+from tools.prompt_encoding import prompt_compaction_stats
+from tools.intent_classifier import intent_classifier, router_stats
+from tools.location_resolver import location_resolver
+from tools.gazetteer import gazetteer
+from tools.geocoding_gateway import geocoding_gateway
+from tools.geocode_cache import geocode_cache
+from tools.timezone_lookup import timezone_lookup
+from tools.birth_details_extraction import birth_details_stats, birth_details_tool
+from utils.llm_cache import llm_cache
+from utils.llm_registry import llm_registry
 from services.payment_service import payment_service
-from services.order_service import order_service
+from services.order_service import order_service, serialize_datetime
 from auth.oauth import get_google_oauth_url, handle_google_callback
 from auth.admin_auth import verify_admin_credentials, get_password_hash
 from auth.jwt_handler import create_access_token
-from auth.dependencies import get_current_user_dependency, get_current_admin, get_optional_user
+from auth.dependencies import get_current_user_dependency, get_current_admin, get_optional_user, get_batch_caller
 from models.user import User
 from models.order import Order
 from models.payment import Payment
@@ -101,6 +119,21 @@ class AdminLoginResponse(BaseModel):
     user_type: str = "admin"
 
 
+class ChartBatchRecord(BaseModel):
+    id: Optional[str] = None  # Caller's reference, echoed back in the result line
+    date_of_birth: Optional[str] = None
+    time_of_birth: Optional[str] = None  # IST
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    location_name: Optional[str] = None
+
+
+class ChartBatchRequest(BaseModel):
+    records: List[ChartBatchRecord]
+    years_ahead: int = 10
+    divisional_charts: Optional[List[str]] = None
+
+
 class ArticleResponse(BaseModel):
     id: int
     title: str
@@ -134,12 +167,10 @@ class ArticleListResponse(BaseModel):
         from_attributes = True
 
 
-# Global graph instance
-_graph = None
-
 # Simple in-memory session store (for graph execution)
 _sessions: Dict[str, AstroGuruState] = {}
 _scheduler = None
+_transit_task: Optional[asyncio.Task] = None
 
 
 def check_stale_processing_orders():
@@ -190,7 +221,6 @@ def check_stale_processing_orders():
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown"""
-    global _graph
     logger.info("=" * 60)
     logger.info("Starting AstroGuru AI (LangGraph)...")
     logger.info("=" * 60)
@@ -212,9 +242,10 @@ async def lifespan(app: FastAPI):
         
         logger.info("✓ Google AI API key found")
         
-        # Create graph
-        logger.info("Creating LangGraph workflow...")
-        _graph = create_astroguru_graph()
+        # Compile every workflow once; requests share the compiled graphs
+        logger.info("Compiling LangGraph workflows...")
+        for name, compile_ms in graph_registry.compile_all().items():
+            logger.info(f"✓ {name} graph compiled in {compile_ms:.1f} ms")
         logger.info("=" * 60)
         logger.info("✓ AstroGuru LangGraph initialized successfully")
         logger.info("=" * 60)
@@ -224,12 +255,65 @@ async def lifespan(app: FastAPI):
         logger.error(f"CRITICAL ERROR: {e}")
         logger.error("Graph will not be available until GOOGLE_AI_API_KEY is configured")
         logger.error("=" * 60)
-        _graph = None
     except Exception as e:
         logger.error("=" * 60)
         logger.error(f"Failed to initialize: {e}", exc_info=True)
         logger.error("=" * 60)
-        _graph = None
+    
+    # Optional warm-ups: each failure only costs first-request latency, never the service
+    
+    # Create the shared Gemini clients on the server loop so the first request reuses them
+    try:
+        llm_registry.warm([
+            {},  # default model settings (most nodes)
+            {"temperature": 0.1, "max_tokens": 10},  # router
+            {"tools_key": "birth_details", "tools": lambda: [birth_details_tool()]},  # main node
+        ])
+        logger.info(f"✓ LLM client registry ready ({llm_registry.stats()['clients']} client(s))")
+    except Exception as e:
+        logger.error(f"Failed to warm LLM client registry: {e}", exc_info=True)
+    
+    # Load (or train) the router's intent model so the first message does not pay for it
+    try:
+        intent_classifier.model
+        logger.info("✓ Router intent classifier ready")
+    except Exception as e:
+        logger.error(f"Failed to load router intent classifier: {e}", exc_info=True)
+    
+    # Load the offline gazetteer (place resolution and autocomplete)
+    try:
+        logger.info(f"✓ Gazetteer ready ({gazetteer.load()} places)")
+    except Exception as e:
+        logger.error(f"Failed to load gazetteer: {e}", exc_info=True)
+    
+    # Load the most-used geocode cache rows so repeat birthplaces skip the database and geocoder
+    try:
+        warmed = await asyncio.to_thread(geocode_cache.warm, AstroConfig.LocationConfig.GEOCODE_CACHE_WARM_ENTRIES)
+        logger.info(f"✓ Geocode cache warmed ({warmed} place(s))")
+    except Exception as e:
+        logger.error(f"Failed to warm geocode cache: {e}", exc_info=True)
+    
+    # Map the timezone grid and build the shared TimezoneFinder once
+    try:
+        await asyncio.to_thread(timezone_lookup.warm)
+        logger.info("✓ Timezone lookup ready")
+    except Exception as e:
+        logger.error(f"Failed to warm timezone lookup: {e}", exc_info=True)
+    
+    # Start chart engine worker processes (pre-warmed with ephemeris data)
+    try:
+        logger.info("Starting chart engine...")
+        chart_engine.start()
+        logger.info(
+            f"✓ Chart engine started ({chart_engine.max_workers} worker process(es); "
+            f"batch pool of {batch_chart_engine.max_workers} starts on the first batch)"
+        )
+    except Exception as e:
+        logger.error(f"Failed to start chart engine: {e}", exc_info=True)
+    
+    # Build/load the gochara transit table in the background (prompts use static transits until ready)
+    global _transit_task
+    _transit_task = asyncio.create_task(prepare_transit_table())
     
     # Start APScheduler for cron jobs
     global _scheduler
@@ -246,6 +330,15 @@ async def lifespan(app: FastAPI):
             replace_existing=True
         )
         
+        # Write geocode cache hit counts back to the database every minute
+        _scheduler.add_job(
+            geocode_cache.flush_hits,
+            trigger=IntervalTrigger(minutes=1),
+            id='flush_geocode_cache_hits',
+            name='Flush geocode cache hit counts',
+            replace_existing=True
+        )
+        
         _scheduler.start()
         logger.info("✓ APScheduler started - stale order check scheduled every 5 minutes")
         
@@ -268,6 +361,21 @@ async def lifespan(app: FastAPI):
         _scheduler.shutdown(wait=False)
         logger.info("✓ APScheduler stopped")
     
+    if _transit_task and not _transit_task.done():
+        _transit_task.cancel()
+    
+    # Stop chart engine workers
+    chart_engine.shutdown(wait=False)
+    batch_chart_engine.shutdown(wait=False)
+    
+    # Close shared Gemini client connections
+    logger.info(f"Closing LLM clients ({llm_registry.stats()})")
+    await llm_registry.close()
+    
+    # Close the pooled Nominatim connection and save pending geocode cache hit counts
+    await geocoding_gateway.close()
+    geocode_cache.flush_hits()
+    
     close_database()
 
 
@@ -347,11 +455,11 @@ async def auth_callback():
 async def health():
     """Health check endpoint"""
     health_status = {
-        "status": "healthy" if _graph is not None else "degraded",
+        "status": "healthy" if graph_registry.ready else "degraded",
         "service": AstroConfig.AppSettings.APP_NAME,
-        "graph_ready": _graph is not None,
+        "graph_ready": graph_registry.ready,
     }
-    if not _graph:
+    if not graph_registry.ready:
         health_status["error"] = "Graph not initialized - check GOOGLE_AI_API_KEY configuration"
     return health_status
 
@@ -935,7 +1043,16 @@ async def admin_stats(
         return {
             "total_orders": total_orders,
             "orders_by_status": orders_by_status,
-            "total_revenue": total_revenue
+            "total_revenue": total_revenue,
+            "chart_cache": chart_cache.stats(),
+            "llm_cache": llm_cache.stats(),
+            "prompt_compaction": prompt_compaction_stats.stats(),
+            "router": router_stats.stats(),
+            "location": location_resolver.stats(),
+            "geocoding": geocoding_gateway.stats(),
+            "timezone": timezone_lookup.stats(),
+            "birth_details_extraction": birth_details_stats.stats(),
+            "graphs": graph_registry.stats()
         }
     except Exception as e:
         logger.error(f"Error getting admin stats: {e}", exc_info=True)
@@ -948,7 +1065,6 @@ async def process_order_analysis(order_id: int):
     """Process order analysis after payment"""
     from database import SessionLocal
     from services.chat_service import chat_service
-    from graph.query_workflow import create_query_graph
     
     db = SessionLocal()
     try:
@@ -956,7 +1072,7 @@ async def process_order_analysis(order_id: int):
         if not order or order.status != "processing":
             return
         
-        if _graph is None:
+        if not graph_registry.ready:
             order_service.fail_order(db, order_id, "AI service not available")
             return
         
@@ -982,7 +1098,7 @@ async def process_order_analysis(order_id: int):
         # Choose workflow based on order type
         if order.type == "query":
             # Use simplified query workflow
-            query_graph = create_query_graph()
+            query_graph = graph_registry.get(QUERY)
             user_query = birth_details.get("user_query", "")
             
             if not user_query:
@@ -1036,7 +1152,7 @@ async def process_order_analysis(order_id: int):
                 analysis_data = {
                     "query_response": response_text,
                     "messages_count": 2,
-                    "chart_data": chart_data,  # Save for follow-up messages
+                    "chart_data": chart_data_to_json(chart_data),  # Save for follow-up messages
                     "dasha_data": dasha_data   # Save for follow-up messages
                 }
                 order_service.complete_order(db, order_id, analysis_data)
@@ -1069,7 +1185,9 @@ async def process_order_analysis(order_id: int):
                 "request_type": None
             }
             
-            result = await _graph.ainvoke(initial_state)
+            result = await graph_registry.get(FULL_REPORT).ainvoke(initial_state)
+            if result.get("node_timings"):
+                logger.info(f"Order {order_id}: {format_node_timings(result['node_timings'], FULL_REPORT_DEPENDENCIES)}")
             
             if result.get("analysis_complete"):
                 # Extract analysis data
@@ -1135,6 +1253,137 @@ class ChatMessageResponse(BaseModel):
     can_continue: bool
 
 
+def _prepare_query_chat(
+    db: Session,
+    order_id: int,
+    user_id: int,
+    user_message: str
+) -> Tuple[AstroGuruState, int]:
+    """Validate a chat message for a query order and build the query graph's initial state.
+    
+    Returns:
+        (initial_state, next_message_number)
+    
+    Raises:
+        HTTPException: order missing, not a paid query order, or message limit reached
+    """
+    from services.chat_service import chat_service
+    
+    # Get order and verify ownership
+    order = order_service.get_order(db, order_id, user_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+    
+    # Verify order type is query
+    if order.type != "query":
+        raise HTTPException(
+            status_code=400,
+            detail="Chat is only available for query type orders"
+        )
+    
+    # Verify payment is successful
+    if not order.payment or order.payment.status != "success":
+        raise HTTPException(
+            status_code=400,
+            detail="Payment must be successful to use chat"
+        )
+    
+    # Check message limit (max 3 user messages total)
+    if not chat_service.can_send_message(db, order_id, max_user_messages=3):
+        raise HTTPException(
+            status_code=400,
+            detail="Message limit reached. Please create a new query order to continue."
+        )
+    
+    next_message_number = chat_service.get_next_message_number(db, order_id)
+    
+    # Get birth details
+    birth_details = order.birth_details or {}
+    normalized_birth_details = {
+        "name": birth_details.get("name", "User"),
+        "date_of_birth": birth_details.get("dateOfBirth") or birth_details.get("date_of_birth", ""),
+        "time_of_birth": birth_details.get("timeOfBirth") or birth_details.get("time_of_birth", ""),
+        "place_of_birth": birth_details.get("placeOfBirth") or birth_details.get("place_of_birth", ""),
+        "goals": birth_details.get("goals", []),
+        "latitude": birth_details.get("latitude"),
+        "longitude": birth_details.get("longitude")
+    }
+    
+    # Get chat history for context (includes initial query and all follow-ups)
+    chat_history = chat_service.get_chat_history(db, order_id)
+    messages = []
+    for msg in chat_history:
+        messages.append({
+            "role": msg.role,
+            "content": msg.content
+        })
+    
+    # Log conversation history for debugging
+    logger.info(f"Order {order_id}: Passing {len(messages)} messages from conversation history to LangGraph")
+    
+    # Get chart and dasha data from order's analysis_data for follow-up messages
+    chart_data = None
+    dasha_data = None
+    if order.analysis_data:
+        chart_data = chart_data_from_json(order.analysis_data.get("chart_data"))
+        dasha_data = order.analysis_data.get("dasha_data")
+        logger.info(f"Order {order_id}: Retrieved chart_data and dasha_data from analysis_data for follow-up message")
+    
+    # Prepare state with chat history and chart/dasha data
+    initial_state: AstroGuruState = {
+        "user_message": user_message,
+        "messages": messages,
+        "birth_details": normalized_birth_details,
+        "location_data": None,
+        "chart_data": chart_data,  # Use saved chart data for context
+        "dasha_data": dasha_data,  # Use saved dasha data for context
+        "goal_analysis_data": None,
+        "recommendation_data": None,
+        "summary": None,
+        "analysis_context": None,
+        "current_step": None,
+        "analysis_complete": True if chart_data and dasha_data else False,  # Mark complete if we have analysis data
+        "error": None,
+        "request_type": "analysis"  # Route to analysis workflow
+    }
+    return initial_state, next_message_number
+
+
+def _last_assistant_message(state: Dict[str, Any]) -> str:
+    """Content of the last assistant message in a graph result, or ""."""
+    for msg in reversed(state.get("messages") or []):
+        if msg.get("role") == "assistant":
+            return msg.get("content", "")
+    return ""
+
+
+def _save_chat_turn(
+    db: Session,
+    order_id: int,
+    user_message: str,
+    response_text: str,
+    next_message_number: int
+) -> ChatMessageResponse:
+    """Persist a user message and its answer, and report how many messages remain."""
+    from services.chat_service import chat_service
+    
+    # Save user message and assistant response
+    chat_service.save_chat_message(db, order_id, "user", user_message, next_message_number)
+    chat_service.save_chat_message(db, order_id, "assistant", response_text, next_message_number + 1)
+    
+    # Check if user can continue (based on user message count)
+    new_user_count = chat_service.get_user_message_count(db, order_id)
+    can_continue = new_user_count < 3
+    messages_remaining = max(0, 3 - new_user_count)
+    
+    return ChatMessageResponse(
+        message=response_text,
+        message_number=next_message_number + 1,
+        messages_remaining=messages_remaining,
+        can_continue=can_continue
+    )
+
+
 @app.post("/api/v1/orders/{order_id}/chat", response_model=ChatMessageResponse)
 async def send_chat_message(
     order_id: int,
@@ -1143,127 +1392,20 @@ async def send_chat_message(
     db: Session = Depends(get_db)
 ):
     """Send a chat message for a query order"""
-    from services.chat_service import chat_service
-    from graph.query_workflow import create_query_graph
-    
     try:
-        # Get order and verify ownership
-        order = order_service.get_order(db, order_id, current_user["user_id"])
-        if not order:
-            raise HTTPException(status_code=404, detail="Order not found")
-        
-        # Verify order type is query
-        if order.type != "query":
-            raise HTTPException(
-                status_code=400,
-                detail="Chat is only available for query type orders"
-            )
-        
-        # Verify payment is successful
-        if not order.payment or order.payment.status != "success":
-            raise HTTPException(
-                status_code=400,
-                detail="Payment must be successful to use chat"
-            )
-        
-        # Check message limit (max 3 user messages total)
-        if not chat_service.can_send_message(db, order_id, max_user_messages=3):
-            raise HTTPException(
-                status_code=400,
-                detail="Message limit reached. Please create a new query order to continue."
-            )
-        
-        # Get current user message count
-        user_message_count = chat_service.get_user_message_count(db, order_id)
-        next_message_number = chat_service.get_next_message_number(db, order_id)
-        
-        # Get birth details
-        birth_details = order.birth_details or {}
-        normalized_birth_details = {
-            "name": birth_details.get("name", "User"),
-            "date_of_birth": birth_details.get("dateOfBirth") or birth_details.get("date_of_birth", ""),
-            "time_of_birth": birth_details.get("timeOfBirth") or birth_details.get("time_of_birth", ""),
-            "place_of_birth": birth_details.get("placeOfBirth") or birth_details.get("place_of_birth", ""),
-            "goals": birth_details.get("goals", []),
-            "latitude": birth_details.get("latitude"),
-            "longitude": birth_details.get("longitude")
-        }
-        
-        # Get chat history for context (includes initial query and all follow-ups)
-        chat_history = chat_service.get_chat_history(db, order_id)
-        messages = []
-        for msg in chat_history:
-            messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
-        
-        # Log conversation history for debugging
-        logger.info(f"Order {order_id}: Passing {len(messages)} messages from conversation history to LangGraph")
-        
-        # Build user message
-        user_message = request.message
-        
-        # Create query graph
-        query_graph = create_query_graph()
-        
-        # Get chart and dasha data from order's analysis_data for follow-up messages
-        chart_data = None
-        dasha_data = None
-        if order.analysis_data:
-            chart_data = order.analysis_data.get("chart_data")
-            dasha_data = order.analysis_data.get("dasha_data")
-            logger.info(f"Order {order_id}: Retrieved chart_data and dasha_data from analysis_data for follow-up message")
-        
-        # Prepare state with chat history and chart/dasha data
-        initial_state: AstroGuruState = {
-            "user_message": user_message,
-            "messages": messages,
-            "birth_details": normalized_birth_details,
-            "location_data": None,
-            "chart_data": chart_data,  # Use saved chart data for context
-            "dasha_data": dasha_data,  # Use saved dasha data for context
-            "goal_analysis_data": None,
-            "recommendation_data": None,
-            "summary": None,
-            "analysis_context": None,
-            "current_step": None,
-            "analysis_complete": True if chart_data and dasha_data else False,  # Mark complete if we have analysis data
-            "error": None,
-            "request_type": "analysis"  # Route to analysis workflow
-        }
+        initial_state, next_message_number = _prepare_query_chat(
+            db, order_id, current_user["user_id"], request.message
+        )
         
-        # Process through query workflow
-        result = await query_graph.ainvoke(initial_state)
+        # Process through the compiled query workflow
+        result = await graph_registry.get(QUERY).ainvoke(initial_state)
         
         # Get the response from messages (last assistant message)
-        updated_messages = result.get("messages", [])
-        response_text = ""
-        if updated_messages:
-            # Find last assistant message
-            for msg in reversed(updated_messages):
-                if msg.get("role") == "assistant":
-                    response_text = msg.get("content", "")
-                    break
-            
+        response_text = _last_assistant_message(result)
         if not response_text:
             raise HTTPException(status_code=500, detail="Failed to generate response")
         
-        # Save user message and assistant response
-        chat_service.save_chat_message(db, order_id, "user", user_message, next_message_number)
-        chat_service.save_chat_message(db, order_id, "assistant", response_text, next_message_number + 1)
-        
-        # Check if user can continue (based on user message count)
-        new_user_count = chat_service.get_user_message_count(db, order_id)
-        can_continue = new_user_count < 3
-        messages_remaining = max(0, 3 - new_user_count)
-        
-        return ChatMessageResponse(
-            message=response_text,
-            message_number=next_message_number + 1,
-            messages_remaining=messages_remaining,
-            can_continue=can_continue
-        )
+        return _save_chat_turn(db, order_id, request.message, response_text, next_message_number)
         
     except HTTPException:
         raise
@@ -1272,6 +1414,82 @@ async def send_chat_message(
         raise HTTPException(status_code=500, detail="Failed to process chat message")
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """One server-sent event frame."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@app.post("/api/v1/orders/{order_id}/chat/stream")
+async def stream_chat_message(
+    order_id: int,
+    request: ChatMessageRequest,
+    current_user: dict = Depends(get_current_user_dependency),
+    db: Session = Depends(get_db)
+):
+    """Send a chat message for a query order and stream the answer as server-sent events.
+    
+    Events:
+    - token: {"text"} - answer text as the model produces it
+    - done: ChatMessageResponse fields, sent after the turn is saved; its message
+      is the saved answer and replaces the streamed text
+    - error: {"detail"} - the turn failed and was not saved
+    
+    Validation errors (missing order, unpaid, message limit) are returned as
+    normal HTTP errors before the stream starts.
+    """
+    from database import SessionLocal
+    
+    initial_state, next_message_number = _prepare_query_chat(
+        db, order_id, current_user["user_id"], request.message
+    )
+    query_graph = graph_registry.get(QUERY)
+    
+    async def sse_events():
+        started = time.perf_counter()
+        first_token_at = None
+        streamed = []
+        result = None
+        try:
+            async for event in query_graph.astream_events(initial_state, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream" and event.get("metadata", {}).get("langgraph_node") == "chat":
+                    text = event["data"]["chunk"].content
+                    if text:
+                        if first_token_at is None:
+                            first_token_at = time.perf_counter()
+                            logger.info(f"Order {order_id}: First chat token after {first_token_at - started:.2f}s")
+                        streamed.append(text)
+                        yield _sse_event("token", {"text": text})
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    result = event["data"].get("output")
+            
+            response_text = _last_assistant_message(result or {})
+            if not response_text:
+                yield _sse_event("error", {"detail": "Failed to generate response"})
+                return
+            if not streamed:
+                # Cached answer or the node's fallback message - nothing came through the model stream
+                yield _sse_event("token", {"text": response_text})
+            
+            # The request's session is closed once the response starts, so persist with a new one
+            stream_db = SessionLocal()
+            try:
+                reply = _save_chat_turn(stream_db, order_id, request.message, response_text, next_message_number)
+            finally:
+                stream_db.close()
+            logger.info(f"Order {order_id}: Streamed chat answer ({len(response_text)} chars) in {time.perf_counter() - started:.2f}s")
+            yield _sse_event("done", reply.model_dump())
+        except Exception as e:
+            logger.error(f"Error streaming chat message: {e}", exc_info=True)
+            yield _sse_event("error", {"detail": "Failed to process chat message"})
+    
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/v1/orders/{order_id}/chat/history")
 async def get_chat_history(
     order_id: int,
@@ -1337,7 +1555,7 @@ async def chat(
     if not current_user:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    if _graph is None:
+    if not graph_registry.ready:
         raise HTTPException(status_code=503, detail="AI service not available")
     
     # This endpoint is kept for backward compatibility
@@ -1348,6 +1566,46 @@ async def chat(
     )
 
 
+# ==================== Chart Endpoints ====================
+
+@app.post("/api/v1/charts/batch")
+async def compute_charts_batch(
+    request: ChartBatchRequest,
+    caller: dict = Depends(get_batch_caller)
+):
+    """Compute comprehensive charts for many birth records - partner API key or admin, rate limited per caller.
+    
+    Streams NDJSON, one line per record as it completes (not in input order):
+    {"index", "id", "success", "chart"} or {"index", "id", "success": false, "error"}.
+    """
+    max_records = AstroConfig.ChartEngineConfig.CHART_BATCH_MAX_RECORDS
+    if not request.records:
+        raise HTTPException(status_code=400, detail="records must not be empty")
+    if len(request.records) > max_records:
+        raise HTTPException(status_code=400, detail=f"At most {max_records} records per batch")
+    
+    retry_after = batch_rate_limiter.acquire(caller["caller"], caller["requests_per_hour"])
+    if retry_after > 0:
+        raise HTTPException(
+            status_code=429,
+            detail="Batch chart rate limit exceeded",
+            headers={"Retry-After": str(int(retry_after) + 1)}
+        )
+    
+    records = [record.model_dump() for record in request.records]
+    logger.info(f"{caller['caller']}: batch chart request with {len(records)} record(s)")
+    
+    async def ndjson_lines():
+        async for item in iter_comprehensive_charts(
+            records,
+            years_ahead=request.years_ahead,
+            divisional_charts=request.divisional_charts
+        ):
+            yield json.dumps(serialize_datetime(item), default=str) + "\n"
+    
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
 # ==================== Article Endpoints ====================
 
 @app.get("/api/v1/articles", response_model=List[ArticleListResponse])
@@ -1416,6 +1674,30 @@ async def get_article_categories(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Failed to get categories")
 
 
+# ==================== Place Endpoints ====================
+
+@app.get("/api/v1/places/autocomplete")
+async def autocomplete_places(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=25)
+):
+    """Suggest birth places from the offline gazetteer - publicly accessible"""
+    places = gazetteer.complete(q, limit=limit)
+    return {
+        "places": [
+            {
+                "place_name": location["place_name"],
+                "city": location["city"],
+                "state": location["state"],
+                "country": location["country"],
+                "latitude": location["latitude"],
+                "longitude": location["longitude"],
+            }
+            for location in (place.to_location() for place in places)
+        ]
+    }
+
+
 # Catch-all route for React Router (must be last, after all API routes)
 # This serves the React app for all non-API routes
 @app.get("/{full_path:path}")
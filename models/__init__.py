@@ -4,6 +4,7 @@ from models.user import User
 from models.order import Order
 from models.payment import Payment
 from models.chat_message import ChatMessage
+from models.geocode_cache import GeocodeCacheEntry
 
-__all__ = ["User", "Order", "Payment", "ChatMessage"]
+__all__ = ["User", "Order", "Payment", "ChatMessage", "GeocodeCacheEntry"]
 
@@ -0,0 +1,24 @@
+"""Geocode cache model"""
+
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, UniqueConstraint
+from sqlalchemy.sql import func
+from database import Base
+
+
+class GeocodeCacheEntry(Base):
+    """Resolved place or coordinates, so repeat birthplaces skip the geocoder"""
+    __tablename__ = "geocode_cache"
+    __table_args__ = (UniqueConstraint("kind", "cache_key", name="uq_geocode_cache_kind_key"),)
+    
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(16), nullable=False)  # "place" (normalized name) or "coordinates" (rounded "lat,lon")
+    cache_key = Column(String(255), nullable=False)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    location_data = Column(JSON, nullable=False)  # Location data as returned by tools.geocoding_tools
+    hit_count = Column(Integer, default=0, nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    
+    def __repr__(self):
+        return f"<GeocodeCacheEntry(id={self.id}, kind={self.kind}, cache_key={self.cache_key}, hit_count={self.hit_count})>"
@@ -0,0 +1,93 @@
+"""Build a gazetteer TSV (tools/gazetteer.py format) from GeoNames dumps.
+
+Download from https://download.geonames.org/export/dump/:
+    cities15000.zip (or cities5000 / cities1000), admin1CodesASCII.txt, countryInfo.txt
+
+Point GAZETTEER_EXTRA_PATH at the output to load it next to the bundled
+tools/data/gazetteer.tsv.
+
+Usage:
+    python scripts/build_gazetteer.py cities15000.txt --admin1 admin1CodesASCII.txt \
+        --countries countryInfo.txt [--min-population 15000] [--country IN ...] --output gazetteer_geonames.tsv
+"""
+
+import argparse
+import csv
+import re
+import sys
+
+# GeoNames cities file columns
+NAME, ASCII_NAME, ALTERNATE_NAMES, LATITUDE, LONGITUDE = 1, 2, 3, 4, 5
+COUNTRY_CODE, ADMIN1_CODE, POPULATION, TIMEZONE = 8, 10, 14, 17
+
+# Alternate names kept per place (Latin-script only, e.g. Bombay for Mumbai)
+MAX_ALTERNATES = 8
+_LATIN_NAME = re.compile(r"^[A-Za-z][A-Za-z .'-]{2,}$")
+
+csv.field_size_limit(sys.maxsize)
+
+
+def read_table(path: str, key_column: int, value_column: int) -> dict:
+    """{key: value} from a tab-separated GeoNames file (comment lines skipped)."""
+    table = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("#") or not line.strip():
+                continue
+            columns = line.rstrip("\n").split("\t")
+            table[columns[key_column]] = columns[value_column]
+    return table
+
+
+def alternates(row: list) -> list:
+    """Distinct Latin-script alternate names other than the main name."""
+    seen = {row[NAME].lower()}
+    names = []
+    for name in [row[ASCII_NAME], *row[ALTERNATE_NAMES].split(",")]:
+        name = name.strip()
+        if _LATIN_NAME.match(name) and name.lower() not in seen:
+            seen.add(name.lower())
+            names.append(name)
+    return names[:MAX_ALTERNATES]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cities", help="GeoNames cities file (e.g. cities15000.txt)")
+    parser.add_argument("--admin1", required=True, help="admin1CodesASCII.txt (state names)")
+    parser.add_argument("--countries", required=True, help="countryInfo.txt (country names)")
+    parser.add_argument("--min-population", type=int, default=15000, help="Skip smaller places")
+    parser.add_argument("--country", action="append", default=[], help="ISO country code to keep (repeatable)")
+    parser.add_argument("--output", required=True, help="Where to write the gazetteer TSV")
+    args = parser.parse_args()
+
+    states = read_table(args.admin1, 0, 1)
+    countries = read_table(args.countries, 0, 4)
+    keep = {code.upper() for code in args.country}
+
+    written = 0
+    with open(args.cities, encoding="utf-8") as source, open(args.output, "w", encoding="utf-8", newline="") as out:
+        out.write("# Built from GeoNames (CC BY 4.0) with scripts/build_gazetteer.py\n")
+        writer = csv.writer(out, delimiter="\t", quoting=csv.QUOTE_NONE, lineterminator="\n")
+        for row in csv.reader(source, delimiter="\t", quoting=csv.QUOTE_NONE):
+            population = int(row[POPULATION] or 0)
+            country_code = row[COUNTRY_CODE]
+            if population < args.min_population or (keep and country_code not in keep):
+                continue
+            writer.writerow([
+                row[NAME],
+                ",".join(alternates(row)),
+                states.get(f"{country_code}.{row[ADMIN1_CODE]}", ""),
+                countries.get(country_code, country_code),
+                country_code,
+                f"{float(row[LATITUDE]):.4f}",
+                f"{float(row[LONGITUDE]):.4f}",
+                population,
+                row[TIMEZONE],
+            ])
+            written += 1
+    print(f"Wrote {written} places to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Build the timezone grid index used by tools/timezone_lookup.py.
+
+Each cell of a lat/lon grid stores the index of the zone at its centre. When
+any of the cell's four corners lies in another zone, the cell is flagged as a
+boundary cell (BOUNDARY_FLAG) and lookups there are refined with
+TimezoneFinder's polygons at runtime. Requires timezonefinder:
+
+    pip install timezonefinder
+
+Corners are shared between neighbouring cells, so a 0.25° grid costs about two
+million point lookups (seconds with timezonefinder 9). The output is a .npy grid
+(uint16, loaded memory-mapped) plus a .json file with the zone names and
+resolution next to it. The default output is the grid bundled under tools/data.
+
+Usage:
+    python scripts/build_timezone_grid.py [--resolution 0.25] [--output tools/data/timezone_grid.npy]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+# Add project root to path
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+sys.path.insert(0, _project_root)
+
+from tools.timezone_lookup import BOUNDARY_FLAG, NO_ZONE, default_grid_path, grid_metadata_path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--resolution", type=float, default=0.25, help="Cell size in degrees")
+    parser.add_argument("--output", default=default_grid_path(), help="Where to write the grid (.npy)")
+    args = parser.parse_args()
+
+    from timezonefinder import TimezoneFinder
+    finder = TimezoneFinder()
+
+    rows, cols = round(180 / args.resolution), round(360 / args.resolution)
+    zones: dict = {}
+
+    def zone_index(latitude: float, longitude: float) -> int:
+        zone = finder.timezone_at(lat=latitude, lng=longitude)
+        if zone is None:
+            return NO_ZONE
+        return zones.setdefault(zone, len(zones))
+
+    lats = -90.0 + np.arange(rows + 1) * args.resolution
+    lons = -180.0 + np.arange(cols + 1) * args.resolution
+    corners = np.empty((rows + 1, cols + 1), dtype=np.uint16)
+    for i, lat in enumerate(lats):
+        for j, lon in enumerate(lons):
+            corners[i, j] = zone_index(float(lat), float(lon))
+        print(f"\rCorners: {i + 1}/{rows + 1} rows", end="", file=sys.stderr)
+
+    grid = np.empty((rows, cols), dtype=np.uint16)
+    half = args.resolution / 2
+    for i in range(rows):
+        for j in range(cols):
+            grid[i, j] = zone_index(float(lats[i] + half), float(lons[j] + half))
+        print(f"\rCells: {i + 1}/{rows} rows  ", end="", file=sys.stderr)
+    print(file=sys.stderr)
+
+    if len(zones) >= NO_ZONE:
+        raise SystemExit(f"Too many zones for a uint16 grid: {len(zones)}")
+
+    boundary = (
+        (corners[:-1, :-1] != grid) | (corners[:-1, 1:] != grid)
+        | (corners[1:, :-1] != grid) | (corners[1:, 1:] != grid)
+    )
+    grid[boundary] |= BOUNDARY_FLAG
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    np.save(args.output, grid)
+    with open(grid_metadata_path(args.output), "w", encoding="utf-8") as f:
+        json.dump({"resolution": args.resolution, "zones": list(zones)}, f)
+    print(
+        f"Wrote {rows}x{cols} grid ({len(zones)} zones, {int(boundary.sum())} boundary cells) to {args.output}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Train the router's intent model from the seed examples and logged router decisions.
+
+Logged decisions come from the router node with ROUTER_DECISION_LOG_ENABLED=true
+(CACHE_DIR/router_decisions.jsonl, one {"text", "route"} per line). Review them
+before training - they are the LLM's answers, not hand labels.
+
+Usage:
+    python scripts/train_router_classifier.py [--data extra.jsonl ...] [--output router_model.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+
+# Add project root to path
+_script_dir = os.path.dirname(os.path.abspath(__file__))
+_project_root = os.path.dirname(_script_dir)
+sys.path.insert(0, _project_root)
+
+from tools.intent_classifier import (
+    SEED_DATA_PATH,
+    IntentModel,
+    default_decision_log_path,
+    default_model_path,
+    load_examples,
+    normalize_message,
+)
+
+
+def accuracy(model: IntentModel, examples) -> float:
+    correct = sum(
+        (model.predict_proba(normalize_message(text)) >= 0.5) == (route == "analysis")
+        for text, route in examples
+    )
+    return correct / len(examples) if examples else 0.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data", action="append", default=[], help="Extra JSONL files of {text, route}")
+    parser.add_argument("--no-log", action="store_true", help="Do not include the logged router decisions")
+    parser.add_argument("--output", default=default_model_path(), help="Where to write the model JSON")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction held out to report accuracy")
+    args = parser.parse_args()
+
+    paths = [SEED_DATA_PATH] + args.data + ([] if args.no_log else [default_decision_log_path()])
+    examples = load_examples(paths)
+    if not examples:
+        sys.exit("No training examples found")
+    print(f"Loaded {len(examples)} examples from {len(paths)} file(s)")
+
+    shuffled = examples[:]
+    random.Random(0).shuffle(shuffled)
+    split = int(len(shuffled) * (1 - args.holdout))
+    if 0 < split < len(shuffled):
+        held_out_model = IntentModel.train(shuffled[:split])
+        print(f"Hold-out accuracy: {accuracy(held_out_model, shuffled[split:]):.1%} on {len(shuffled) - split} examples")
+
+    model = IntentModel.train(examples)
+    print(f"Training accuracy: {accuracy(model, examples):.1%}")
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(model.to_json(), f)
+    print(f"Saved model to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,14 @@
+"""Shared pytest setup: run from the repo root without a .env or a worker pool"""
+
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Must be set before config is imported
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+os.environ.setdefault("CHART_WORKERS", "0")
+os.environ.setdefault("CHART_CACHE_DISK_ENABLED", "false")
+os.environ.setdefault("ASTRO_CACHE_DIR", tempfile.mkdtemp(prefix="astroguru-tests-"))
@@ -0,0 +1,49 @@
+"""Tests for batch chart access, quotas and capacity"""
+
+import pytest
+from fastapi import HTTPException
+
+from auth import dependencies
+from auth.api_keys import PartnerKeyStore
+from tools import chart_batch
+from tools.chart_batch import BatchRateLimiter
+
+
+def test_partner_keys_parse_with_default_and_own_quota():
+    store = PartnerKeyStore("acme:k1, globex:k2:50,broken,bad:k3:x,", default_requests_per_hour=10)
+    assert len(store) == 2
+    assert (store.find("k1").name, store.find("k1").requests_per_hour) == ("acme", 10)
+    assert (store.find("k2").name, store.find("k2").requests_per_hour) == ("globex", 50)
+    assert store.find("k3") is None
+    assert store.find("nope") is None
+
+
+def test_rate_limiter_uses_per_caller_quota():
+    limiter = BatchRateLimiter(max_requests=1, window_seconds=3600)
+    assert limiter.acquire("partner:globex", 2) == 0
+    assert limiter.acquire("partner:globex", 2) == 0
+    assert limiter.acquire("partner:globex", 2) > 0
+    assert limiter.acquire("admin:1") == 0
+    assert limiter.acquire("admin:1") > 0
+
+
+def test_partner_key_grants_batch_access(monkeypatch):
+    monkeypatch.setattr(dependencies, "partner_api_keys", PartnerKeyStore("acme:secret:25", 10))
+    caller = dependencies.get_batch_caller(api_key="secret", credentials=None)
+    assert caller == {"caller": "partner:acme", "requests_per_hour": 25}
+
+
+@pytest.mark.parametrize("api_key, status", [("wrong", 401), (None, 401)])
+def test_batch_access_requires_a_valid_key(monkeypatch, api_key, status):
+    monkeypatch.setattr(dependencies, "partner_api_keys", PartnerKeyStore("acme:secret", 10))
+    with pytest.raises(HTTPException) as excinfo:
+        dependencies.get_batch_caller(api_key=api_key, credentials=None)
+    assert excinfo.value.status_code == status
+
+
+def test_batch_concurrency_follows_the_batch_pool(monkeypatch):
+    monkeypatch.setattr(chart_batch.batch_chart_engine, "max_workers", 12)
+    monkeypatch.setattr(chart_batch.AstroConfig.ChartEngineConfig, "CHART_BATCH_CONCURRENCY", 0)
+    assert chart_batch.batch_concurrency() == 12
+    monkeypatch.setattr(chart_batch.AstroConfig.ChartEngineConfig, "CHART_BATCH_CONCURRENCY", 3)
+    assert chart_batch.batch_concurrency() == 3
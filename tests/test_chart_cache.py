@@ -0,0 +1,79 @@
+"""Tests for chart cache keys and cached comprehensive charts"""
+
+import pytest
+
+from tools import vedastro_tools
+from tools.chart_cache import ChartCache, make_chart_key
+
+BIRTH = ("1990-05-15", "14:30", 12.9716, 77.5946)
+
+
+def test_key_ignores_time_format_and_coordinate_noise():
+    assert make_chart_key("1990-05-15", "14:30", 12.9716, 77.5946) == make_chart_key(
+        " 1990-05-15", "14:30:00 ", 12.97160001, 77.59459999
+    )
+
+
+def test_key_normalizes_negative_zero():
+    assert make_chart_key(*BIRTH[:2], 0.0, -0.0) == make_chart_key(*BIRTH[:2], -0.0, 0.0)
+
+
+def test_key_ignores_varga_order_and_case():
+    assert make_chart_key(*BIRTH, ["D9", "d10"]) == make_chart_key(*BIRTH, ["d10", "d9", "d9"])
+
+
+@pytest.mark.parametrize("changed", [
+    ("1990-05-16", "14:30", 12.9716, 77.5946),
+    ("1990-05-15", "14:31", 12.9716, 77.5946),
+    ("1990-05-15", "14:30", 12.9717, 77.5946),
+])
+def test_key_changes_with_birth_data(changed):
+    assert make_chart_key(*BIRTH) != make_chart_key(*changed)
+
+
+def test_key_distinguishes_vargas_horizon_and_timezone():
+    key = make_chart_key(*BIRTH)
+    assert key != make_chart_key(*BIRTH, ["d9"])
+    assert key != make_chart_key(*BIRTH, years_ahead=5)
+    assert key != make_chart_key(*BIRTH, timezone="Asia/Kolkata")
+
+
+def test_key_precision():
+    assert make_chart_key(*BIRTH[:2], 12.97, 77.59, precision=2) == make_chart_key(
+        *BIRTH[:2], 12.9749, 77.5851, precision=2
+    )
+
+
+@pytest.mark.asyncio
+async def test_set_drops_time_dependent_fields():
+    cache = ChartCache(max_entries=4)
+    await cache.set("k", {"success": True, "dasha": {"current_dasha": "stale"}, "lagna": {"sign": "Leo"}})
+    assert await cache.get("k") == {"success": True, "lagna": {"sign": "Leo"}}
+
+
+def _engine_result(*args, **kwargs):
+    """A fresh engine result whose dasha section is jyotishganit's, not the dasha engine's."""
+    return {
+        "success": True,
+        "planetary_positions": {"Moon": {"sign": "Leo", "sign_degrees": 3.4}},
+        "lagna": {"sign": "Virgo"},
+        "dasha": {"current_dasha": {"planet": "Mars", "duration_years": None}, "upcoming_dashas": []},
+    }
+
+
+@pytest.mark.asyncio
+async def test_cache_hit_and_miss_return_same_dasha(monkeypatch):
+    cache = ChartCache(max_entries=4)
+    monkeypatch.setattr(vedastro_tools, "chart_cache", cache)
+
+    async def calculate(*args, **kwargs):
+        return _engine_result()
+
+    monkeypatch.setattr(vedastro_tools, "_calculate_in_engine", calculate)
+
+    miss = await vedastro_tools.get_comprehensive_chart(*BIRTH, "Bangalore, India")
+    hit = await vedastro_tools.get_comprehensive_chart(*BIRTH, "Bangalore, India")
+
+    assert cache.stats()["memory"]["hits"] == 1
+    assert miss["dasha"]["current_dasha"]["duration_years"] is not None
+    assert hit["dasha"] == miss["dasha"]
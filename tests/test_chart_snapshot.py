@@ -0,0 +1,183 @@
+"""Tests for the array-backed chart snapshot and its binary encoding"""
+
+import base64
+from datetime import datetime
+
+import pytest
+
+from tools.chart_snapshot import (
+    SNAPSHOT_MAGIC,
+    SNAPSHOT_VERSION,
+    ChartSnapshot,
+    _HEADER,
+    chart_data_from_json,
+    chart_data_to_json,
+    pack_chart_data,
+)
+from tools.vedastro_tools import NAKSHATRAS, PANCHANGA_FIELDS, PLANET_NAMES, SHADBALA_FIELDS, SIGN_LORDS, ZODIAC_SIGNS
+
+
+def _chart_data():
+    """A comprehensive chart result shaped like get_comprehensive_chart's, Lagna in Virgo."""
+    positions, shadbala = {}, {}
+    for i, name in enumerate(PLANET_NAMES):
+        sign = (i * 5) % 12
+        house = (sign - 5) % 12 + 1
+        positions[name] = {
+            "celestial_body": name,
+            "sign": ZODIAC_SIGNS[sign],
+            "sign_degrees": 3.25 + i,
+            "nakshatra": NAKSHATRAS[(sign * 9) // 4],
+            "pada": i % 4 + 1,
+            "house": house,
+            "longitude": sign * 30.0 + 3.25 + i,
+        }
+        if name not in ("Rahu", "Ketu"):
+            positions[name]["dignities"] = {"dignity": "neutral", "planet_tattva": "Fire"}
+            shadbala[name] = {key: 100.5 + i for key, _ in SHADBALA_FIELDS}
+    shadbala["Rahu"] = {"error": "Shadbala is not defined for nodes"}
+
+    house_signs = [(5 + i) % 12 for i in range(12)]
+    return {
+        "success": True,
+        "lagna": {"sign": "Virgo", "sign_degrees": 12.5, "longitude": 162.5, "lord": SIGN_LORDS["Virgo"], "house": 1},
+        "dasha": {
+            "current_dasha": {
+                "planet": "Venus", "start": datetime(2015, 3, 1, 6, 30), "end": datetime(2035, 3, 1, 8, 12), "duration_years": 20.0
+            },
+            "upcoming_dashas": [
+                {"planet": "Sun", "start": datetime(2035, 3, 1, 8, 12), "end": datetime(2041, 3, 1, 11, 2), "duration_years": 6.0},
+            ],
+        },
+        "shadbala": shadbala,
+        "planetary_positions": positions,
+        "house_positions": [
+            {
+                "house": i + 1,
+                "sign": ZODIAC_SIGNS[sign],
+                "occupants": [name for name, position in positions.items() if position["house"] == i + 1],
+            }
+            for i, sign in enumerate(house_signs)
+        ],
+        "divisional_charts": {"d60": {"error": "Unknown divisional chart"}},
+        "panchanga": {field: f"{field}-value" for field in PANCHANGA_FIELDS},
+        "rashi": {
+            "sign": positions["Moon"]["sign"], "nakshatra": positions["Moon"]["nakshatra"], "pada": positions["Moon"]["pada"]
+        },
+        "ayanamsa": {"name": "Lahiri", "value": 23.72},
+        "birth_time": "1990-05-15 14:30",
+        "location": "Bangalore, India",
+        "timezone": "Asia/Kolkata",
+    }
+
+
+def test_snapshot_matches_chart_data():
+    chart_data = _chart_data()
+    snapshot = ChartSnapshot.from_chart_data(chart_data)
+    assert snapshot.to_dict() == chart_data
+    assert snapshot["lagna"] == chart_data["lagna"]
+    assert snapshot.get("timezone") == "Asia/Kolkata"
+    assert set(snapshot) == set(chart_data)
+
+
+def test_bytes_round_trip():
+    snapshot = ChartSnapshot.from_chart_data(_chart_data())
+    data = snapshot.to_bytes()
+    assert data.startswith(SNAPSHOT_MAGIC)
+    assert snapshot.nbytes == len(data)
+
+    restored = ChartSnapshot.from_bytes(data)
+    assert restored.to_dict() == _chart_data()
+    assert restored.to_bytes() == data
+
+
+def test_encode_round_trip():
+    snapshot = ChartSnapshot.from_chart_data(_chart_data())
+    text = snapshot.encode()
+    assert isinstance(text, str)
+    assert ChartSnapshot.decode(text).to_dict() == _chart_data()
+
+
+def test_json_form_round_trip():
+    snapshot = ChartSnapshot.from_chart_data(_chart_data())
+    stored = chart_data_to_json(snapshot)
+    assert set(stored) == {"snapshot"}
+    assert chart_data_from_json(stored).to_dict() == _chart_data()
+
+
+def test_json_form_passes_plain_dicts_through():
+    chart_data = _chart_data()
+    assert chart_data_to_json(chart_data) is chart_data
+    assert chart_data_from_json(chart_data) is chart_data
+    assert chart_data_from_json(None) is None
+
+
+def _with_header(data: bytes, **fields) -> bytes:
+    magic, version, n_planets, n_houses, n_dashas, meta_length = _HEADER.unpack_from(data)
+    header = _HEADER.pack(
+        fields.get("magic", magic), fields.get("version", version), n_planets, n_houses, n_dashas, meta_length
+    )
+    return header + data[_HEADER.size:]
+
+
+def test_rejects_bad_magic():
+    data = ChartSnapshot.from_chart_data(_chart_data()).to_bytes()
+    with pytest.raises(ValueError, match="Not a chart snapshot"):
+        ChartSnapshot.from_bytes(_with_header(data, magic=b"XXXX"))
+
+
+def test_rejects_unknown_version():
+    data = ChartSnapshot.from_chart_data(_chart_data()).to_bytes()
+    with pytest.raises(ValueError, match="version"):
+        ChartSnapshot.from_bytes(_with_header(data, version=SNAPSHOT_VERSION + 1))
+
+
+@pytest.mark.parametrize("cut", [0, 3, _HEADER.size, _HEADER.size + 50, -1])
+def test_rejects_truncated_data(cut):
+    data = ChartSnapshot.from_chart_data(_chart_data()).to_bytes()
+    with pytest.raises(ValueError, match="truncated"):
+        ChartSnapshot.from_bytes(data[:cut])
+
+
+def test_rejects_trailing_data():
+    data = ChartSnapshot.from_chart_data(_chart_data()).to_bytes()
+    with pytest.raises(ValueError):
+        ChartSnapshot.from_bytes(data + b"\x00")
+
+
+def test_corrupt_stored_snapshot_loads_as_none():
+    data = ChartSnapshot.from_chart_data(_chart_data()).to_bytes()
+    corrupt = base64.b64encode(_with_header(data, magic=b"XXXX")).decode("ascii")
+    assert chart_data_from_json({"snapshot": corrupt}) is None
+    assert chart_data_from_json({"snapshot": base64.b64encode(data[:20]).decode("ascii")}) is None
+
+
+def test_pack_chart_data():
+    packed = pack_chart_data(_chart_data())
+    assert isinstance(packed, ChartSnapshot)
+    assert pack_chart_data(packed) is packed
+    assert pack_chart_data(None) is None
+
+
+def _unknown_lagna_field(chart_data):
+    chart_data["lagna"]["navamsa_sign"] = "Leo"
+
+
+def _reordered_planets(chart_data):
+    positions = chart_data["planetary_positions"]
+    chart_data["planetary_positions"] = {name: positions[name] for name in reversed(PLANET_NAMES)}
+
+
+def _failed_chart(chart_data):
+    chart_data["success"] = False
+
+
+def _missing_shadbala_value(chart_data):
+    del chart_data["shadbala"]["Sun"]["total"]
+
+
+@pytest.mark.parametrize("change", [_unknown_lagna_field, _reordered_planets, _failed_chart, _missing_shadbala_value])
+def test_pack_chart_data_falls_back_to_plain_dict(change):
+    chart_data = _chart_data()
+    change(chart_data)
+    assert pack_chart_data(chart_data) is chart_data
@@ -0,0 +1,160 @@
+"""Tests for the native Vimshottari dasha engine"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from tools.dasha_engine import (
+    YEAR_DURATION_DAYS,
+    build_dasha_timeline,
+    dasha_timeline_for_birth,
+    moon_longitude_from_chart_data,
+)
+
+BIRTH = datetime(2000, 1, 1, 6, 0)
+YEAR = timedelta(days=YEAR_DURATION_DAYS)
+TOLERANCE = timedelta(milliseconds=1)
+
+# Lords and years from Ketu, the lord of Ashwini (Moon at 0 degrees)
+SEQUENCE = [("Ketu", 7), ("Venus", 20), ("Sun", 6), ("Moon", 10), ("Mars", 7),
+            ("Rahu", 18), ("Jupiter", 16), ("Saturn", 19), ("Mercury", 17)]
+
+
+def _close(actual: datetime, expected: datetime) -> bool:
+    return abs(actual - expected) <= TOLERANCE
+
+
+def _mahadashas(timeline):
+    return [timeline.period(0, i) for i in range(9)]
+
+
+def test_moon_at_start_of_ashwini_gives_full_ketu_then_sequence():
+    timeline = build_dasha_timeline(0.0, BIRTH)
+    start = BIRTH
+    for period, (lord, years) in zip(_mahadashas(timeline), SEQUENCE):
+        assert period["planet"] == lord
+        assert _close(period["start"], start)
+        assert _close(period["end"], start + years * YEAR)
+        assert period["duration_years"] == years
+        start += years * YEAR
+
+
+def test_moon_halfway_through_bharani_splits_venus_around_birth():
+    # Bharani spans 13°20'-26°40' and is ruled by Venus (20 years); 20° is its midpoint
+    venus = _mahadashas(build_dasha_timeline(20.0, BIRTH))[0]
+    assert venus["planet"] == "Venus"
+    assert _close(venus["start"], BIRTH - 10 * YEAR)
+    assert _close(venus["end"], BIRTH + 10 * YEAR)
+
+
+def test_moon_in_magha_leaves_the_untraversed_share_of_ketu():
+    # 123.4° is 3.4° into Magha (Ketu): 3.4 / 13.333 of Ketu's 7 years has elapsed
+    timeline = build_dasha_timeline(123.4, BIRTH)
+    ketu = timeline.period(0, 0)
+    remaining_years = 7 * (1 - 3.4 / (360 / 27))
+    assert ketu["planet"] == "Ketu"
+    assert _close(ketu["end"], BIRTH + remaining_years * YEAR)
+    assert timeline.birth_nakshatra == "Magha"
+    assert timeline.to_dict(today=BIRTH)["balance_at_birth"] == {"planet": "Ketu", "years": round(remaining_years, 4)}
+
+
+def test_antardashas_and_pratyantardashas_start_from_their_parent_lord():
+    timeline = build_dasha_timeline(0.0, BIRTH)
+    # Venus mahadasha: Venus-Venus is 20 * 20 / 120 years, then Venus-Sun 20 * 6 / 120 years
+    venus_start = BIRTH + 7 * YEAR
+    venus_venus, venus_sun = timeline.period(1, 9), timeline.period(1, 10)
+    assert (venus_venus["planet"], venus_sun["planet"]) == ("Venus", "Sun")
+    assert _close(venus_venus["start"], venus_start)
+    assert _close(venus_sun["start"], venus_start + (20 * 20 / 120) * YEAR)
+    assert _close(venus_sun["end"], venus_start + (20 * 26 / 120) * YEAR)
+    # Venus-Sun-Sun: 1 year * 6 / 120
+    sun_sun = timeline.period(2, 10 * 9)
+    assert sun_sun["planet"] == "Sun"
+    assert _close(sun_sun["end"], venus_sun["start"] + (6 / 120) * YEAR)
+
+
+def test_levels_tile_the_120_year_cycle():
+    timeline = build_dasha_timeline(211.7, BIRTH)
+    for level in range(3):
+        starts, ends = timeline.starts[level], timeline.ends[level]
+        np.testing.assert_allclose(starts[1:], ends[:-1], rtol=0, atol=1e-9)
+        assert ends[-1] - starts[0] == pytest.approx(120 * YEAR_DURATION_DAYS)
+
+
+def test_lookup_at_boundaries():
+    timeline = build_dasha_timeline(0.0, BIRTH)
+    venus_start = timeline.period(0, 1)["start"]
+    second = timedelta(seconds=1)
+
+    before, at = timeline.lookup([venus_start - second, venus_start])
+    assert (before[0], at[0]) == (0, 1)
+    assert (before[1], at[1]) == (8, 9)  # Ketu-Mercury, then Venus-Venus
+    assert (before[2], at[2]) == (80, 81)
+
+    outside = timeline.lookup([BIRTH - second, BIRTH + 120 * YEAR + second])
+    assert (outside == -1).all()
+
+
+def test_lookup_accepts_datetime64_arrays():
+    timeline = build_dasha_timeline(77.0, BIRTH)
+    dates = [BIRTH + timedelta(days=400 * i) for i in range(30)]
+    as_array = np.array(dates, dtype="datetime64[us]")
+    np.testing.assert_array_equal(timeline.lookup(as_array), timeline.lookup(dates))
+
+
+def test_periods_at():
+    timeline = build_dasha_timeline(0.0, BIRTH)
+    running = timeline.periods_at(BIRTH + 7 * YEAR + timedelta(days=1))
+    assert running["mahadasha"]["planet"] == "Venus"
+    assert running["antardasha"]["planet"] == "Venus"
+    assert running["pratyantardasha"]["planet"] == "Venus"
+    assert timeline.periods_at(BIRTH - timedelta(days=1)) == {
+        "mahadasha": None, "antardasha": None, "pratyantardasha": None
+    }
+
+
+def test_to_dict_current_and_upcoming():
+    timeline = build_dasha_timeline(0.0, BIRTH)
+    dasha = timeline.to_dict(today=BIRTH + 8 * YEAR, years_ahead=10)
+    assert dasha["current_dasha"]["planet"] == "Venus"
+    # Sun starts 27 years after birth, beyond the 10-year horizon: still listed as the next mahadasha
+    assert [period["planet"] for period in dasha["upcoming_dashas"]] == ["Sun"]
+
+
+def test_timeline_from_chart_data():
+    chart_data = {"planetary_positions": {"Moon": {"sign": "Leo", "sign_degrees": 3.4}}}
+    assert moon_longitude_from_chart_data(chart_data) == pytest.approx(123.4)
+    timeline = dasha_timeline_for_birth("2000-01-01", "06:00", chart_data=chart_data)
+    assert timeline.period(0, 0)["planet"] == "Ketu"
+    assert dasha_timeline_for_birth("2000-01-01", "06:00", chart_data={}) is None
+    assert dasha_timeline_for_birth("not a date", "06:00", chart_data=chart_data) is None
+
+
+@pytest.mark.parametrize("moon_longitude", [0.0, 20.0, 123.4, 211.7, 359.99])
+def test_matches_jyotishganit_periods(monkeypatch, moon_longitude):
+    vimshottari = pytest.importorskip("jyotishganit.dasha.vimshottari")
+    span = 360.0 / 27.0
+    # Feed jyotishganit the same Moon position instead of computing it from the ephemeris
+    monkeypatch.setattr(vimshottari, "skyfield_time_from_datetime", lambda *args: None)
+    monkeypatch.setattr(
+        vimshottari, "_get_moon_nakshatra_at_birth",
+        lambda t, ayanamsa: (int(moon_longitude / span), moon_longitude % span)
+    )
+    expected = vimshottari.calculate_vimshottari_dashas(BIRTH, 5.5, 0.0, 0.0, 0.0).all["mahadashas"]
+    timeline = build_dasha_timeline(moon_longitude, BIRTH)
+
+    pd_index = 0
+    for md_index, (md_lord, md) in enumerate(expected.items()):
+        assert timeline.period(0, md_index)["planet"] == md_lord
+        assert _close(timeline.period(0, md_index)["start"], md["start"])
+        for ad_offset, (ad_lord, ad) in enumerate(md["antardashas"].items()):
+            ad_period = timeline.period(1, md_index * 9 + ad_offset)
+            assert ad_period["planet"] == ad_lord
+            assert _close(ad_period["end"], ad["end"])
+            for pd_lord, pd in ad["pratyantardashas"].items():
+                pd_period = timeline.period(2, pd_index)
+                assert pd_period["planet"] == pd_lord
+                assert _close(pd_period["start"], pd["start"]) and _close(pd_period["end"], pd["end"])
+                pd_index += 1
+    assert pd_index == 729
@@ -0,0 +1,90 @@
+"""Tests for the Nominatim gateway's token bucket pacing"""
+
+import asyncio
+import heapq
+
+import pytest
+
+from tools.geocoding_gateway import TokenBucket
+
+
+class FakeTime:
+    """Virtual clock: sleepers wake in deadline order without real waiting."""
+
+    def __init__(self):
+        self.now = 0.0
+        self._sleepers = []
+        self._seq = 0
+
+    def clock(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._sleepers, (self.now + seconds, self._seq, future))
+        self._seq += 1
+        await future
+
+    async def run(self, tasks) -> None:
+        while not all(task.done() for task in tasks):
+            for _ in range(20):
+                await asyncio.sleep(0)
+            if self._sleepers:
+                wake, _, future = heapq.heappop(self._sleepers)
+                self.now = max(self.now, wake)
+                future.set_result(None)
+
+
+async def _acquire_times(fake: FakeTime, bucket: TokenBucket, callers: int, pause_at=None, pause_for=0.0):
+    times = []
+
+    async def caller():
+        await bucket.acquire()
+        times.append(fake.now)
+
+    async def pauser():
+        await fake.sleep(pause_at)
+        bucket.pause(pause_for)
+
+    tasks = [asyncio.create_task(caller()) for _ in range(callers)]
+    if pause_at is not None:
+        tasks.append(asyncio.create_task(pauser()))
+    await fake.run(tasks)
+    return sorted(times)
+
+
+@pytest.mark.asyncio
+async def test_callers_are_paced_at_the_rate():
+    fake = FakeTime()
+    bucket = TokenBucket(rate=1.0, capacity=1.0, clock=fake.clock, sleep=fake.sleep)
+    assert await _acquire_times(fake, bucket, 4) == pytest.approx([0.0, 1.0, 2.0, 3.0])
+
+
+@pytest.mark.asyncio
+async def test_pause_holds_back_queued_callers_and_keeps_pacing():
+    fake = FakeTime()
+    bucket = TokenBucket(rate=1.0, capacity=1.0, clock=fake.clock, sleep=fake.sleep)
+    times = await _acquire_times(fake, bucket, 5, pause_at=0.5, pause_for=3.0)
+    assert times == pytest.approx([0.0, 3.5, 4.5, 5.5, 6.5])
+
+
+@pytest.mark.asyncio
+async def test_shorter_pause_does_not_shorten_a_running_one():
+    fake = FakeTime()
+    bucket = TokenBucket(rate=1.0, capacity=1.0, clock=fake.clock, sleep=fake.sleep)
+    bucket.pause(5.0)
+    bucket.pause(1.0)
+    assert await _acquire_times(fake, bucket, 2) == pytest.approx([5.0, 6.0])
+
+
+def test_acquire_reports_seconds_waited():
+    fake = FakeTime()
+    bucket = TokenBucket(rate=2.0, capacity=1.0, clock=fake.clock, sleep=fake.sleep)
+
+    async def main():
+        first = asyncio.create_task(bucket.acquire())
+        second = asyncio.create_task(bucket.acquire())
+        await fake.run([first, second])
+        return first.result(), second.result()
+
+    assert asyncio.run(main()) == pytest.approx((0.0, 0.5))
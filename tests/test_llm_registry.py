@@ -0,0 +1,64 @@
+"""Tests for the shared Gemini client registry"""
+
+import asyncio
+import threading
+
+from utils.llm_registry import LLMRegistry
+
+
+def _spy_transports(client, calls):
+    """Record transport closes (and the loop the async close ran on) instead of closing."""
+    client.client.transport.close = lambda: calls.append(("sync", None))
+
+    async def close_async():
+        calls.append(("async", asyncio.get_running_loop()))
+
+    client.async_client.transport.close = close_async
+
+
+async def _get(registry):
+    return registry.get()
+
+
+def test_client_from_a_new_loop_closes_the_replaced_one():
+    registry = LLMRegistry()
+    old_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=old_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        old_client = asyncio.run_coroutine_threadsafe(_get(registry), old_loop).result(5)
+        calls = []
+        _spy_transports(old_client, calls)
+
+        new_client = asyncio.run(_get(registry))
+        assert new_client is not old_client
+        assert registry.stats()["clients"] == 1
+
+        # The async close is scheduled on the loop the old client was created on
+        asyncio.run_coroutine_threadsafe(asyncio.sleep(0), old_loop).result(5)
+        assert calls == [("sync", None), ("async", old_loop)]
+    finally:
+        old_loop.call_soon_threadsafe(old_loop.stop)
+        thread.join(5)
+        old_loop.close()
+
+
+def test_client_from_a_closed_loop_gets_its_sync_transport_closed():
+    registry = LLMRegistry()
+    old_client = asyncio.run(_get(registry))
+    calls = []
+    _spy_transports(old_client, calls)
+
+    asyncio.run(_get(registry))
+    assert calls == [("sync", None)]
+
+
+def test_same_loop_reuses_the_client():
+    registry = LLMRegistry()
+
+    async def get_twice():
+        return registry.get(), registry.get()
+
+    first, second = asyncio.run(get_twice())
+    assert first is second
+    assert registry.stats() == {"clients": 1, "created": 1, "reused": 1}
@@ -0,0 +1,42 @@
+"""Tests for prompt compaction accounting"""
+
+import json
+import logging
+
+from tools import prompt_encoding
+from tools.prompt_encoding import PromptCompactionStats, estimate_tokens, report_compaction
+
+PAYLOAD = {"lagna": {"sign": "Virgo", "sign_degrees": 12.5}, "planets": list(range(20))}
+
+
+def test_unsampled_calls_skip_the_verbose_serialization(monkeypatch):
+    stats = PromptCompactionStats()
+    monkeypatch.setattr(prompt_encoding, "prompt_compaction_stats", stats)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("verbose payload serialized")
+
+    monkeypatch.setattr(prompt_encoding.json, "dumps", fail)
+    assert report_compaction("dasha", "compact", PAYLOAD, sample_rate=0.0) is None
+    assert stats.stats()["dasha"] == {
+        "calls": 1, "measured": 0, "verbose_tokens": 0, "compact_tokens": 0, "tokens_saved": 0
+    }
+
+
+def test_sampled_calls_are_measured(monkeypatch):
+    stats = PromptCompactionStats()
+    monkeypatch.setattr(prompt_encoding, "prompt_compaction_stats", stats)
+
+    verbose = estimate_tokens(json.dumps(PAYLOAD, indent=2))
+    assert report_compaction("dasha", "compact", PAYLOAD, sample_rate=1.0) == verbose - 2
+    assert stats.stats()["dasha"]["measured"] == 1
+
+
+def test_debug_logging_measures_every_call(monkeypatch, caplog):
+    stats = PromptCompactionStats()
+    monkeypatch.setattr(prompt_encoding, "prompt_compaction_stats", stats)
+
+    with caplog.at_level(logging.DEBUG, logger=prompt_encoding.__name__):
+        assert report_compaction("summarizer", "compact", PAYLOAD, sample_rate=0.0) is not None
+    assert stats.stats()["summarizer"]["measured"] == 1
+    assert "Prompt compaction (summarizer)" in caplog.text
@@ -0,0 +1,61 @@
+"""Tests for coordinate timezone lookup and the zones used for charts"""
+
+from datetime import datetime
+
+import pytest
+
+from tools.chart_report import render_chart_markdown
+from tools.timezone_lookup import BUNDLED_GRID_PATH, TimezoneLookup, utc_offset_hours
+from tools.vedastro_tools import _get_timezone_offset
+
+PLACES = [
+    ("Sialkot", 32.4945, 74.5229, "Asia/Karachi"),
+    ("Chittagong", 22.3569, 91.7832, "Asia/Dhaka"),
+    ("Thimphu", 27.4728, 89.6390, "Asia/Thimphu"),
+    ("Bangalore", 12.9716, 77.5946, "Asia/Kolkata"),
+    ("Phoenix", 33.4484, -112.0740, "America/Phoenix"),
+    ("Mexico City", 19.4326, -99.1332, "America/Mexico_City"),
+]
+
+
+def _without_finder(lookup: TimezoneLookup) -> TimezoneLookup:
+    lookup._finder_loaded = True
+    lookup._finder = None
+    return lookup
+
+
+@pytest.mark.parametrize("place, latitude, longitude, zone", PLACES)
+def test_bundled_grid_zone(place, latitude, longitude, zone):
+    lookup = TimezoneLookup(grid_path=BUNDLED_GRID_PATH)
+    assert lookup.timezone_at(latitude, longitude) == zone
+
+
+@pytest.mark.parametrize("place, latitude, longitude, zone", PLACES)
+def test_chart_timezone_is_never_a_wrong_guess(place, latitude, longitude, zone):
+    """Without timezonefinder, boundary cells are approximate and fall back to IST (None)."""
+    lookup = _without_finder(TimezoneLookup(grid_path=BUNDLED_GRID_PATH))
+    assert lookup.chart_timezone(latitude, longitude) in (zone, None)
+
+
+def test_chart_timezone_rejects_approximate_sources():
+    lookup = _without_finder(TimezoneLookup(grid_path=None))
+    assert lookup.lookup(33.4484, -112.0740)[1] not in ("grid", "timezonefinder")
+    assert lookup.chart_timezone(33.4484, -112.0740) is None
+
+
+def test_historical_offsets():
+    assert utc_offset_hours("Asia/Kolkata", datetime(1943, 5, 1, 10)) == 6.5
+    assert utc_offset_hours("Europe/London", datetime(1990, 7, 1, 12)) == 1.0
+    with pytest.raises(ValueError):
+        utc_offset_hours("Mars/Olympus_Mons", datetime(1990, 1, 1))
+
+
+def test_chart_offset_defaults_to_fixed_ist():
+    assert _get_timezone_offset(datetime(1943, 5, 1, 10)) == 5.5
+    assert _get_timezone_offset(datetime(1943, 5, 1, 10), "Asia/Kolkata") == 6.5
+
+
+@pytest.mark.parametrize("timezone, label", [(None, "IST"), ("Asia/Karachi", "Asia/Karachi")])
+def test_report_prints_the_chart_timezone(timezone, label):
+    report = render_chart_markdown({"success": True, "timezone": timezone}, {"time_of_birth": "14:30"})
+    assert f"**Time of Birth**: 14:30 ({label})" in report
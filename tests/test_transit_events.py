@@ -0,0 +1,110 @@
+"""Tests for transit-to-natal event scanning over a synthetic ephemeris grid"""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from tools.transit_engine import EPHEMERIS_GRID_DTYPE, EphemerisGrid, _to_days
+from tools.transit_events import NatalPoints, _mask_intervals, scan_transit_events
+from tools.vedastro_tools import PLANET_NAMES
+
+START = datetime(2024, 1, 1)
+DAYS = 120
+JUPITER = PLANET_NAMES.index("Jupiter")
+
+
+def _grid() -> EphemerisGrid:
+    """Jupiter moves 2 degrees a day from 0; every other graha sits at 200 (Libra)."""
+    grid = np.zeros(DAYS + 1, dtype=EPHEMERIS_GRID_DTYPE)
+    grid["day"] = _to_days(START) + np.arange(DAYS + 1)
+    grid["longitudes"] = 200.0
+    grid["longitudes"][:, JUPITER] = 2.0 * np.arange(DAYS + 1)
+    return EphemerisGrid(grid)
+
+
+def _natal() -> NatalPoints:
+    # Lagna at 0 Aries, Sun at 10 Aries
+    return NatalPoints(
+        names=["Sun", "Lagna"], longitudes=np.array([10.0, 0.0]), signs=np.array([0, 0]), lagna_sign=0
+    )
+
+
+def _day(i: int) -> datetime:
+    return START + timedelta(days=i)
+
+
+def _scan(event_type: str, **kwargs):
+    kwargs.setdefault("planets", ["Jupiter"])
+    return scan_transit_events(
+        _natal(), START, _day(DAYS), event_types=(event_type,), orb=3.0, grid=_grid(), **kwargs
+    )
+
+
+def test_mask_intervals():
+    mask = np.array([
+        [1, 0, 0],
+        [1, 0, 1],
+        [0, 0, 1],
+        [1, 0, 0],
+    ], dtype=bool)
+    columns, starts, ends = _mask_intervals(mask)
+    assert sorted(zip(columns.tolist(), starts.tolist(), ends.tolist())) == [(0, 0, 2), (0, 3, 4), (2, 1, 3)]
+
+
+def test_mask_intervals_empty():
+    columns, starts, ends = _mask_intervals(np.zeros((5, 2), dtype=bool))
+    assert len(columns) == len(starts) == len(ends) == 0
+
+
+def test_conjunction_intervals_and_exact_date():
+    events = {event["natal_point"]: event for event in _scan("conjunction")}
+
+    # Jupiter within 3 degrees of the Sun at 10: 2d in [7, 13] -> days 4-6
+    sun = events["Sun"]
+    assert (sun["start"], sun["end"]) == (_day(4), _day(7))
+    assert (sun["exact"], sun["orb"]) == (_day(5), 0.0)
+    assert not sun["ongoing_at_start"] and not sun["ongoing_at_end"]
+
+    # Already conjunct the Lagna when the window opens
+    lagna = events["Lagna"]
+    assert (lagna["start"], lagna["end"]) == (_day(0), _day(2))
+    assert lagna["ongoing_at_start"]
+
+
+def test_aspects_follow_graha_drishti():
+    aspects = [(event["start"], event["end"], event["aspect"]) for event in _scan("aspect") if event["natal_point"] == "Sun"]
+    # Jupiter aspects Aries from Leo (9th), Libra (7th) and, on the last sample, Sagittarius (5th)
+    assert aspects == [
+        (_day(60), _day(75), "9th"), (_day(90), _day(105), "7th"), (_day(DAYS), _day(DAYS), "5th")
+    ]
+    assert _scan("aspect")[-1]["ongoing_at_end"]
+
+
+def test_aspect_ongoing_over_the_whole_window():
+    events = _scan("aspect", planets=["Saturn"])
+    assert {event["natal_point"] for event in events} == {"Sun", "Lagna"}
+    for event in events:
+        assert event["aspect"] == "7th"
+        assert event["ongoing_at_start"] and event["ongoing_at_end"]
+        assert (event["start"], event["end"]) == (_day(0), _day(DAYS))
+
+
+def test_house_ingresses():
+    ingresses = [(event["start"], event["house"], event["sign"]) for event in _scan("house_ingress")]
+    assert ingresses[:3] == [(_day(15), 2, "Taurus"), (_day(30), 3, "Gemini"), (_day(45), 4, "Cancer")]
+    # One sign every 15 days; the last sample (240 degrees) enters Sagittarius
+    assert ingresses[-1] == (_day(DAYS), 9, "Sagittarius")
+    assert len(ingresses) == 8
+
+
+def test_events_are_sorted_by_start():
+    events = scan_transit_events(_natal(), START, _day(DAYS), orb=3.0, grid=_grid(), planets=["Jupiter"])
+    assert [event["start"] for event in events] == sorted(event["start"] for event in events)
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        scan_transit_events(_natal(), _day(10), _day(5), grid=_grid())
+    with pytest.raises(ValueError):
+        scan_transit_events(_natal(), START, _day(DAYS + 30), grid=_grid())
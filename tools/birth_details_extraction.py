@@ -0,0 +1,223 @@
+"""Birth-detail extraction for the main node (function call, with a JSON-in-text fallback)"""
+
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+TOOL_NAME = "record_birth_details"
+
+# JSON schema keywords kept in the function declaration (title, default, minLength... are dropped)
+GEMINI_SCHEMA_KEYS = ("type", "description", "properties", "items", "required", "nullable", "enum", "format")
+
+# Outcomes that cost the user another turn although the model tried to give details
+FAILED_OUTCOMES = ("invalid", "unparsed", "incomplete")
+
+
+class BirthDetails(BaseModel):
+    """Validated, normalized birth details."""
+
+    name: str = Field(min_length=1, description="Full name")
+    date_of_birth: str = Field(description="Date of birth, YYYY-MM-DD")
+    time_of_birth: str = Field(description="Time of birth in IST, 24-hour HH:MM")
+    place_of_birth: str = Field(min_length=1, description="Place of birth: city, state, country")
+    goals: List[str] = Field(
+        default_factory=list,
+        description="Life areas to analyze (e.g. career, marriage, health); empty if none given"
+    )
+    latitude: Optional[float] = Field(default=None, description="Latitude, only if the user gave coordinates")
+    longitude: Optional[float] = Field(default=None, description="Longitude, only if the user gave coordinates")
+
+    @field_validator("name", "place_of_birth", mode="before")
+    @classmethod
+    def _strip(cls, value: Any) -> Any:
+        return value.strip() if isinstance(value, str) else value
+
+    @field_validator("date_of_birth")
+    @classmethod
+    def _date(cls, value: str) -> str:
+        return datetime.strptime(value.strip(), "%Y-%m-%d").strftime("%Y-%m-%d")
+
+    @field_validator("time_of_birth")
+    @classmethod
+    def _time(cls, value: str) -> str:
+        value = value.strip()
+        try:
+            return datetime.strptime(value, "%H:%M").strftime("%H:%M")
+        except ValueError:
+            return datetime.strptime(value, "%H:%M:%S").strftime("%H:%M:%S")
+
+    @field_validator("goals", mode="before")
+    @classmethod
+    def _goals(cls, value: Any) -> Any:
+        if value is None:
+            return []
+        if isinstance(value, str):
+            return [goal.strip() for goal in value.split(",") if goal.strip()]
+        return value
+
+
+def _gemini_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON schema reduced to what Gemini function declarations accept (Optional -> nullable)."""
+    schema = dict(schema)
+    any_of = schema.pop("anyOf", None)
+    if any_of:
+        types = [option for option in any_of if option.get("type") != "null"]
+        schema.update(types[0])
+        if len(types) < len(any_of):
+            schema["nullable"] = True
+    schema = {key: value for key, value in schema.items() if key in GEMINI_SCHEMA_KEYS}
+    if "properties" in schema:
+        schema["properties"] = {name: _gemini_schema(value) for name, value in schema["properties"].items()}
+    if "items" in schema:
+        schema["items"] = _gemini_schema(schema["items"])
+    return schema
+
+
+def birth_details_tool() -> Dict[str, Any]:
+    """Function declaration for the main node's model (see llm_registry.get(tools=...))."""
+    return {
+        "name": TOOL_NAME,
+        "description": (
+            "Record the user's birth details once ALL required information is collected and validated. "
+            "Do not call this while anything is missing or unclear."
+        ),
+        "parameters": _gemini_schema(BirthDetails.model_json_schema()),
+    }
+
+
+def iter_json_objects(text: str) -> Iterator[str]:
+    """Top-level {...} spans of text, in a single pass.
+
+    Quotes only open strings inside an object, so apostrophes in prose are
+    harmless. A backslash escapes the next character anywhere, which keeps
+    escaped JSON ({\\"key\\": ...}) balanced.
+    """
+    depth = 0
+    start = 0
+    in_string = False
+    escaped = False
+    for i, char in enumerate(text):
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif in_string:
+            if char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = depth > 0
+        elif char == "{":
+            if depth == 0:
+                start = i
+            depth += 1
+        elif char == "}" and depth:
+            depth -= 1
+            if depth == 0:
+                yield text[start:i + 1]
+
+
+def _decode(span: str) -> Any:
+    try:
+        return json.loads(span)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(span.replace('\\"', '"').replace("\\n", "\n").replace("\\t", "\t"))
+    except json.JSONDecodeError:
+        return None
+
+
+def find_birth_details(text: str) -> Optional[Dict[str, Any]]:
+    """Raw birth details written as JSON in free text ({"birth_details": {...}} or the bare object)."""
+    for span in iter_json_objects(text):
+        parsed = _decode(span)
+        if not isinstance(parsed, dict):
+            continue
+        details = parsed.get("birth_details", parsed)
+        if isinstance(details, dict) and "date_of_birth" in details:
+            return details
+    return None
+
+
+def _validate(raw: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    try:
+        return BirthDetails.model_validate(raw).model_dump()
+    except ValidationError as e:
+        logger.warning(f"Birth details failed validation: {e.error_count()} error(s): {e.errors()[0]['msg']}")
+        return None
+
+
+def message_text(message: Any) -> str:
+    """Text of a model response (Gemini may return a list of parts next to a function call)."""
+    content = message.content
+    if isinstance(content, str):
+        return content
+    return "".join(
+        part if isinstance(part, str) else part.get("text", "") for part in content if isinstance(part, (str, dict))
+    )
+
+
+def extract_birth_details(response: Any) -> Tuple[Optional[Dict[str, Any]], str]:
+    """Birth details from a model response, and how they were found.
+
+    Args:
+        response: AIMessage from the tool-bound (or plain) main node model
+
+    Returns:
+        (details or None, outcome), outcome being one of:
+        "structured" (function call), "parsed" (JSON in the text), "invalid"
+        (found but failed validation), "unparsed" (birth_details mentioned but
+        not decodable), "none" (an ordinary conversational turn). The main
+        node records "incomplete" itself when a required value is empty.
+    """
+    for call in getattr(response, "tool_calls", None) or []:
+        if call.get("name") == TOOL_NAME:
+            details = _validate(call.get("args") or {})
+            return details, "structured" if details else "invalid"
+
+    text = message_text(response)
+    raw = find_birth_details(text)
+    if raw is not None:
+        details = _validate(raw)
+        return details, "parsed" if details else "invalid"
+    if "birth_details" in text:
+        return None, "unparsed"
+    return None, "none"
+
+
+class ExtractionStats:
+    """Counts of main node extraction outcomes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.outcomes = {"structured": 0, "parsed": 0, "invalid": 0, "unparsed": 0, "none": 0, "incomplete": 0}
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self.outcomes[outcome] += 1
+
+    @property
+    def failure_rate(self) -> float:
+        """Share of extraction attempts (details offered) that did not yield usable details."""
+        failed = sum(self.outcomes[outcome] for outcome in FAILED_OUTCOMES)
+        attempts = failed + self.outcomes["structured"] + self.outcomes["parsed"]
+        return failed / attempts if attempts else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            extracted = self.outcomes["structured"] + self.outcomes["parsed"]
+            return {
+                "outcomes": dict(self.outcomes),
+                "failure_rate": round(self.failure_rate, 4),
+                "text_fallback_rate": round(self.outcomes["parsed"] / extracted, 4) if extracted else 0.0,
+            }
+
+
+# Global extraction counters
+birth_details_stats = ExtractionStats()
@@ -0,0 +1,199 @@
+"""Batch birth-chart computation for partners and reprocessing jobs"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple
+
+from config import AstroConfig
+from tools.chart_cache import chart_cache, make_chart_key
+from tools.chart_engine import batch_chart_engine
+from tools.vedastro_tools import DEFAULT_DIVISIONAL_CHARTS, get_comprehensive_chart
+
+logger = logging.getLogger(__name__)
+
+BATCH_REQUIRED_FIELDS = ("date_of_birth", "time_of_birth", "latitude", "longitude")
+
+
+def batch_concurrency() -> int:
+    """Batch charts in flight across all batches (default: one per batch worker)."""
+    configured = AstroConfig.ChartEngineConfig.CHART_BATCH_CONCURRENCY
+    return configured if configured > 0 else max(1, batch_chart_engine.max_workers)
+
+
+_slots: Optional[asyncio.Semaphore] = None
+_slots_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _batch_slots() -> asyncio.Semaphore:
+    """Process-wide semaphore shared by every batch (rebuilt for a new event loop)."""
+    global _slots, _slots_loop
+    loop = asyncio.get_running_loop()
+    if _slots is None or _slots_loop is not loop:
+        _slots = asyncio.Semaphore(batch_concurrency())
+        _slots_loop = loop
+    return _slots
+
+
+class BatchRateLimiter:
+    """Sliding-window limit on batch requests per caller."""
+
+    def __init__(self, max_requests: int, window_seconds: float):
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self._lock = threading.Lock()
+        self._requests: Dict[Any, Deque[float]] = {}
+
+    def acquire(self, caller: Any, max_requests: Optional[int] = None) -> float:
+        """Record a request; returns 0 if allowed, else the seconds until the caller may retry.
+
+        max_requests overrides the default limit for this caller (e.g. a partner's quota).
+        """
+        if max_requests is None:
+            max_requests = self.max_requests
+        if max_requests <= 0:
+            return 0.0
+        now = time.monotonic()
+        with self._lock:
+            requests = self._requests.setdefault(caller, deque())
+            while requests and now - requests[0] >= self.window_seconds:
+                requests.popleft()
+            if len(requests) >= max_requests:
+                return self.window_seconds - (now - requests[0])
+            requests.append(now)
+            return 0.0
+
+
+def _batch_item(index: int, record: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    item = {"index": index, "id": record.get("id"), "success": bool(result.get("success"))}
+    if item["success"]:
+        item["chart"] = result
+    else:
+        item["error"] = result.get("error", "Unknown error")
+    return item
+
+
+def _group_records(
+    records: Sequence[Dict[str, Any]],
+    years_ahead: int,
+    divisional_charts: List[str]
+) -> Tuple[Dict[str, List[int]], List[Dict[str, Any]]]:
+    """Group record indices by chart key; invalid records become error items."""
+    groups: Dict[str, List[int]] = {}
+    errors = []
+    for index, record in enumerate(records):
+        missing = [field for field in BATCH_REQUIRED_FIELDS if record.get(field) in (None, "")]
+        if missing:
+            errors.append(_batch_item(index, record, {"success": False, "error": f"Missing fields: {', '.join(missing)}"}))
+            continue
+        try:
+            key = make_chart_key(
+                record["date_of_birth"], record["time_of_birth"],
+                record["latitude"], record["longitude"], divisional_charts, years_ahead
+            )
+        except (TypeError, ValueError):
+            errors.append(_batch_item(index, record, {"success": False, "error": "Invalid latitude or longitude"}))
+            continue
+        groups.setdefault(key, []).append(index)
+    return groups, errors
+
+
+async def iter_comprehensive_charts(
+    records: Sequence[Dict[str, Any]],
+    years_ahead: int = 10,
+    divisional_charts: Optional[List[str]] = None,
+    concurrency: Optional[int] = None
+) -> AsyncIterator[Dict[str, Any]]:
+    """Compute comprehensive charts for many birth records, yielding items as they complete.
+
+    Records with the same chart cache key are computed once. Cached charts
+    skip jyotishganit; the rest fan out over batch_chart_engine, a pool
+    separate from the one paid orders use, within a budget shared by all
+    batches (batch_concurrency()).
+
+    Args:
+        records: Dicts with date_of_birth, time_of_birth (IST), latitude,
+                 longitude and optionally location_name and a caller id
+        years_ahead: Number of years for Dasha calculations (default: 10)
+        divisional_charts: Divisional charts to include (default: none)
+        concurrency: Charts of this batch in flight at once (at most batch_concurrency(),
+                     which all batches share)
+
+    Yields:
+        One item per record, in completion order:
+        {"index": 3, "id": "abc", "success": True, "chart": {...}} or
+        {"index": 4, "id": "def", "success": False, "error": "..."}
+    """
+    if divisional_charts is None:
+        divisional_charts = DEFAULT_DIVISIONAL_CHARTS
+
+    groups, errors = _group_records(records, years_ahead, divisional_charts)
+    for item in errors:
+        yield item
+    if not groups:
+        return
+
+    budget = batch_concurrency()
+    semaphore = asyncio.Semaphore(min(concurrency or budget, budget))
+    slots = _batch_slots()
+
+    async def compute(indices: List[int]) -> Tuple[List[int], Dict[str, Any]]:
+        record = records[indices[0]]
+        async with semaphore, slots:
+            try:
+                result = await get_comprehensive_chart(
+                    date_of_birth=record["date_of_birth"],
+                    time_of_birth=record["time_of_birth"],
+                    latitude=float(record["latitude"]),
+                    longitude=float(record["longitude"]),
+                    location_name=record.get("location_name") or "",
+                    years_ahead=years_ahead,
+                    divisional_charts=divisional_charts,
+                    engine=batch_chart_engine
+                )
+            except Exception as e:
+                logger.error(f"Batch chart {indices[0]} failed: {e}", exc_info=True)
+                result = {"success": False, "error": str(e)}
+        return indices, result
+
+    logger.info(f"Batch chart request: {len(records)} record(s), {len(groups)} unique chart(s)")
+    tasks = [asyncio.create_task(compute(indices)) for indices in groups.values()]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            indices, result = await next_done
+            for index in indices:
+                record = records[index]
+                if result.get("success") and index != indices[0]:
+                    # Duplicate birth data in the same batch: same chart, this record's descriptive fields
+                    item_result = chart_cache.with_request_fields(
+                        result, f"{record['date_of_birth']} {record['time_of_birth']}", record.get("location_name") or ""
+                    )
+                else:
+                    item_result = result
+                yield _batch_item(index, record, item_result)
+    finally:
+        # Client went away or the caller stopped iterating - drop queued charts
+        for task in tasks:
+            task.cancel()
+
+
+async def get_comprehensive_charts(
+    records: Sequence[Dict[str, Any]],
+    years_ahead: int = 10,
+    divisional_charts: Optional[List[str]] = None,
+    concurrency: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Like iter_comprehensive_charts, but collect all items in input order."""
+    items: List[Optional[Dict[str, Any]]] = [None] * len(records)
+    async for item in iter_comprehensive_charts(records, years_ahead, divisional_charts, concurrency):
+        items[item["index"]] = item
+    return items
+
+
+# Global per-caller batch request limiter
+batch_rate_limiter = BatchRateLimiter(
+    max_requests=AstroConfig.ChartEngineConfig.CHART_BATCH_REQUESTS_PER_HOUR,
+    window_seconds=3600.0,
+)
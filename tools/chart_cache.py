@@ -0,0 +1,226 @@
+"""Content-addressed cache for comprehensive birth charts"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional
+
+from config import AstroConfig
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# jyotishganit always computes with this ayanamsa
+CHART_AYANAMSA = "True Chitra Paksha"
+
+# Bump when the comprehensive chart payload changes shape so stale entries are ignored
+CHART_CACHE_VERSION = 4
+
+# Result sections computed relative to "now" - dropped before storing
+TIME_DEPENDENT_FIELDS = ("dasha",)
+
+
+def _normalize_birth_moment(date_of_birth: str, time_of_birth: str) -> str:
+    """Normalize date/time strings so "09:05" and "09:05:00" share a key."""
+    from tools.vedastro_tools import _parse_datetime
+    try:
+        return _parse_datetime(date_of_birth.strip(), time_of_birth.strip()).isoformat()
+    except (ValueError, AttributeError):
+        return f"{date_of_birth} {time_of_birth}"
+
+
+def make_chart_key(
+    date_of_birth: str,
+    time_of_birth: str,
+    latitude: float,
+    longitude: float,
+    divisional_charts: Optional[List[str]] = None,
+    years_ahead: int = 10,
+    precision: Optional[int] = None,
+    timezone: Optional[str] = None
+) -> str:
+    """Build the content hash for a chart request.
+
+    Args:
+        date_of_birth: Date in YYYY-MM-DD format
+        time_of_birth: Time in HH:MM format (IST)
+        latitude: Birth location latitude
+        longitude: Birth location longitude
+        divisional_charts: Requested vargas (order and case are ignored)
+        years_ahead: Dasha horizon of the request
+        precision: Decimal places kept for coordinates (default from config)
+        timezone: IANA timezone the birth time is read in (None = fixed IST)
+
+    Returns:
+        Hex sha256 digest
+    """
+    if precision is None:
+        precision = AstroConfig.ChartCacheConfig.CHART_CACHE_COORD_PRECISION
+    vargas = sorted({v.lower() for v in divisional_charts}) if divisional_charts is not None else None
+    payload = {
+        "v": CHART_CACHE_VERSION,
+        "birth": _normalize_birth_moment(date_of_birth, time_of_birth),
+        # round() then format so -0.0 and 0.0 (and 12.97 vs 12.970001) hash the same
+        "lat": f"{round(float(latitude), precision) + 0.0:.{precision}f}",
+        "lon": f"{round(float(longitude), precision) + 0.0:.{precision}f}",
+        "ayanamsa": CHART_AYANAMSA,
+        "vargas": vargas,
+        "years_ahead": years_ahead,
+        "tz": timezone,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class _DiskStore:
+    """SQLite-backed persistent tier (blocking - call through asyncio.to_thread)."""
+
+    def __init__(self, path: str, max_entries: int, table: str = "chart_cache"):
+        self.path = path
+        self.max_entries = max_entries
+        self.table = table
+        self.evictions = 0
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._initialized:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        if not self._initialized:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table} ("
+                "key TEXT PRIMARY KEY, payload BLOB NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._initialized = True
+        return conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(f"SELECT payload FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            conn.execute(f"UPDATE {self.table} SET accessed_at = ? WHERE key = ?", (time.time(), key))
+            conn.commit()
+            return pickle.loads(row[0])
+        finally:
+            conn.close()
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, payload, accessed_at) VALUES (?, ?, ?)",
+                (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time())
+            )
+            count = conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            if count > self.max_entries:
+                excess = count - self.max_entries
+                conn.execute(
+                    f"DELETE FROM {self.table} WHERE key IN "
+                    f"(SELECT key FROM {self.table} ORDER BY accessed_at ASC LIMIT ?)",
+                    (excess,)
+                )
+                self.evictions += excess
+            conn.commit()
+        finally:
+            conn.close()
+
+
+class ChartCache:
+    """Two-tier (memory LRU + SQLite) cache for comprehensive chart results.
+
+    Keys hash the normalized birth moment, coordinates, ayanamsa and vargas
+    (make_chart_key). The SQLite store under CACHE_DIR survives restarts.
+    Date-dependent sections (the running dasha) are not stored; callers
+    recompute them on a hit.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self._memory = LRUCache(max_entries)
+        self._disk = _DiskStore(disk_path, disk_max_entries) if disk_path else None
+        self.disk_hits = 0
+        self.disk_misses = 0
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a chart by key, promoting disk hits into memory."""
+        if not self.enabled:
+            return None
+
+        value = self._memory.get(key)
+        if value is not None or self._disk is None:
+            return value
+
+        try:
+            value = await asyncio.to_thread(self._disk.get, key)
+        except Exception as e:
+            logger.warning(f"Chart cache disk lookup failed: {e}")
+            return None
+
+        if value is None:
+            self.disk_misses += 1
+            return None
+        self.disk_hits += 1
+        self._memory.set(key, value)
+        return value
+
+    async def set(self, key: str, value: Dict[str, Any]) -> None:
+        """Store a successful chart result in both tiers (without TIME_DEPENDENT_FIELDS)."""
+        if not self.enabled:
+            return
+
+        value = {field: data for field, data in value.items() if field not in TIME_DEPENDENT_FIELDS}
+        self._memory.set(key, value)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, value)
+            except Exception as e:
+                logger.warning(f"Chart cache disk write failed: {e}")
+
+    @staticmethod
+    def with_request_fields(value: Dict[str, Any], birth_time: str, location: str) -> Dict[str, Any]:
+        """Return a shallow copy of a cached chart with this request's descriptive fields."""
+        result = dict(value)
+        result["birth_time"] = birth_time
+        result["location"] = location
+        return result
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left intact)."""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters for both tiers."""
+        stats = {"enabled": self.enabled, "memory": self._memory.stats()}
+        if self._disk is not None:
+            stats["disk"] = {
+                "path": self._disk.path,
+                "hits": self.disk_hits,
+                "misses": self.disk_misses,
+                "evictions": self._disk.evictions,
+            }
+        return stats
+
+
+# Global chart cache instance
+chart_cache = ChartCache(
+    max_entries=AstroConfig.ChartCacheConfig.CHART_CACHE_MAX_ENTRIES,
+    disk_path=(
+        os.path.join(AstroConfig.AppSettings.CACHE_DIR, "chart_cache.sqlite3")
+        if AstroConfig.ChartCacheConfig.CHART_CACHE_DISK_ENABLED else None
+    ),
+    disk_max_entries=AstroConfig.ChartCacheConfig.CHART_CACHE_DISK_MAX_ENTRIES,
+    enabled=AstroConfig.ChartCacheConfig.CHART_CACHE_ENABLED,
+)
@@ -0,0 +1,121 @@
+"""Process pool engine for jyotishganit chart calculations"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from config import AstroConfig
+
+logger = logging.getLogger(__name__)
+
+# Birth data used to warm up worker processes (value of the chart is irrelevant)
+_WARMUP_BIRTH_DATA = ("2000-01-01", "12:00", 12.9716, 77.5946, "Bangalore, India")
+
+
+def _warm_worker() -> None:
+    """Worker initializer: load ephemeris data before the first real request."""
+    start = time.perf_counter()
+    try:
+        from tools.vedastro_tools import _calculate_chart
+        _calculate_chart(*_WARMUP_BIRTH_DATA)
+        logger.info(f"Chart worker warmed up in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        # A failed warm-up is not fatal - the first real request loads the data instead
+        logger.warning(f"Chart worker warm-up failed: {e}")
+
+
+def _ping() -> bool:
+    """No-op task used to force worker processes to start."""
+    return True
+
+
+class ChartEngine:
+    """Runs chart calculations off the event loop in a pool of worker processes.
+
+    jyotishganit holds the GIL for the whole calculation, so running it inline
+    would freeze the FastAPI event loop. Workers are pre-warmed with a
+    throwaway chart (ephemeris, timescale, Spica catalogue), and callers submit
+    module-level functions that return plain picklable data, never
+    jyotishganit objects.
+    """
+
+    def __init__(self, max_workers: int, warm_up: bool = True):
+        """
+        Args:
+            max_workers: Number of worker processes. 0 runs calculations in a
+                         thread instead (no process isolation, but still off the event loop)
+            warm_up: Whether workers load ephemeris data on startup
+        """
+        self.max_workers = max(0, max_workers)
+        self.warm_up = warm_up
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def started(self) -> bool:
+        return self._executor is not None
+
+    def start(self) -> None:
+        """Create the worker pool and start all workers."""
+        if self._executor is not None or self.max_workers == 0:
+            return
+
+        # spawn: workers must not inherit the parent's event loop, DB pool or sockets
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_warm_worker if self.warm_up else None,
+        )
+        # ProcessPoolExecutor starts workers lazily; submit one task per worker
+        # so all of them are spawned (and warmed) now rather than on the first order
+        for _ in range(self.max_workers):
+            self._executor.submit(_ping)
+        logger.info(f"Chart engine started with {self.max_workers} worker process(es)")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker pool."""
+        if self._executor is None:
+            return
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self._executor = None
+        logger.info("Chart engine stopped")
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run func(*args, **kwargs) in a worker and await its result.
+
+        func must be a module-level function and its arguments and return
+        value must be picklable.
+        """
+        call = functools.partial(func, *args, **kwargs)
+
+        if self.max_workers == 0:
+            return await asyncio.to_thread(call)
+
+        if self._executor is None:
+            self.start()
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._executor, call)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM kill). Drop the pool so the next call gets a fresh one.
+            logger.error("Chart engine worker pool is broken, restarting it")
+            self.shutdown(wait=False)
+            raise
+
+
+# Global chart engine instance
+chart_engine = ChartEngine(
+    max_workers=AstroConfig.ChartEngineConfig.CHART_WORKERS,
+    warm_up=AstroConfig.ChartEngineConfig.CHART_WORKER_WARMUP,
+)
+
+# Batch chart API pool (started on the first batch)
+batch_chart_engine = ChartEngine(
+    max_workers=AstroConfig.ChartEngineConfig.CHART_BATCH_WORKERS,
+    warm_up=AstroConfig.ChartEngineConfig.CHART_WORKER_WARMUP,
+)
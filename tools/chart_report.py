@@ -0,0 +1,228 @@
+"""Deterministic markdown renderer for the birth chart report.
+
+Produces the "Birth Chart Analysis" markdown (personal information, Lagna,
+Rashi, planets, whole-sign houses, chart summary) straight from the chart
+data, replacing an LLM call that only reformatted JSON. Section templates are
+compiled once at import; rendering a chart takes well under a millisecond.
+"""
+
+from string import Template
+from typing import Any, Dict, List, Mapping, Optional
+
+from tools.vedastro_tools import NAKSHATRAS, PLANET_NAMES, SIGN_LORDS, ZODIAC_SIGNS
+
+try:
+    # Planet nakshatras come from jyotishganit, so name the Lagna nakshatra the same way
+    from jyotishganit.core.constants import NAKSHATRAS as _NAKSHATRA_NAMES
+except ImportError:
+    _NAKSHATRA_NAMES = NAKSHATRAS
+
+NAKSHATRA_SPAN = 360.0 / 27
+PADA_SPAN = NAKSHATRA_SPAN / 4
+
+KENDRA_HOUSES = (1, 4, 7, 10)
+
+_DIGNITY_GROUPS = (
+    ("Exalted", ("deep_exaltation", "exalted")),
+    ("Debilitated", ("deep_debilitation", "debilitated")),
+    ("Own sign / Moolatrikona", ("own_sign", "moolatrikona")),
+)
+
+_HEADER = Template("""# Birth Chart Analysis
+
+## Personal Information
+- **Name**: $name
+- **Date of Birth**: $date_of_birth
+- **Time of Birth**: $time_of_birth ($timezone)
+- **Place of Birth**: $place_of_birth
+
+## Lagna (Ascendant)
+- **Sign**: $lagna_sign
+- **Degree**: $lagna_degree
+- **Lord**: $lagna_lord
+- **Nakshatra**: $lagna_nakshatra
+
+## Rashi (Moon Sign)
+- **Sign**: $rashi_sign
+- **Nakshatra**: $rashi_nakshatra
+
+## Planetary Positions
+""")
+
+_PLANET = Template("""
+### $planet
+- **Sign**: $sign
+- **House**: $house
+- **Degree**: $degree
+- **Nakshatra**: $nakshatra
+""")
+
+_HOUSES_HEADER = "\n## House Positions\n"
+
+_HOUSE = Template("""
+### $title
+- **Sign**: $sign
+- **Lord**: $lord
+- **Occupants**: $occupants
+""")
+
+_SUMMARY_HEADER = "\n## Chart Summary\n"
+
+NOT_AVAILABLE = "N/A"
+
+
+def format_dms(degrees: Optional[float]) -> str:
+    """Decimal degrees as zero-padded degrees/minutes/seconds (4.555833 -> 04° 33′ 21″)."""
+    if degrees is None:
+        return NOT_AVAILABLE
+    total_seconds = int(round(float(degrees) * 3600))
+    d, remainder = divmod(total_seconds, 3600)
+    m, s = divmod(remainder, 60)
+    return f"{d:02d}° {m:02d}′ {s:02d}″"
+
+
+def _nakshatra_text(nakshatra: Optional[str], pada: Optional[int]) -> str:
+    if not nakshatra:
+        return NOT_AVAILABLE
+    return f"{nakshatra} {pada}" if pada else nakshatra
+
+
+def _lagna_nakshatra(lagna: Mapping[str, Any]) -> str:
+    """Lagna nakshatra and pada from its sidereal longitude."""
+    sign, degrees = lagna.get("sign"), lagna.get("sign_degrees")
+    if sign not in ZODIAC_SIGNS or degrees is None:
+        return NOT_AVAILABLE
+    longitude = ZODIAC_SIGNS.index(sign) * 30.0 + float(degrees)
+    index = min(int(longitude // NAKSHATRA_SPAN), 26)
+    pada = min(int((longitude - index * NAKSHATRA_SPAN) // PADA_SPAN) + 1, 4)
+    return f"{_NAKSHATRA_NAMES[index]} {pada}"
+
+
+def _whole_sign_houses(chart_data: Mapping[str, Any]) -> List[Dict[str, Any]]:
+    """Houses from the chart data, or built from the Lagna sign (whole-sign) if missing."""
+    houses = chart_data.get("house_positions") or []
+    if len(houses) == 12:
+        return houses
+
+    lagna_sign = (chart_data.get("lagna") or {}).get("sign")
+    if lagna_sign not in ZODIAC_SIGNS:
+        return []
+    positions = chart_data.get("planetary_positions") or {}
+    first = ZODIAC_SIGNS.index(lagna_sign)
+    return [
+        {
+            "house": i + 1,
+            "sign": ZODIAC_SIGNS[(first + i) % 12],
+            "occupants": [name for name in PLANET_NAMES if (positions.get(name) or {}).get("house") == i + 1],
+        }
+        for i in range(12)
+    ]
+
+
+def chart_highlights(chart_data: Mapping[str, Any], houses: Optional[List[Dict[str, Any]]] = None) -> List[str]:
+    """Key chart facts as markdown bullet lines (for the Chart Summary section)."""
+    lagna = chart_data.get("lagna") or {}
+    positions = chart_data.get("planetary_positions") or {}
+    shadbala = chart_data.get("shadbala") or {}
+    houses = houses if houses is not None else _whole_sign_houses(chart_data)
+    lines = []
+
+    lord = lagna.get("lord") or SIGN_LORDS.get(lagna.get("sign"))
+    lord_position = positions.get(lord) or {}
+    if lagna.get("sign"):
+        placement = f"; its lord {lord} is in house {lord_position['house']} ({lord_position.get('sign')})" if lord_position.get("house") else ""
+        lines.append(f"- **Ascendant**: {lagna['sign']} rising{placement}")
+
+    moon = positions.get("Moon") or {}
+    if moon.get("sign"):
+        lines.append(f"- **Moon**: {moon['sign']}, {_nakshatra_text(moon.get('nakshatra'), moon.get('pada'))}")
+
+    for label, dignities in _DIGNITY_GROUPS:
+        planets = [
+            name for name in PLANET_NAMES
+            if ((positions.get(name) or {}).get("dignities") or {}).get("dignity") in dignities
+        ]
+        if planets:
+            lines.append(f"- **{label}**: {', '.join(planets)}")
+
+    kendra = [name for name in PLANET_NAMES if (positions.get(name) or {}).get("house") in KENDRA_HOUSES]
+    lines.append(f"- **Planets in Kendras (1, 4, 7, 10)**: {', '.join(kendra) if kendra else 'None'}")
+
+    for house in houses:
+        if len(house.get("occupants") or []) >= 3:
+            lines.append(f"- **Stellium**: {', '.join(house['occupants'])} in house {house['house']} ({house['sign']})")
+
+    strengths = {
+        name: values["rupas"] for name, values in shadbala.items()
+        if isinstance(values, Mapping) and values.get("rupas")
+    }
+    if strengths:
+        strongest = max(strengths, key=strengths.get)
+        weakest = min(strengths, key=strengths.get)
+        lines.append(
+            f"- **Shadbala**: strongest {strongest} ({strengths[strongest]:.2f} rupas), "
+            f"weakest {weakest} ({strengths[weakest]:.2f} rupas)"
+        )
+    return lines
+
+
+def render_chart_markdown(
+    chart_data: Mapping[str, Any],
+    birth_details: Optional[Mapping[str, Any]] = None,
+    interpretation: Optional[str] = None
+) -> str:
+    """Render the Birth Chart Analysis markdown.
+
+    Args:
+        chart_data: Comprehensive chart result (dict or ChartSnapshot)
+        birth_details: Name, date/time/place of birth for Personal Information
+        interpretation: Optional prose appended to the Chart Summary section
+
+    Returns:
+        Markdown report
+    """
+    birth_details = birth_details or {}
+    lagna = chart_data.get("lagna") or {}
+    rashi = chart_data.get("rashi") or {}
+    positions = chart_data.get("planetary_positions") or {}
+    houses = _whole_sign_houses(chart_data)
+
+    parts = [_HEADER.substitute(
+        name=birth_details.get("name") or NOT_AVAILABLE,
+        date_of_birth=birth_details.get("date_of_birth") or NOT_AVAILABLE,
+        time_of_birth=birth_details.get("time_of_birth") or NOT_AVAILABLE,
+        timezone=chart_data.get("timezone") or "IST",
+        place_of_birth=birth_details.get("place_of_birth") or chart_data.get("location") or NOT_AVAILABLE,
+        lagna_sign=lagna.get("sign") or NOT_AVAILABLE,
+        lagna_degree=format_dms(lagna.get("sign_degrees")),
+        lagna_lord=lagna.get("lord") or SIGN_LORDS.get(lagna.get("sign")) or NOT_AVAILABLE,
+        lagna_nakshatra=_lagna_nakshatra(lagna),
+        rashi_sign=rashi.get("sign") or NOT_AVAILABLE,
+        rashi_nakshatra=_nakshatra_text(rashi.get("nakshatra"), rashi.get("pada")),
+    )]
+
+    for name in PLANET_NAMES:
+        planet = positions.get(name) or {}
+        parts.append(_PLANET.substitute(
+            planet=name,
+            sign=planet.get("sign") or NOT_AVAILABLE,
+            house=planet.get("house") or NOT_AVAILABLE,
+            degree=format_dms(planet.get("sign_degrees")),
+            nakshatra=_nakshatra_text(planet.get("nakshatra"), planet.get("pada")),
+        ))
+
+    parts.append(_HOUSES_HEADER)
+    for house in houses:
+        number = house["house"]
+        parts.append(_HOUSE.substitute(
+            title=f"House {number} (Lagna)" if number == 1 else f"House {number}",
+            sign=house.get("sign") or NOT_AVAILABLE,
+            lord=SIGN_LORDS.get(house.get("sign")) or NOT_AVAILABLE,
+            occupants=", ".join(house.get("occupants") or []) or "None",
+        ))
+
+    parts.append(_SUMMARY_HEADER)
+    parts.append("\n".join(chart_highlights(chart_data, houses)) + "\n")
+    if interpretation:
+        parts.append(f"\n{interpretation.strip()}\n")
+    return "".join(parts)
@@ -0,0 +1,428 @@
+"""Compact, array-backed representation of a comprehensive chart result"""
+
+import base64
+import json
+import logging
+import struct
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from tools.vedastro_tools import PANCHANGA_FIELDS, PLANET_NAMES, SHADBALA_FIELDS, SIGN_LORDS
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_MAGIC = b"AGCS"
+SNAPSHOT_VERSION = 1
+
+# magic, version, planet count, house count, dasha count, meta length
+_HEADER = struct.Struct("<4sBBBBI")
+
+# String table index meaning "None"
+_NO_STRING = -1
+# Dasha start/end meaning "None" (microseconds since the epoch otherwise)
+_NO_TIME = np.iinfo(np.int64).min
+_EPOCH = datetime(1970, 1, 1)
+
+# planets["flags"] bits
+_HAS_DIGNITIES = 1
+_HAS_SHADBALA = 2
+
+PLANET_DTYPE = np.dtype([
+    ("body", "<i2"),
+    ("sign", "<i2"),
+    ("sign_degrees", "<f8"),
+    ("longitude", "<f8"),
+    ("nakshatra", "<i2"),
+    ("pada", "<i2"),
+    ("house", "<i2"),
+    ("dignity", "<i2"),
+    ("tattva", "<i2"),
+    ("flags", "u1"),
+    ("shadbala_error", "<i2"),
+    ("shadbala", "<f8", (len(SHADBALA_FIELDS),)),
+])
+
+DASHA_DTYPE = np.dtype([
+    ("planet", "<i2"),
+    ("start", "<i8"),
+    ("end", "<i8"),
+    ("duration_years", "<f8"),
+])
+
+# Keys of a comprehensive chart result, in get_comprehensive_chart order
+CHART_KEYS = (
+    "success", "lagna", "dasha", "shadbala", "planetary_positions", "house_positions",
+    "divisional_charts", "panchanga", "rashi", "ayanamsa", "birth_time", "location",
+)
+
+
+class _StringTable:
+    """Builds the de-duplicated string table while packing."""
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return _NO_STRING
+        if not isinstance(value, str):
+            raise ValueError(f"Expected a string, got {type(value).__name__}")
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+
+def _int_or_none(value: Any) -> int:
+    if value is None:
+        return -1
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise ValueError(f"Expected a non-negative integer, got {value!r}")
+    return value
+
+
+def _float_or_nan(value: Any) -> float:
+    return np.nan if value is None else float(value)
+
+
+def _time_to_int(value: Any) -> int:
+    if value is None:
+        return _NO_TIME
+    if not isinstance(value, datetime) or value.tzinfo is not None:
+        raise ValueError(f"Expected a naive datetime, got {value!r}")
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+class ChartSnapshot(Mapping):
+    """Read-only, array-backed view of a comprehensive chart result.
+
+    The nested chart dict is kept as a few NumPy record arrays (planets, house
+    signs, mahadashas) plus a string table for every categorical value.
+    Divisional charts are stored as varga keys and rebuilt from D1 on access.
+    It is a Mapping with the chart dict's keys, so nodes keep using
+    chart_data.get("lagna"); to_bytes()/encode() give a versioned binary and
+    base64 form for JSON columns.
+    """
+
+    __slots__ = ("planets", "houses", "dashas", "strings", "_meta")
+
+    def __init__(self, planets: np.ndarray, houses: np.ndarray, dashas: np.ndarray,
+                 strings: List[str], meta: Dict[str, Any]):
+        self.planets = planets
+        self.houses = houses
+        self.dashas = dashas
+        self.strings = tuple(strings)
+        self._meta = meta
+
+    @classmethod
+    def from_chart_data(cls, chart_data: Dict[str, Any]) -> "ChartSnapshot":
+        """Pack a successful comprehensive chart result.
+
+        Raises:
+            ValueError: If the chart failed or has a shape the snapshot cannot
+                reproduce exactly (callers keep the plain dict in that case)
+        """
+        if isinstance(chart_data, ChartSnapshot):
+            return chart_data
+        if not chart_data or not chart_data.get("success"):
+            raise ValueError("Only successful chart results can be packed")
+
+        strings = _StringTable()
+        positions = chart_data.get("planetary_positions") or {}
+        shadbala = chart_data.get("shadbala") or {}
+        if list(positions) != PLANET_NAMES[:len(positions)]:
+            raise ValueError("Unexpected planet order in planetary_positions")
+
+        planets = np.zeros(len(positions), dtype=PLANET_DTYPE)
+        for i, name in enumerate(positions):
+            position = positions[name]
+            record = planets[i]
+            record["body"] = strings.add(position.get("celestial_body"))
+            record["sign"] = strings.add(position.get("sign"))
+            record["sign_degrees"] = _float_or_nan(position.get("sign_degrees"))
+            record["longitude"] = _float_or_nan(position.get("longitude"))
+            record["nakshatra"] = strings.add(position.get("nakshatra"))
+            record["pada"] = _int_or_none(position.get("pada"))
+            record["house"] = _int_or_none(position.get("house"))
+            flags = 0
+            if "dignities" in position:
+                flags |= _HAS_DIGNITIES
+                record["dignity"] = strings.add(position["dignities"].get("dignity"))
+                record["tattva"] = strings.add(position["dignities"].get("planet_tattva"))
+            else:
+                record["dignity"] = record["tattva"] = _NO_STRING
+            record["shadbala_error"] = _NO_STRING
+            if name in shadbala:
+                flags |= _HAS_SHADBALA
+                values = shadbala[name]
+                if "error" in values:
+                    record["shadbala_error"] = strings.add(values["error"])
+                else:
+                    record["shadbala"] = [float(values[key]) for key, _ in SHADBALA_FIELDS]
+            record["flags"] = flags
+
+        house_positions = chart_data.get("house_positions") or []
+        houses = np.array([strings.add(house.get("sign")) for house in house_positions], dtype="<i2")
+
+        dasha = chart_data.get("dasha") or {}
+        periods = ([dasha["current_dasha"]] if dasha.get("current_dasha") else []) + list(dasha.get("upcoming_dashas") or [])
+        dashas = np.zeros(len(periods), dtype=DASHA_DTYPE)
+        for i, period in enumerate(periods):
+            dashas[i] = (
+                strings.add(period.get("planet")),
+                _time_to_int(period.get("start")),
+                _time_to_int(period.get("end")),
+                _float_or_nan(period.get("duration_years")),
+            )
+
+        lagna = chart_data.get("lagna") or {}
+        panchanga = chart_data.get("panchanga") or {}
+        divisional = chart_data.get("divisional_charts") or {}
+        meta = {
+            "lagna": [strings.add(lagna.get("sign")), lagna.get("sign_degrees"), lagna.get("longitude")] if lagna else None,
+            "has_current_dasha": bool(dasha.get("current_dasha")),
+            "panchanga": [strings.add(panchanga.get(field)) for field in PANCHANGA_FIELDS] if panchanga else None,
+            # True: the Moon's sign/nakshatra/pada; otherwise stored as-is
+            "rashi": True,
+            "ayanamsa": chart_data.get("ayanamsa"),
+            "vargas": [key for key, value in divisional.items() if "error" not in value],
+            "varga_errors": {key: value["error"] for key, value in divisional.items() if "error" in value},
+            "birth_time": chart_data.get("birth_time"),
+            "location": chart_data.get("location"),
+            "extra": {key: value for key, value in chart_data.items() if key not in CHART_KEYS},
+        }
+
+        snapshot = cls(planets, houses, dashas, strings.strings, meta)
+        if snapshot["rashi"] != chart_data.get("rashi"):
+            meta["rashi"] = chart_data.get("rashi")
+        if snapshot.to_dict() != dict(chart_data):
+            raise ValueError("Chart data cannot be represented losslessly as a snapshot")
+        return snapshot
+
+    # Mapping interface: each section is rebuilt as a plain dict on access
+
+    def __getitem__(self, key: str) -> Any:
+        if key in CHART_KEYS:
+            return getattr(self, f"_{key}")()
+        return self._meta["extra"][key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CHART_KEYS
+        yield from self._meta["extra"]
+
+    def __len__(self) -> int:
+        return len(CHART_KEYS) + len(self._meta["extra"])
+
+    def __repr__(self) -> str:
+        return f"ChartSnapshot(lagna={self._lagna().get('sign')!r}, planets={len(self.planets)}, bytes={self.nbytes})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Full plain-dict chart result, identical to the one the snapshot was packed from."""
+        return {key: self[key] for key in self}
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the binary encoding."""
+        return len(self.to_bytes())
+
+    def _string(self, index: int) -> Optional[str]:
+        return None if index == _NO_STRING else self.strings[index]
+
+    @staticmethod
+    def _int(value: int) -> Optional[int]:
+        return None if value < 0 else int(value)
+
+    @staticmethod
+    def _float(value: float) -> Optional[float]:
+        return None if value != value else float(value)  # NaN
+
+    @staticmethod
+    def _time(value: int) -> Optional[datetime]:
+        return None if value == _NO_TIME else _EPOCH + timedelta(microseconds=value)
+
+    def _success(self) -> bool:
+        return True
+
+    def _lagna(self) -> Dict[str, Any]:
+        lagna = self._meta["lagna"]
+        if lagna is None:
+            return {}
+        sign = self._string(lagna[0])
+        return {"sign": sign, "sign_degrees": lagna[1], "longitude": lagna[2], "lord": SIGN_LORDS.get(sign), "house": 1}
+
+    def _dasha(self) -> Dict[str, Any]:
+        periods = [
+            {
+                "planet": self._string(record[0]),
+                "start": self._time(record[1]),
+                "end": self._time(record[2]),
+                "duration_years": self._float(record[3]),
+            }
+            for record in self.dashas.tolist()
+        ]
+        if self._meta["has_current_dasha"]:
+            return {"current_dasha": periods[0], "upcoming_dashas": periods[1:]}
+        return {"current_dasha": None, "upcoming_dashas": periods}
+
+    def _shadbala(self) -> Dict[str, Any]:
+        shadbala = {}
+        for name, record in zip(PLANET_NAMES, self.planets[["flags", "shadbala_error", "shadbala"]].tolist()):
+            flags, error, values = record
+            if not flags & _HAS_SHADBALA:
+                continue
+            if error != _NO_STRING:
+                shadbala[name] = {"error": self.strings[error]}
+            else:
+                shadbala[name] = {key: value for (key, _), value in zip(SHADBALA_FIELDS, values)}
+        return shadbala
+
+    def _planetary_positions(self) -> Dict[str, Any]:
+        string, as_int, as_float = self._string, self._int, self._float
+        positions = {}
+        for name, record in zip(PLANET_NAMES, self.planets.tolist()):
+            body, sign, sign_degrees, longitude, nakshatra, pada, house, dignity, tattva, flags = record[:10]
+            position = {
+                "celestial_body": string(body),
+                "sign": string(sign),
+                "sign_degrees": as_float(sign_degrees),
+                "nakshatra": string(nakshatra),
+                "pada": as_int(pada),
+                "house": as_int(house),
+                "longitude": as_float(longitude),
+            }
+            if flags & _HAS_DIGNITIES:
+                position["dignities"] = {"dignity": string(dignity), "planet_tattva": string(tattva)}
+            positions[name] = position
+        return positions
+
+    def _house_positions(self) -> List[Dict[str, Any]]:
+        houses = self.planets["house"].tolist()
+        return [
+            {
+                "house": i + 1,
+                "sign": self._string(sign),
+                "occupants": [name for name, house in zip(PLANET_NAMES, houses) if house == i + 1],
+            }
+            for i, sign in enumerate(self.houses.tolist())
+        ]
+
+    def _divisional_charts(self) -> Dict[str, Any]:
+        charts = {}
+        vargas = self._meta["vargas"]
+        if vargas:
+            # Deferred: divisional_charts reads D1 positions through this mapping
+            from tools.divisional_charts import DivisionalChartSet
+            charts.update(DivisionalChartSet.from_chart_data({
+                "lagna": self._lagna(),
+                "planetary_positions": self._planetary_positions(),
+            }).subset(vargas))
+        for key, error in self._meta["varga_errors"].items():
+            charts[key] = {"error": error}
+        return charts
+
+    def _panchanga(self) -> Dict[str, Any]:
+        panchanga = self._meta["panchanga"]
+        if panchanga is None:
+            return {}
+        return {field: self._string(index) for field, index in zip(PANCHANGA_FIELDS, panchanga)}
+
+    def _rashi(self) -> Dict[str, Any]:
+        rashi = self._meta["rashi"]
+        if rashi is not True:
+            return rashi
+        if len(self.planets) < 2:
+            return {}
+        moon = self.planets[1]
+        return {"sign": self._string(int(moon["sign"])), "nakshatra": self._string(int(moon["nakshatra"])), "pada": self._int(moon["pada"])}
+
+    def _ayanamsa(self) -> Optional[Dict[str, Any]]:
+        return self._meta["ayanamsa"]
+
+    def _birth_time(self) -> Optional[str]:
+        return self._meta["birth_time"]
+
+    def _location(self) -> Optional[str]:
+        return self._meta["location"]
+
+    # Binary encoding
+
+    def to_bytes(self) -> bytes:
+        """Versioned binary encoding: header, planet/house/dasha arrays, JSON metadata."""
+        meta = json.dumps({**self._meta, "strings": self.strings}, separators=(",", ":")).encode("utf-8")
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.planets), len(self.houses), len(self.dashas), len(meta))
+        return b"".join((header, self.planets.tobytes(), self.houses.tobytes(), self.dashas.tobytes(), meta))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ChartSnapshot":
+        """Decode to_bytes() output.
+
+        Raises:
+            ValueError: On a bad magic, an unknown version or truncated data
+        """
+        if len(data) < _HEADER.size:
+            raise ValueError("Chart snapshot data is truncated")
+        magic, version, n_planets, n_houses, n_dashas, meta_length = _HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("Not a chart snapshot")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported chart snapshot version {version}")
+
+        offset = _HEADER.size
+        arrays = []
+        for dtype, count in ((PLANET_DTYPE, n_planets), (np.dtype("<i2"), n_houses), (DASHA_DTYPE, n_dashas)):
+            size = dtype.itemsize * count
+            if offset + size > len(data):
+                raise ValueError("Chart snapshot data is truncated")
+            # Copy so the snapshot does not pin the (possibly larger) source buffer
+            arrays.append(np.frombuffer(data, dtype=dtype, count=count, offset=offset).copy())
+            offset += size
+        if offset + meta_length != len(data):
+            raise ValueError("Chart snapshot data is truncated")
+
+        meta = json.loads(data[offset:].decode("utf-8"))
+        strings = meta.pop("strings")
+        planets, houses, dashas = arrays
+        return cls(planets, houses, dashas, strings, meta)
+
+    def encode(self) -> str:
+        """to_bytes() as base64 text, for JSON columns."""
+        return base64.b64encode(self.to_bytes()).decode("ascii")
+
+    @classmethod
+    def decode(cls, text: str) -> "ChartSnapshot":
+        """Decode encode() output."""
+        return cls.from_bytes(base64.b64decode(text))
+
+
+def pack_chart_data(chart_data: Optional[Dict[str, Any]]) -> Optional[Any]:
+    """ChartSnapshot for a chart result, or the chart result itself if it cannot be packed."""
+    if not chart_data or isinstance(chart_data, ChartSnapshot):
+        return chart_data
+    try:
+        return ChartSnapshot.from_chart_data(chart_data)
+    except (ValueError, KeyError, TypeError) as e:
+        logger.warning(f"Keeping chart data unpacked: {e}")
+        return chart_data
+
+
+def chart_data_to_json(chart_data: Optional[Any]) -> Optional[Dict[str, Any]]:
+    """Form of chart_data stored in order analysis_data: {"snapshot": <base64>} or the plain dict."""
+    if isinstance(chart_data, ChartSnapshot):
+        return {"snapshot": chart_data.encode()}
+    return chart_data
+
+
+def chart_data_from_json(stored: Optional[Dict[str, Any]]) -> Optional[Any]:
+    """Inverse of chart_data_to_json; plain dicts from older orders are returned unchanged."""
+    if isinstance(stored, dict) and set(stored) == {"snapshot"}:
+        try:
+            return ChartSnapshot.decode(stored["snapshot"])
+        except ValueError as e:
+            logger.error(f"Could not decode stored chart snapshot: {e}")
+            return None
+    return stored
@@ -0,0 +1,258 @@
+"""Native Vimshottari dasha engine (NumPy, no jyotishganit chart needed)"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+from tools.vedastro_tools import (
+    DASHA_PERIODS,
+    DASHA_SEQUENCE,
+    NAKSHATRA_LORDS,
+    NAKSHATRAS,
+    ZODIAC_SIGNS,
+    _parse_datetime,
+)
+
+# Sidereal year used for dasha lengths (same constant as jyotishganit)
+YEAR_DURATION_DAYS = 365.25636
+TOTAL_DASHA_YEARS = 120.0
+NAKSHATRA_SPAN = 360.0 / 27.0
+
+LEVEL_NAMES = ("mahadasha", "antardasha", "pratyantardasha")
+
+_EPOCH = datetime(1970, 1, 1)
+_SEQUENCE_SIZE = len(DASHA_SEQUENCE)
+
+# Lookup tables indexed by position in DASHA_SEQUENCE / NAKSHATRAS
+_LORD_YEARS = np.array([DASHA_PERIODS[lord] for lord in DASHA_SEQUENCE], dtype=np.float64)
+_NAKSHATRA_LORD_INDEX = np.array(
+    [DASHA_SEQUENCE.index(NAKSHATRA_LORDS[nakshatra]) for nakshatra in NAKSHATRAS], dtype=np.int8
+)
+
+DateLike = Union[datetime, date, str]
+
+
+def _to_days(when: DateLike) -> float:
+    """Convert a datetime/date/ISO string to float days since the epoch."""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    elif not isinstance(when, datetime):
+        when = datetime(when.year, when.month, when.day)
+    return (when - _EPOCH).total_seconds() / 86400.0
+
+
+def _from_days(days: float) -> datetime:
+    """Convert float days since the epoch back to a datetime (microsecond precision)."""
+    return _EPOCH + timedelta(days=float(days))
+
+
+def _subdivide(parent_lords: np.ndarray, parent_starts: np.ndarray, parent_lengths: np.ndarray):
+    """Split every parent period into its 9 sub-periods in one vectorized step."""
+    lords = (parent_lords[:, None] + np.arange(_SEQUENCE_SIZE)) % _SEQUENCE_SIZE
+    lengths = parent_lengths[:, None] * _LORD_YEARS[lords] / TOTAL_DASHA_YEARS
+    starts = parent_starts[:, None] + (np.cumsum(lengths, axis=1) - lengths)
+    parents = np.repeat(np.arange(len(parent_lords), dtype=np.int32), _SEQUENCE_SIZE)
+    return lords.ravel().astype(np.int8), starts.ravel(), lengths.ravel(), parents
+
+
+class DashaTimeline:
+    """Array-backed Vimshottari timeline (9 mahadashas, 81 antardashas, 729 pratyantardashas).
+
+    Built from the Moon's longitude and the birth moment alone, so nodes that
+    only have the stored chart_data get exact periods. The arithmetic matches
+    jyotishganit: sidereal years of 365.25636 days, the birth mahadasha reduced
+    by the traversed fraction of the birth nakshatra, and every sub-period
+    parent_length * lord_years / 120 starting from the parent's own lord.
+
+    Each level holds parallel arrays of lord index (into DASHA_SEQUENCE), start
+    and end (float days since 1970-01-01, naive IST) and parent index into the
+    level above. Periods within a level are contiguous and sorted, so "which
+    period contains date X" is a single searchsorted on the finest level.
+    """
+
+    __slots__ = ("birth", "moon_longitude", "lords", "starts", "ends", "parents")
+
+    def __init__(self, birth: datetime, moon_longitude: float, lords, starts, ends, parents):
+        self.birth = birth
+        self.moon_longitude = moon_longitude
+        self.lords = lords
+        self.starts = starts
+        self.ends = ends
+        self.parents = parents
+
+    @property
+    def birth_nakshatra(self) -> str:
+        return NAKSHATRAS[int(self.moon_longitude // NAKSHATRA_SPAN)]
+
+    def lookup(self, whens: Any) -> np.ndarray:
+        """Vectorized lookup of the periods containing each date.
+
+        Args:
+            whens: A date, a sequence of dates (datetime, date or ISO string)
+                   or a numpy datetime64 array
+
+        Returns:
+            int array of shape (n, 3): mahadasha, antardasha and pratyantardasha
+            indexes per date, -1 where the date is outside the 120-year cycle
+        """
+        if isinstance(whens, np.ndarray) and np.issubdtype(whens.dtype, np.datetime64):
+            days = (whens - np.datetime64("1970-01-01")).astype("timedelta64[us]").astype(np.float64) / 86400e6
+        else:
+            if isinstance(whens, (datetime, date, str)):
+                whens = [whens]
+            days = np.fromiter((_to_days(w) for w in whens), dtype=np.float64)
+
+        starts, ends = self.starts[2], self.ends[2]
+        pd_index = np.searchsorted(starts, days, side="right") - 1
+        valid = (pd_index >= 0) & (days < ends[np.clip(pd_index, 0, len(ends) - 1)])
+
+        result = np.full((len(days), 3), -1, dtype=np.int32)
+        pd_valid = pd_index[valid]
+        ad_valid = self.parents[2][pd_valid]
+        result[valid, 2] = pd_valid
+        result[valid, 1] = ad_valid
+        result[valid, 0] = self.parents[1][ad_valid]
+        return result
+
+    def period(self, level: int, index: int) -> Dict[str, Any]:
+        """Return one period as plain data."""
+        start = self.starts[level][index]
+        end = self.ends[level][index]
+        return {
+            "planet": DASHA_SEQUENCE[self.lords[level][index]],
+            "start": _from_days(start),
+            "end": _from_days(end),
+            "duration_years": round(float((end - start) / YEAR_DURATION_DAYS), 4),
+        }
+
+    def periods_at(self, when: DateLike) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Return the mahadasha, antardasha and pratyantardasha running at a date."""
+        indexes = self.lookup(when)[0]
+        return {
+            name: (self.period(level, int(indexes[level])) if indexes[level] >= 0 else None)
+            for level, name in enumerate(LEVEL_NAMES)
+        }
+
+    def periods_between(self, level: int, start: DateLike, end: DateLike) -> List[Dict[str, Any]]:
+        """Return all periods of a level that start within [start, end)."""
+        start_days, end_days = _to_days(start), _to_days(end)
+        starts = self.starts[level]
+        lo = np.searchsorted(starts, start_days, side="left")
+        hi = np.searchsorted(starts, end_days, side="left")
+        return [self.period(level, i) for i in range(lo, hi)]
+
+    def to_dict(self, today: Optional[DateLike] = None, years_ahead: int = 10) -> Dict[str, Any]:
+        """Render the timeline as the dasha dict used in prompts and stored analysis data.
+
+        Args:
+            today: Reference date for "current" periods (default: today)
+            years_ahead: Horizon for upcoming mahadashas and antardashas
+
+        Returns:
+            Dictionary with the running periods at every level and the upcoming
+            periods within the horizon
+        """
+        today_dt = datetime.fromisoformat(today) if isinstance(today, str) else (today or datetime.now())
+        if not isinstance(today_dt, datetime):
+            today_dt = datetime(today_dt.year, today_dt.month, today_dt.day)
+        horizon = today_dt + timedelta(days=years_ahead * YEAR_DURATION_DAYS)
+
+        current = self.periods_at(today_dt)
+        birth_md_remaining = (self.ends[0][0] - _to_days(self.birth)) / YEAR_DURATION_DAYS
+
+        upcoming_dashas = self.periods_between(0, today_dt, horizon)
+        if not upcoming_dashas:
+            # Always show at least the next mahadasha, even beyond the horizon
+            upcoming_dashas = self.periods_between(0, today_dt, _from_days(self.ends[0][-1]))[:1]
+
+        upcoming_antardashas = []
+        ad_lo = np.searchsorted(self.starts[1], _to_days(today_dt), side="left")
+        ad_hi = np.searchsorted(self.starts[1], _to_days(horizon), side="left")
+        for i in range(ad_lo, ad_hi):
+            period = self.period(1, i)
+            period["mahadasha"] = DASHA_SEQUENCE[self.lords[0][self.parents[1][i]]]
+            upcoming_antardashas.append(period)
+
+        return {
+            "system": "Vimshottari",
+            "moon_longitude": round(self.moon_longitude, 6),
+            "birth_nakshatra": self.birth_nakshatra,
+            "balance_at_birth": {
+                "planet": DASHA_SEQUENCE[self.lords[0][0]],
+                "years": round(float(birth_md_remaining), 4),
+            },
+            "reference_date": today_dt.strftime("%Y-%m-%d"),
+            "current_dasha": current["mahadasha"],
+            "current_antardasha": current["antardasha"],
+            "current_pratyantardasha": current["pratyantardasha"],
+            "upcoming_dashas": upcoming_dashas,
+            "upcoming_antardashas": upcoming_antardashas,
+        }
+
+
+def build_dasha_timeline(moon_longitude: float, birth_datetime: datetime) -> DashaTimeline:
+    """Compute the full three-level Vimshottari timeline.
+
+    Args:
+        moon_longitude: Sidereal longitude of the Moon at birth (0-360 degrees)
+        birth_datetime: Naive birth datetime (IST)
+
+    Returns:
+        DashaTimeline covering the 120-year cycle that contains the birth
+    """
+    moon_longitude = float(moon_longitude) % 360.0
+    nakshatra_index = int(moon_longitude // NAKSHATRA_SPAN)
+    elapsed_fraction = (moon_longitude - nakshatra_index * NAKSHATRA_SPAN) / NAKSHATRA_SPAN
+
+    first_lord = _NAKSHATRA_LORD_INDEX[nakshatra_index]
+    md_lords = ((first_lord + np.arange(_SEQUENCE_SIZE)) % _SEQUENCE_SIZE).astype(np.int8)
+    md_lengths = _LORD_YEARS[md_lords] * YEAR_DURATION_DAYS
+    cycle_start = _to_days(birth_datetime) - md_lengths[0] * elapsed_fraction
+    md_starts = cycle_start + (np.cumsum(md_lengths) - md_lengths)
+
+    ad_lords, ad_starts, ad_lengths, ad_parents = _subdivide(md_lords, md_starts, md_lengths)
+    pd_lords, pd_starts, pd_lengths, pd_parents = _subdivide(ad_lords, ad_starts, ad_lengths)
+
+    return DashaTimeline(
+        birth=birth_datetime,
+        moon_longitude=moon_longitude,
+        lords=(md_lords, ad_lords, pd_lords),
+        starts=(md_starts, ad_starts, pd_starts),
+        ends=(md_starts + md_lengths, ad_starts + ad_lengths, pd_starts + pd_lengths),
+        parents=(np.full(_SEQUENCE_SIZE, -1, dtype=np.int32), ad_parents, pd_parents),
+    )
+
+
+def moon_longitude_from_chart_data(chart_data: Optional[Dict[str, Any]]) -> Optional[float]:
+    """Get the Moon's sidereal longitude (sign index * 30 + degrees) from a comprehensive chart result."""
+    if not chart_data:
+        return None
+
+    moon = (chart_data.get("planetary_positions") or {}).get("Moon") or {}
+    sign, degrees = moon.get("sign"), moon.get("sign_degrees")
+    if sign not in ZODIAC_SIGNS or degrees is None:
+        return None
+    return ZODIAC_SIGNS.index(sign) * 30.0 + float(degrees)
+
+
+def dasha_timeline_for_birth(
+    date_of_birth: str,
+    time_of_birth: str,
+    chart_data: Optional[Dict[str, Any]] = None,
+    moon_longitude: Optional[float] = None
+) -> Optional[DashaTimeline]:
+    """Build a timeline from birth details plus either chart_data or a Moon longitude.
+
+    Returns:
+        DashaTimeline, or None if the Moon position or birth moment is unavailable
+    """
+    if moon_longitude is None:
+        moon_longitude = moon_longitude_from_chart_data(chart_data)
+    if moon_longitude is None or not date_of_birth or not time_of_birth:
+        return None
+    try:
+        birth_datetime = _parse_datetime(date_of_birth, time_of_birth)
+    except ValueError:
+        return None
+    return build_dasha_timeline(moon_longitude, birth_datetime)
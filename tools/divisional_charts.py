@@ -0,0 +1,146 @@
+"""Lazy divisional (varga) charts"""
+
+import logging
+from collections.abc import Mapping
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    from jyotishganit.components.divisional_charts import compute_divisional_chart
+except ImportError:
+    compute_divisional_chart = None
+
+from tools.vedastro_tools import DIVISIONAL_CHART_NAMES, PLANET_NAMES, _divisional_chart_data
+
+logger = logging.getLogger(__name__)
+
+# Vargas always included for goal analysis (Navamsa qualifies every planet's strength)
+BASE_VARGAS = ["d9"]
+
+# Goal keyword -> vargas that goal is judged from
+GOAL_VARGAS = {
+    "career": ["d10"], "job": ["d10"], "profession": ["d10"], "business": ["d10"], "work": ["d10"],
+    "marriage": ["d9"], "spouse": ["d9"], "love": ["d9"], "relationship": ["d9"], "partner": ["d9"],
+    "wealth": ["d2"], "finance": ["d2"], "money": ["d2"], "income": ["d2"],
+    "property": ["d4"], "home": ["d4"], "house": ["d4"], "land": ["d4"],
+    "vehicle": ["d16"], "comfort": ["d16"], "luxury": ["d16"],
+    "children": ["d7"], "child": ["d7"], "progeny": ["d7"], "pregnancy": ["d7"],
+    "sibling": ["d3"], "brother": ["d3"], "sister": ["d3"], "courage": ["d3"],
+    "parent": ["d12"], "father": ["d12"], "mother": ["d12"],
+    "education": ["d24"], "study": ["d24"], "studies": ["d24"], "learning": ["d24"], "knowledge": ["d24"],
+    "spiritual": ["d20"], "spirituality": ["d20"], "religion": ["d20"],
+    "health": ["d30"], "disease": ["d30"], "illness": ["d30"],
+}
+
+
+def vargas_for_goals(goals: Optional[Iterable[str]]) -> List[str]:
+    """Vargas needed for a list of free-text goals (BASE_VARGAS first, no duplicates)."""
+    vargas = list(BASE_VARGAS)
+    for goal in goals or []:
+        words = str(goal).lower().replace("/", " ").replace("-", " ").split()
+        for word in words:
+            for varga in GOAL_VARGAS.get(word, []):
+                if varga not in vargas:
+                    vargas.append(varga)
+    return vargas
+
+
+class DivisionalChartSet(Mapping):
+    """Read-only mapping of varga key ("d9") to chart data, computed on first access.
+
+    A varga is a pure function of D1, so it is rebuilt from the stored D1
+    positions with jyotishganit's compute_divisional_chart (identical results)
+    and kept. Nodes ask only for the vargas their goals need (GOAL_VARGAS).
+
+    Charts already present in the stored chart_data (e.g. explicitly requested
+    from the chart engine) are used as-is; the rest are computed from the D1
+    positions. Iterating the full mapping materializes every varga, so prefer
+    subset()/for_goals().
+    """
+
+    def __init__(self, d1_chart: Optional[Any], precomputed: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._d1_chart = d1_chart
+        self._charts: Dict[str, Dict[str, Any]] = dict(precomputed or {})
+
+    @classmethod
+    def from_chart_data(cls, chart_data: Optional[Dict[str, Any]]) -> "DivisionalChartSet":
+        """Build a set over a comprehensive chart result (as stored in graph state / analysis data)."""
+        chart_data = chart_data or {}
+        precomputed = {
+            key: value for key, value in (chart_data.get("divisional_charts") or {}).items()
+            if isinstance(value, dict) and "error" not in value
+        }
+        return cls(_d1_chart_from_chart_data(chart_data), precomputed)
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        chart_key = key.lower()
+        if chart_key not in DIVISIONAL_CHART_NAMES:
+            raise KeyError(key)
+        if chart_key not in self._charts:
+            self._charts[chart_key] = self._compute(chart_key)
+        return self._charts[chart_key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(DIVISIONAL_CHART_NAMES)
+
+    def __len__(self) -> int:
+        return len(DIVISIONAL_CHART_NAMES)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key.lower() in DIVISIONAL_CHART_NAMES
+
+    @property
+    def materialized(self) -> List[str]:
+        """Keys of the vargas computed (or loaded) so far."""
+        return list(self._charts)
+
+    def _compute(self, chart_key: str) -> Dict[str, Any]:
+        if compute_divisional_chart is None:
+            return {"error": "jyotishganit package not installed"}
+        if self._d1_chart is None:
+            return {"error": f"Chart {chart_key} not available (no D1 positions)"}
+        try:
+            divisional_chart = compute_divisional_chart(self._d1_chart, chart_key.upper())
+            return _divisional_chart_data(divisional_chart, chart_key)
+        except Exception as e:
+            logger.warning(f"Error computing {chart_key}: {e}")
+            return {"error": str(e)}
+
+    def subset(self, chart_types: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Materialize and return only the requested vargas (unknown keys are skipped)."""
+        charts = {}
+        for chart_type in chart_types:
+            chart_key = chart_type.lower()
+            if chart_key not in DIVISIONAL_CHART_NAMES:
+                logger.warning(f"Unknown chart type: {chart_type}, skipping")
+                continue
+            charts[chart_key] = self[chart_key]
+        return charts
+
+    def for_goals(self, goals: Optional[Iterable[str]]) -> Dict[str, Dict[str, Any]]:
+        """Materialize and return the vargas relevant to a list of goals."""
+        return self.subset(vargas_for_goals(goals))
+
+
+def _d1_chart_from_chart_data(chart_data: Dict[str, Any]) -> Optional[SimpleNamespace]:
+    """Minimal stand-in for a jyotishganit RasiChart with what compute_divisional_chart reads."""
+    lagna = chart_data.get("lagna") or {}
+    positions = chart_data.get("planetary_positions") or {}
+    if lagna.get("sign") is None or lagna.get("sign_degrees") is None:
+        # Charts stored before the lagna degree was recorded cannot be divided
+        return None
+
+    planets = []
+    for name in PLANET_NAMES:
+        planet = positions.get(name)
+        if not planet or planet.get("sign") is None or planet.get("sign_degrees") is None:
+            return None
+        planets.append(SimpleNamespace(
+            celestial_body=planet.get("celestial_body", name),
+            sign=planet["sign"],
+            sign_degrees=float(planet["sign_degrees"]),
+            house=planet.get("house"),
+        ))
+
+    ascendant = SimpleNamespace(sign=lagna["sign"], sign_degrees=float(lagna["sign_degrees"]))
+    return SimpleNamespace(houses=[ascendant], planets=planets)
@@ -0,0 +1,199 @@
+"""Offline gazetteer for birth place names"""
+
+import csv
+import difflib
+import logging
+import os
+import re
+import threading
+import unicodedata
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from config import AstroConfig
+
+logger = logging.getLogger(__name__)
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.tsv")
+
+# Minimum similarity for a fuzzy name match (difflib ratio)
+FUZZY_CUTOFF = 0.85
+
+# Common country names and abbreviations that differ from the gazetteer's
+COUNTRY_ALIASES = {
+    "usa": "us", "united states of america": "us", "america": "us",
+    "uk": "gb", "great britain": "gb", "britain": "gb",
+    "uae": "ae", "emirates": "ae",
+}
+
+
+def normalize_place(place: str) -> str:
+    """Lowercase, accent-free place name with single spaces and ", " between parts."""
+    text = unicodedata.normalize("NFKD", place)
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    parts = [" ".join(re.sub(r"[^\w\s]", " ", part).split()) for part in text.split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+class Place(NamedTuple):
+    name: str
+    state: str
+    country: str
+    country_code: str
+    latitude: float
+    longitude: float
+    population: int
+    timezone: str
+
+    def to_location(self) -> Dict[str, Any]:
+        """Location data in the shape returned by tools.geocoding_tools."""
+        return {
+            "success": True,
+            "place_name": ", ".join(dict.fromkeys(p for p in (self.name, self.state, self.country) if p)),
+            "city": self.name,
+            "state": self.state,
+            "country": self.country,
+            "latitude": self.latitude,
+            "longitude": self.longitude,
+            "timezone": self.timezone,
+            "population": self.population,
+        }
+
+
+def read_places(path: str) -> Iterable[tuple]:
+    """(Place, alternate names) rows from a gazetteer TSV file."""
+    with open(path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        for row in reader:
+            if not row or row[0].startswith("#"):
+                continue
+            try:
+                name, alternates, state, country, country_code, lat, lon, population, timezone = row[:9]
+                place = Place(name, state, country, country_code, float(lat), float(lon), int(population or 0), timezone)
+            except ValueError as e:
+                logger.warning(f"Skipping malformed gazetteer row {path}:{reader.line_num}: {e}")
+                continue
+            yield place, [a for a in alternates.split(",") if a.strip()]
+
+
+class Gazetteer:
+    """Sorted-key name index over the bundled places (loaded on first use).
+
+    Reads tools/data/gazetteer.tsv plus GAZETTEER_EXTRA_PATH (a GeoNames
+    extract from scripts/build_gazetteer.py). Every normalized name and
+    alternate name lives in one sorted key array, so exact and prefix lookups
+    are a binary search; ties rank by population and "City, State, Country"
+    qualifiers filter them. fuzzy() handles misspellings.
+    """
+
+    def __init__(self, paths: Sequence[str] = (GAZETTEER_PATH,)):
+        self.paths = [p for p in paths if p]
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._places: List[Place] = []
+        self._keys: List[str] = []
+        self._key_places: List[int] = []
+        self._coordinates = np.empty((0, 2))
+
+    def load(self) -> int:
+        """Read the gazetteer files (once); returns the number of places."""
+        if self._loaded:
+            return len(self._places)
+        with self._lock:
+            if self._loaded:
+                return len(self._places)
+            places, entries = [], set()
+            for path in self.paths:
+                if not os.path.exists(path):
+                    logger.warning(f"Gazetteer file not found: {path}")
+                    continue
+                for place, alternates in read_places(path):
+                    index = len(places)
+                    places.append(place)
+                    for name in [place.name, *alternates]:
+                        key = normalize_place(name)
+                        if key:
+                            entries.add((key, index))
+            entries = sorted(entries)
+            self._places = places
+            self._keys = [key for key, _ in entries]
+            self._key_places = [index for _, index in entries]
+            self._coordinates = np.radians([[p.latitude, p.longitude] for p in places]).reshape(-1, 2)
+            self._loaded = True
+            logger.info(f"Gazetteer loaded: {len(places)} places, {len(entries)} names")
+            return len(places)
+
+    def __len__(self) -> int:
+        return self.load()
+
+    def _matching(self, key: str) -> List[int]:
+        """Place indexes stored under exactly this normalized name."""
+        start = bisect_left(self._keys, key)
+        end = start
+        while end < len(self._keys) and self._keys[end] == key:
+            end += 1
+        return self._key_places[start:end]
+
+    def _qualified(self, indexes: Iterable[int], qualifiers: Sequence[str]) -> List[Place]:
+        """Places whose state or country matches every qualifier, most populous first."""
+        places = []
+        for index in dict.fromkeys(indexes):
+            place = self._places[index]
+            allowed = {normalize_place(place.state), normalize_place(place.country), place.country_code.lower()}
+            if all(COUNTRY_ALIASES.get(q, q) in allowed or q.isdigit() for q in qualifiers):
+                places.append(place)
+        return sorted(places, key=lambda p: -p.population)
+
+    def lookup(self, place: str) -> List[Place]:
+        """Exact matches for "Name[, State][, Country]", most populous first."""
+        self.load()
+        name, *qualifiers = normalize_place(place).split(", ")
+        return self._qualified(self._matching(name), qualifiers)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Place]:
+        """Places with a name or alternate name starting with prefix, most populous first."""
+        self.load()
+        key = normalize_place(prefix).split(", ")[0]
+        if not key:
+            return []
+        start = bisect_left(self._keys, key)
+        indexes = []
+        for i in range(start, len(self._keys)):
+            if not self._keys[i].startswith(key):
+                break
+            indexes.append(self._key_places[i])
+        places = sorted((self._places[i] for i in dict.fromkeys(indexes)), key=lambda p: -p.population)
+        return places[:limit]
+
+    def nearest(self, latitude: float, longitude: float, max_km: float) -> Optional[Place]:
+        """Closest place within max_km (great-circle distance), or None."""
+        self.load()
+        if not len(self._places):
+            return None
+        lat, lon = np.radians(latitude), np.radians(longitude)
+        lats, lons = self._coordinates[:, 0], self._coordinates[:, 1]
+        a = np.sin((lats - lat) / 2) ** 2 + np.cos(lat) * np.cos(lats) * np.sin((lons - lon) / 2) ** 2
+        distances = 2 * 6371.0 * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+        index = int(np.argmin(distances))
+        return self._places[index] if distances[index] <= max_km else None
+
+    def fuzzy(self, place: str, cutoff: float = FUZZY_CUTOFF) -> List[Place]:
+        """Closest spelling matches for a name not found exactly (same first letter only)."""
+        self.load()
+        name, *qualifiers = normalize_place(place).split(", ")
+        if len(name) < 4:
+            return []
+        start = bisect_left(self._keys, name[0])
+        end = bisect_left(self._keys, chr(ord(name[0]) + 1))
+        close = difflib.get_close_matches(name, self._keys[start:end], n=3, cutoff=cutoff)
+        # Closest spelling first, then population
+        places: List[Place] = []
+        for key in close:
+            places.extend(p for p in self._qualified(self._matching(key), qualifiers) if p not in places)
+        return places
+
+
+# Global gazetteer instance
+gazetteer = Gazetteer([GAZETTEER_PATH, AstroConfig.LocationConfig.GAZETTEER_EXTRA_PATH])
@@ -0,0 +1,206 @@
+"""Persistent cache of geocoding results (geocode_cache table behind an in-process LRU)"""
+
+import asyncio
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select, update, func
+from sqlalchemy.exc import IntegrityError
+
+import database
+from config import AstroConfig
+from models.geocode_cache import GeocodeCacheEntry
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+PLACE = "place"
+COORDINATES = "coordinates"
+
+CacheKey = Tuple[str, str]
+
+
+class GeocodeCache:
+    """LRU over the geocode_cache table (the table is skipped when the database is not initialized)."""
+
+    def __init__(self, max_entries: int, coord_precision: int = 4, db_enabled: bool = True):
+        self.coord_precision = coord_precision
+        self.db_enabled = db_enabled
+        self._memory = LRUCache(max_entries)
+        self._lock = threading.Lock()
+        self._pending_hits: Dict[CacheKey, int] = {}
+        self.db_hits = 0
+        self.db_misses = 0
+        self.db_errors = 0
+
+    @staticmethod
+    def place_key(normalized_place: str) -> CacheKey:
+        return (PLACE, normalized_place[:255])
+
+    def coordinates_key(self, latitude: float, longitude: float) -> CacheKey:
+        p = self.coord_precision
+        return (COORDINATES, f"{round(float(latitude), p):.{p}f},{round(float(longitude), p):.{p}f}")
+
+    def _session(self):
+        if not self.db_enabled or database.SessionLocal is None:
+            return None
+        return database.SessionLocal()
+
+    def get_memory(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Location data from the in-process LRU only."""
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        location, stored = entry
+        if stored:
+            with self._lock:
+                self._pending_hits[key] = self._pending_hits.get(key, 0) + 1
+        return location
+
+    async def get_stored(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Location data from the table (kept in memory afterwards)."""
+        location = await asyncio.to_thread(self._db_get, key)
+        if location is not None:
+            self._memory.set(key, (location, True))
+        return location
+
+    async def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Cached location data for a key (memory first, then the table)."""
+        location = self.get_memory(key)
+        if location is None:
+            location = await self.get_stored(key)
+        return location
+
+    def _db_get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        db = self._session()
+        if db is None:
+            return None
+        try:
+            entry = db.execute(
+                select(GeocodeCacheEntry).where(
+                    GeocodeCacheEntry.kind == key[0], GeocodeCacheEntry.cache_key == key[1]
+                )
+            ).scalar_one_or_none()
+            if entry is None:
+                self.db_misses += 1
+                return None
+            entry.hit_count += 1
+            entry.last_used_at = func.now()
+            location = dict(entry.location_data)
+            db.commit()
+            self.db_hits += 1
+            return location
+        except Exception as e:
+            db.rollback()
+            self.db_errors += 1
+            logger.warning(f"Geocode cache lookup failed: {e}")
+            return None
+        finally:
+            db.close()
+
+    def remember(self, key: CacheKey, location: Dict[str, Any]) -> None:
+        """Keep a result in memory only (e.g. offline gazetteer matches)."""
+        self._memory.set(key, (location, False))
+
+    async def set(self, key: CacheKey, location: Dict[str, Any]) -> None:
+        """Store a result in memory and in the table."""
+        self._memory.set(key, (location, True))
+        await asyncio.to_thread(self._db_set, key, location)
+
+    def _db_set(self, key: CacheKey, location: Dict[str, Any]) -> None:
+        db = self._session()
+        if db is None:
+            return
+        try:
+            entry = db.execute(
+                select(GeocodeCacheEntry).where(
+                    GeocodeCacheEntry.kind == key[0], GeocodeCacheEntry.cache_key == key[1]
+                )
+            ).scalar_one_or_none()
+            if entry is None:
+                entry = GeocodeCacheEntry(kind=key[0], cache_key=key[1], hit_count=0)
+                db.add(entry)
+            entry.latitude = float(location["latitude"])
+            entry.longitude = float(location["longitude"])
+            entry.location_data = location
+            entry.last_used_at = func.now()
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # stored concurrently by another worker
+        except Exception as e:
+            db.rollback()
+            self.db_errors += 1
+            logger.warning(f"Geocode cache write failed: {e}")
+        finally:
+            db.close()
+
+    def flush_hits(self) -> int:
+        """Write hit counts of memory hits back to the table; returns the rows updated."""
+        with self._lock:
+            pending, self._pending_hits = self._pending_hits, {}
+        if not pending:
+            return 0
+        db = self._session()
+        if db is None:
+            return 0
+        try:
+            for (kind, cache_key), hits in pending.items():
+                db.execute(
+                    update(GeocodeCacheEntry)
+                    .where(GeocodeCacheEntry.kind == kind, GeocodeCacheEntry.cache_key == cache_key)
+                    .values(hit_count=GeocodeCacheEntry.hit_count + hits, last_used_at=func.now())
+                )
+            db.commit()
+            return len(pending)
+        except Exception as e:
+            db.rollback()
+            self.db_errors += 1
+            logger.warning(f"Geocode cache hit count flush failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def warm(self, limit: int) -> int:
+        """Load the most-used rows into memory; returns the number loaded."""
+        if limit <= 0:
+            return 0
+        db = self._session()
+        if db is None:
+            return 0
+        try:
+            entries = db.execute(
+                select(GeocodeCacheEntry.kind, GeocodeCacheEntry.cache_key, GeocodeCacheEntry.location_data)
+                .order_by(GeocodeCacheEntry.hit_count.desc(), GeocodeCacheEntry.last_used_at.desc())
+                .limit(limit)
+            ).all()
+            # Least used first, so the most used end up most recently used in the LRU
+            for kind, cache_key, location_data in reversed(entries):
+                self._memory.set((kind, cache_key), (dict(location_data), True))
+            return len(entries)
+        except Exception as e:
+            self.db_errors += 1
+            logger.warning(f"Geocode cache warm-up failed: {e}")
+            return 0
+        finally:
+            db.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "memory": self._memory.stats(),
+            "db": {
+                "enabled": self.db_enabled and database.SessionLocal is not None,
+                "hits": self.db_hits,
+                "misses": self.db_misses,
+                "errors": self.db_errors,
+                "pending_hit_updates": len(self._pending_hits),
+            },
+        }
+
+
+# Global geocode cache instance
+geocode_cache = GeocodeCache(
+    max_entries=AstroConfig.LocationConfig.LOCATION_CACHE_MAX_ENTRIES,
+    coord_precision=AstroConfig.LocationConfig.GEOCODE_CACHE_COORD_PRECISION,
+    db_enabled=AstroConfig.LocationConfig.GEOCODE_CACHE_DB_ENABLED,
+)
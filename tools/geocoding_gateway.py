@@ -0,0 +1,195 @@
+"""Rate-limited, single-flight gateway for Nominatim requests"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, Mapping, Optional, Tuple
+
+import httpx
+
+from config import AstroConfig
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_STATUSES = (429, 509)
+
+
+class TokenBucket:
+    """Token bucket whose balance may go negative: a debt is the queue of callers waiting their turn."""
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._pauses = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        if now > self._updated:
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def _reserve(self) -> Tuple[float, int]:
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._paused_until)
+            self._refill(start)
+            self._tokens -= 1
+            wait = start - now + (-self._tokens / self.rate if self._tokens < 0 else 0.0)
+            return wait, self._pauses
+
+    def reserve(self) -> float:
+        """Take a token; returns the seconds to wait before using it."""
+        return self._reserve()[0]
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds waited.
+
+        A caller whose slot was reserved before a pause() gives it up and
+        queues again behind the pause, so callers resume one slot apart.
+        """
+        started = self._clock()
+        while True:
+            wait, pauses = self._reserve()
+            if wait > 0:
+                await self._sleep(wait)
+            if pauses == self._pauses:
+                return self._clock() - started
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every caller, including those already waiting, for at least `seconds` (e.g. after a 429)."""
+        with self._lock:
+            resume = self._clock() + seconds
+            if resume > self._paused_until:
+                self._paused_until = resume
+                # Waiting callers re-reserve, so their debt is dropped; one token is ready on resume
+                self._tokens = 1.0
+                self._updated = resume
+                self._pauses += 1
+
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    """Seconds from a numeric Retry-After header, if present."""
+    try:
+        return max(0.0, float(response.headers["Retry-After"]))
+    except (KeyError, ValueError):
+        return None
+
+
+class GeocodingGateway:
+    """Rate-limited, deduplicating client for the Nominatim API."""
+
+    def __init__(
+        self,
+        base_url: str,
+        user_agent: str,
+        rate_per_second: float = 1.0,
+        burst: float = 1.0,
+        max_retries: int = 2,
+        backoff_seconds: float = 2.0,
+        timeout_seconds: float = 10.0
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.user_agent = user_agent
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.timeout_seconds = timeout_seconds
+        self._bucket = TokenBucket(rate_per_second, burst)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._stats = {"requests": 0, "coalesced": 0, "rate_limited": 0, "retries": 0}
+        self._throttled_seconds = 0.0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client_loop is not loop:
+            # A client from another (finished) loop cannot be reused; drop it without awaiting its close
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout_seconds,
+                headers={
+                    "User-Agent": self.user_agent,  # Required by Nominatim, should include contact
+                    "Accept": "application/json",
+                    "Accept-Language": "en",
+                },
+                limits=httpx.Limits(max_connections=4, max_keepalive_connections=2),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def get_json(self, path: str, params: Mapping[str, Any]) -> Any:
+        """GET base_url/path with params and return the decoded JSON.
+
+        Raises:
+            httpx.HTTPStatusError: For error statuses (including 429/509 once retries are used up)
+            httpx.HTTPError: For transport errors
+        """
+        key: Tuple[Hashable, ...] = (path, tuple(sorted((k, str(v)) for k, v in params.items())))
+        task = self._inflight.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            logger.debug(f"Joining in-flight Nominatim request: {path} {dict(params)}")
+        else:
+            task = asyncio.ensure_future(self._fetch(path, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # shield: a cancelled caller must not cancel the request others are waiting on
+        return await asyncio.shield(task)
+
+    async def _fetch(self, path: str, params: Mapping[str, Any]) -> Any:
+        client = self._get_client()
+        url = f"{self.base_url}/{path}"
+        for attempt in range(self.max_retries + 1):
+            self._throttled_seconds += await self._bucket.acquire()
+            self._stats["requests"] += 1
+            response = await client.get(url, params=params)
+
+            if response.status_code in RATE_LIMIT_STATUSES:
+                self._stats["rate_limited"] += 1
+                if attempt < self.max_retries:
+                    delay = _retry_after(response) or self.backoff_seconds * (2 ** attempt)
+                    logger.warning(
+                        f"Rate limited by Nominatim (status {response.status_code}), "
+                        f"pausing requests for {delay:.1f}s (retry {attempt + 1}/{self.max_retries})"
+                    )
+                    self._bucket.pause(delay)
+                    self._stats["retries"] += 1
+                    continue
+
+            response.raise_for_status()
+            return response.json()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "in_flight": len(self._inflight),
+            "throttled_seconds": round(self._throttled_seconds, 3),
+        }
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        client, self._client, self._client_loop = self._client, None, None
+        if client is not None:
+            await client.aclose()
+
+
+# Global Nominatim gateway
+geocoding_gateway = GeocodingGateway(
+    base_url=AstroConfig.GeocodingConfig.NOMINATIM_URL,
+    user_agent=AstroConfig.GeocodingConfig.NOMINATIM_USER_AGENT,
+    rate_per_second=AstroConfig.GeocodingConfig.NOMINATIM_RATE_PER_SECOND,
+    burst=AstroConfig.GeocodingConfig.NOMINATIM_BURST,
+    max_retries=AstroConfig.GeocodingConfig.NOMINATIM_MAX_RETRIES,
+    timeout_seconds=AstroConfig.GeocodingConfig.NOMINATIM_TIMEOUT_SECONDS,
+)
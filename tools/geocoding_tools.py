@@ -5,6 +5,9 @@ import logging
 import httpx
 import json
 
+from tools.geocoding_gateway import geocoding_gateway
+from tools.timezone_lookup import timezone_lookup
+
 logger = logging.getLogger(__name__)
 
 
@@ -14,7 +17,7 @@ async def geocode_address(address: str) -> Dict[str, Any]:
     This is a free, no-API-key-required geocoding service.
     
     **Rate Limiting**: Nominatim requires max 1 request per second.
-    This function includes automatic rate limiting and retry logic.
+    Requests go through the shared geocoding gateway (token bucket, 429 backoff).
     
     Args:
         address: Full address string (e.g., "Mumbai, Maharashtra, India")
@@ -22,42 +25,62 @@ async def geocode_address(address: str) -> Dict[str, Any]:
     Returns:
         Dictionary containing location data with coordinates and timezone
     """
-    import asyncio
+    result = await geocode_candidates(address, limit=1)
+    if not result.get("success"):
+        return result
+    return result["candidates"][0]
+
+
+def _location_from_result(result: Dict[str, Any], address: str) -> Dict[str, Any]:
+    """Location data from one Nominatim search result."""
+    address_parts = result.get("address", {})
+    latitude = float(result.get("lat", 0))
+    longitude = float(result.get("lon", 0))
+    return {
+        "success": True,
+        "place_name": result.get("display_name", address),
+        "city": (
+            address_parts.get("city") or 
+            address_parts.get("town") or 
+            address_parts.get("village") or
+            address_parts.get("municipality") or
+            ""
+        ),
+        "state": (
+            address_parts.get("state") or
+            address_parts.get("region") or
+            ""
+        ),
+        "country": address_parts.get("country", ""),
+        "latitude": latitude,
+        "longitude": longitude,
+        "timezone": _get_timezone_from_coordinates(latitude, longitude),
+        "importance": float(result.get("importance") or 0.0)
+    }
+
+
+async def geocode_candidates(address: str, limit: int = 5) -> Dict[str, Any]:
+    """
+    Geocode an address and return up to `limit` Nominatim matches, most relevant first.
     
+    Args:
+        address: Full address string (e.g., "Aurangabad, India")
+        limit: Maximum number of matches
+    
+    Returns:
+        {"success": True, "candidates": [location data, ...]} or an error dictionary
+    """
     try:
         # Use Nominatim geocoding API (free, no API key required)
-        # IMPORTANT: Nominatim requires max 1 request per second
-        base_url = "https://nominatim.openstreetmap.org/search"
-        
+        # Rate limiting (max 1 request per second), retries and connection reuse are handled by the gateway
         params = {
             "q": address,
             "format": "json",
-            "limit": 1,
+            "limit": limit,
             "addressdetails": 1
         }
         
-        headers = {
-            "User-Agent": "AstroGuru-AI/1.0 (Contact: support@example.com)",  # Required by Nominatim, should include contact
-            "Accept": "application/json",
-            "Accept-Language": "en"
-        }
-        
-        # Rate limiting: Nominatim requires max 1 request per second
-        # Add a small delay to respect rate limits
-        await asyncio.sleep(1.0)
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(base_url, params=params, headers=headers)
-            
-            # Handle rate limiting
-            if response.status_code == 429 or response.status_code == 509:
-                logger.warning(f"Rate limited by Nominatim (status {response.status_code}), waiting 2 seconds and retrying...")
-                await asyncio.sleep(2.0)
-                # Retry once
-                response = await client.get(base_url, params=params, headers=headers)
-            
-            response.raise_for_status()
-            data = response.json()
+        data = await geocoding_gateway.get_json("search", params)
         
         if not data or len(data) == 0:
             logger.warning(f"No results found for address: {address}")
@@ -67,38 +90,9 @@ async def geocode_address(address: str) -> Dict[str, Any]:
                 "address": address
             }
         
-        # Get the first (most relevant) result
-        result = data[0]
-        
-        # Extract location details
-        address_parts = result.get("address", {})
-        
-        location_data = {
-            "success": True,
-            "place_name": result.get("display_name", address),
-            "city": (
-                address_parts.get("city") or 
-                address_parts.get("town") or 
-                address_parts.get("village") or
-                address_parts.get("municipality") or
-                ""
-            ),
-            "state": (
-                address_parts.get("state") or
-                address_parts.get("region") or
-                ""
-            ),
-            "country": address_parts.get("country", ""),
-            "latitude": float(result.get("lat", 0)),
-            "longitude": float(result.get("lon", 0)),
-            "timezone": _get_timezone_from_coordinates(
-                float(result.get("lat", 0)),
-                float(result.get("lon", 0))
-            )
-        }
-        
-        logger.info(f"Geocoded '{address}' to {location_data['latitude']}, {location_data['longitude']}")
-        return location_data
+        candidates = [_location_from_result(result, address) for result in data]
+        logger.info(f"Geocoded '{address}' to {candidates[0]['latitude']}, {candidates[0]['longitude']} ({len(candidates)} match(es))")
+        return {"success": True, "candidates": candidates}
         
     except httpx.HTTPStatusError as e:
         status_code = e.response.status_code
@@ -136,8 +130,8 @@ async def geocode_address(address: str) -> Dict[str, Any]:
 
 def _get_timezone_from_coordinates(latitude: float, longitude: float) -> str:
     """
-    Get timezone from coordinates using timezonefinder library if available,
-    otherwise fall back to simple lookup.
+    Get timezone from coordinates (grid index, shared TimezoneFinder, nearest
+    gazetteer place; see tools.timezone_lookup).
     
     Args:
         latitude: Latitude in decimal degrees
@@ -146,54 +140,7 @@ def _get_timezone_from_coordinates(latitude: float, longitude: float) -> str:
     Returns:
         IANA timezone string (e.g., "Asia/Kolkata")
     """
-    # Try to use timezonefinder library if available (more accurate)
-    try:
-        from timezonefinder import TimezoneFinder
-        tf = TimezoneFinder()
-        timezone = tf.timezone_at(lat=latitude, lng=longitude)
-        if timezone:
-            return timezone
-    except ImportError:
-        logger.debug("timezonefinder not available, using simple timezone lookup")
-    except Exception as e:
-        logger.warning(f"Error using timezonefinder: {e}, falling back to simple lookup")
-    
-    # Fallback: Simple timezone mapping for common regions
-    # India and nearby regions
-    if 6.0 <= latitude <= 37.0 and 68.0 <= longitude <= 97.0:
-        return "Asia/Kolkata"
-    
-    # USA - Eastern
-    if 24.0 <= latitude <= 50.0 and -85.0 <= longitude <= -66.0:
-        return "America/New_York"
-    
-    # USA - Central
-    if 24.0 <= latitude <= 50.0 and -102.0 <= longitude <= -85.0:
-        return "America/Chicago"
-    
-    # USA - Mountain
-    if 24.0 <= latitude <= 50.0 and -115.0 <= longitude <= -102.0:
-        return "America/Denver"
-    
-    # USA - Pacific
-    if 24.0 <= latitude <= 50.0 and -125.0 <= longitude <= -115.0:
-        return "America/Los_Angeles"
-    
-    # UK
-    if 49.0 <= latitude <= 61.0 and -8.0 <= longitude <= 2.0:
-        return "Europe/London"
-    
-    # Europe - Central
-    if 35.0 <= latitude <= 55.0 and 5.0 <= longitude <= 25.0:
-        return "Europe/Berlin"
-    
-    # Australia - Sydney
-    if -45.0 <= latitude <= -10.0 and 113.0 <= longitude <= 154.0:
-        return "Australia/Sydney"
-    
-    # Default to UTC if unknown
-    logger.warning(f"Unknown timezone for coordinates {latitude}, {longitude}, defaulting to UTC")
-    return "UTC"
+    return timezone_lookup.timezone_at(latitude, longitude)
 
 
 async def reverse_geocode(latitude: float, longitude: float) -> Dict[str, Any]:
@@ -201,7 +148,7 @@ async def reverse_geocode(latitude: float, longitude: float) -> Dict[str, Any]:
     Reverse geocode coordinates to get address details.
     
     **Rate Limiting**: Nominatim requires max 1 request per second.
-    This function includes automatic rate limiting and retry logic.
+    Requests go through the shared geocoding gateway (token bucket, 429 backoff).
     
     Args:
         latitude: Latitude in decimal degrees
@@ -210,13 +157,8 @@ async def reverse_geocode(latitude: float, longitude: float) -> Dict[str, Any]:
     Returns:
         Dictionary containing location data
     """
-    import asyncio
-    
     try:
-        # Use Nominatim reverse geocoding API
-        # IMPORTANT: Nominatim requires max 1 request per second
-        base_url = "https://nominatim.openstreetmap.org/reverse"
-        
+        # Use Nominatim reverse geocoding API (rate limited by the gateway)
         params = {
             "lat": str(latitude),
             "lon": str(longitude),
@@ -224,27 +166,7 @@ async def reverse_geocode(latitude: float, longitude: float) -> Dict[str, Any]:
             "addressdetails": 1
         }
         
-        headers = {
-            "User-Agent": "AstroGuru-AI/1.0 (Contact: support@example.com)",  # Required by Nominatim
-            "Accept": "application/json",
-            "Accept-Language": "en"
-        }
-        
-        # Rate limiting: Nominatim requires max 1 request per second
-        await asyncio.sleep(1.0)
-        
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.get(base_url, params=params, headers=headers)
-            
-            # Handle rate limiting
-            if response.status_code == 429 or response.status_code == 509:
-                logger.warning(f"Rate limited by Nominatim (status {response.status_code}), waiting 2 seconds and retrying...")
-                await asyncio.sleep(2.0)
-                # Retry once
-                response = await client.get(base_url, params=params, headers=headers)
-            
-            response.raise_for_status()
-            result = response.json()
+        result = await geocoding_gateway.get_json("reverse", params)
         
         if not result:
             return {
@@ -0,0 +1,108 @@
+"""Cache for per-goal analyses"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Mapping, Optional
+
+from config import AstroConfig
+from tools.chart_cache import _DiskStore
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Chart sections a goal analysis is derived from
+_FINGERPRINT_SECTIONS = ("lagna", "planetary_positions", "house_positions", "shadbala")
+
+
+def chart_fingerprint(chart_data: Mapping[str, Any]) -> str:
+    """Hex sha256 of the natal chart content (independent of name, place label and request time)."""
+    payload = {section: chart_data.get(section) for section in _FINGERPRINT_SECTIONS}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def normalize_goal(goal: Any) -> str:
+    """Case- and whitespace-insensitive goal text, so "Career " and "career" share an entry."""
+    return " ".join(str(goal).lower().split())
+
+
+class GoalAnalysisCache:
+    """Two-tier (memory LRU + SQLite) cache of goal analysis markdown with a TTL.
+
+    Entries are keyed by (chart fingerprint, goal, prompt version), so a repeat
+    order that adds one goal only calls the LLM for that goal. Forecasts are
+    date-relative, hence the GOAL_CACHE_TTL_DAYS expiry.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 10000,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.ttl_seconds = ttl_seconds
+        self._memory = LRUCache(max_entries)
+        self._disk = _DiskStore(disk_path, disk_max_entries, table="goal_analysis_cache") if disk_path else None
+
+    @staticmethod
+    def make_key(fingerprint: str, goal: str, prompt_version: int) -> str:
+        payload = {"chart": fingerprint, "goal": normalize_goal(goal), "prompt_version": prompt_version}
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _fresh(self, entry: Optional[Dict[str, Any]]) -> Optional[str]:
+        if entry is None or time.time() - entry["created_at"] > self.ttl_seconds:
+            return None
+        return entry["analysis"]
+
+    async def get(self, key: str) -> Optional[str]:
+        """Cached analysis for a key, or None if missing or expired."""
+        if not self.enabled:
+            return None
+
+        entry = self._memory.get(key)
+        if entry is not None or self._disk is None:
+            return self._fresh(entry)
+
+        try:
+            entry = await asyncio.to_thread(self._disk.get, key)
+        except Exception as e:
+            logger.warning(f"Goal analysis cache disk lookup failed: {e}")
+            return None
+        if entry is not None:
+            self._memory.set(key, entry)
+        return self._fresh(entry)
+
+    async def set(self, key: str, analysis: str) -> None:
+        """Store a goal analysis in both tiers."""
+        if not self.enabled:
+            return
+
+        entry = {"analysis": analysis, "created_at": time.time()}
+        self._memory.set(key, entry)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, entry)
+            except Exception as e:
+                logger.warning(f"Goal analysis cache disk write failed: {e}")
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left intact)."""
+        self._memory.clear()
+
+
+# Global goal analysis cache instance
+goal_analysis_cache = GoalAnalysisCache(
+    max_entries=AstroConfig.GoalAnalysisConfig.GOAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=AstroConfig.GoalAnalysisConfig.GOAL_CACHE_TTL_DAYS * 86400,
+    disk_path=(
+        os.path.join(AstroConfig.AppSettings.CACHE_DIR, "goal_cache.sqlite3")
+        if AstroConfig.GoalAnalysisConfig.GOAL_CACHE_DISK_ENABLED else None
+    ),
+    enabled=AstroConfig.GoalAnalysisConfig.GOAL_CACHE_ENABLED,
+)
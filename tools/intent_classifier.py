@@ -0,0 +1,240 @@
+"""Local intent classifier for the router node ("analysis" vs "chat")"""
+
+import json
+import logging
+import os
+import re
+import threading
+import zlib
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import AstroConfig
+
+logger = logging.getLogger(__name__)
+
+ROUTES = ("chat", "analysis")
+
+SEED_DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "router_intents.jsonl")
+
+MODEL_VERSION = 1
+FEATURE_DIM = 1 << 12
+NGRAM_SIZES = (2, 3, 4)
+
+# Keywords that always routed to analysis on a fresh conversation (whatever the LLM said)
+ANALYSIS_KEYWORDS = ("analyze", "horoscope", "chart", "get my", "i want my", "i'd like")
+
+_DATE = re.compile(
+    r"\b\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4}\b|\b\d{4}-\d{2}-\d{2}\b"
+    r"|\b\d{1,2}(?:st|nd|rd|th)?\s+(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\b"
+    r"|\b(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\s+\d{1,2}(?:st|nd|rd|th)?\b"
+)
+_TIME = re.compile(r"\b\d{1,2}[:.]\d{2}\b|\b\d{1,2}\s*(?:am|pm)\b")
+_BORN = re.compile(r"\b(?:born|dob|birth)\b")
+_GREETING = re.compile(
+    r"^(?:hi+|hello|hey(?: there)?|namaste|namaskar|good (?:morning|afternoon|evening)"
+    r"|thanks?(?: you)?(?: so much)?|thank you|ok(?:ay)?|bye)\b[\s\W]*$"
+)
+_GENERAL_QUESTION = re.compile(r"^(?:what(?: is|'s| are| does)|who is|why|explain|tell me about|define)\b")
+_PERSONAL = re.compile(r"\b(?:my|i|i'm|i am|mine|myself)\b")
+
+
+class Intent(NamedTuple):
+    route: str
+    confidence: float
+    source: str  # "rule" or "model"
+
+
+def normalize_message(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _features(text: str) -> np.ndarray:
+    """Hashed character n-gram and word indexes (deduplicated)."""
+    padded = f" {text} "
+    grams = {padded[i:i + n] for n in NGRAM_SIZES for i in range(len(padded) - n + 1)}
+    grams.update(f"w:{word}" for word in text.split())
+    return np.fromiter({zlib.crc32(g.encode("utf-8")) % FEATURE_DIM for g in grams}, dtype=np.int64)
+
+
+class IntentModel:
+    """Binary logistic regression over hashed features (P(route == "analysis"))."""
+
+    def __init__(self, weights: np.ndarray, bias: float):
+        self.weights = weights
+        self.bias = bias
+
+    def predict_proba(self, text: str) -> float:
+        index = _features(text)
+        if not len(index):
+            return 1.0 / (1.0 + np.exp(-self.bias))
+        z = self.weights[index].sum() / np.sqrt(len(index)) + self.bias
+        return float(1.0 / (1.0 + np.exp(-z)))
+
+    @classmethod
+    def train(
+        cls,
+        examples: Sequence[Tuple[str, str]],
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 1e-4
+    ) -> "IntentModel":
+        """Full-batch gradient descent on (text, route) pairs."""
+        indexes = [_features(normalize_message(text)) for text, _ in examples]
+        labels = np.array([1.0 if route == "analysis" else 0.0 for _, route in examples])
+        scales = np.array([1.0 / np.sqrt(max(1, len(index))) for index in indexes])
+        rows = np.concatenate([np.full(len(index), i) for i, index in enumerate(indexes)])
+        cols = np.concatenate(indexes)
+
+        weights = np.zeros(FEATURE_DIM)
+        bias = 0.0
+        n = len(examples)
+        for _ in range(epochs):
+            z = np.bincount(rows, weights=weights[cols], minlength=n) * scales + bias
+            error = 1.0 / (1.0 + np.exp(-z)) - labels
+            gradient = np.zeros(FEATURE_DIM)
+            np.add.at(gradient, cols, (error * scales)[rows])
+            weights -= learning_rate * (gradient / n + l2 * weights)
+            bias -= learning_rate * error.mean()
+        return cls(weights, float(bias))
+
+    def to_json(self) -> dict:
+        return {
+            "version": MODEL_VERSION,
+            "feature_dim": FEATURE_DIM,
+            "ngram_sizes": list(NGRAM_SIZES),
+            "bias": self.bias,
+            "weights": [round(float(w), 6) for w in self.weights],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "IntentModel":
+        if data.get("version") != MODEL_VERSION or data.get("feature_dim") != FEATURE_DIM:
+            raise ValueError("router model was trained with different feature settings")
+        return cls(np.asarray(data["weights"], dtype=float), float(data["bias"]))
+
+
+def load_examples(paths: Iterable[str]) -> List[Tuple[str, str]]:
+    """(text, route) pairs from JSONL files with "text" and "route" fields (missing files are skipped)."""
+    examples = []
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if record.get("text") and record.get("route") in ROUTES:
+                    examples.append((record["text"], record["route"]))
+    return examples
+
+
+def match_rules(text: str) -> Optional[Intent]:
+    """Rule stage on a normalized message; None if no rule applies."""
+    if any(keyword in text for keyword in ANALYSIS_KEYWORDS):
+        return Intent("analysis", 1.0, "rule")
+    if _DATE.search(text) and (_TIME.search(text) or _BORN.search(text)):
+        return Intent("analysis", 0.98, "rule")
+    if _GREETING.match(text):
+        return Intent("chat", 0.98, "rule")
+    if _GENERAL_QUESTION.match(text) and not _PERSONAL.search(text):
+        return Intent("chat", 0.9, "rule")
+    return None
+
+
+class IntentClassifier:
+    """Rules first, then the n-gram model (loaded or trained on first use)."""
+
+    def __init__(self, model_path: Optional[str] = None, seed_path: str = SEED_DATA_PATH):
+        self.model_path = model_path
+        self.seed_path = seed_path
+        self._model: Optional[IntentModel] = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self) -> IntentModel:
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    self._model = self._load()
+        return self._model
+
+    def _load(self) -> IntentModel:
+        if self.model_path and os.path.exists(self.model_path):
+            try:
+                with open(self.model_path, encoding="utf-8") as f:
+                    model = IntentModel.from_json(json.load(f))
+                logger.info(f"Loaded router intent model from {self.model_path}")
+                return model
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load router intent model ({e}), training from seed examples")
+        return IntentModel.train(load_examples([self.seed_path]))
+
+    def classify(self, message: str) -> Intent:
+        text = normalize_message(message)
+        intent = match_rules(text)
+        if intent is not None:
+            return intent
+        p = self.model.predict_proba(text)
+        return Intent("analysis", p, "model") if p >= 0.5 else Intent("chat", 1.0 - p, "model")
+
+
+class RouterStats:
+    """Counts of routing decisions by source, with their total latency."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.decisions = {"rule": 0, "model": 0, "llm": 0}
+        self.seconds = {"rule": 0.0, "model": 0.0, "llm": 0.0}
+
+    def record(self, source: str, seconds: float) -> None:
+        with self._lock:
+            self.decisions[source] += 1
+            self.seconds[source] += seconds
+
+    @property
+    def llm_fallback_rate(self) -> float:
+        total = sum(self.decisions.values())
+        return self.decisions["llm"] / total if total else 0.0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "decisions": dict(self.decisions),
+                "mean_ms": {
+                    source: round(self.seconds[source] / count * 1000, 3) if count else 0.0
+                    for source, count in self.decisions.items()
+                },
+                "llm_fallback_rate": round(self.llm_fallback_rate, 4),
+            }
+
+
+_decision_log_lock = threading.Lock()
+
+
+def log_decision(path: str, message: str, route: str) -> None:
+    """Append an LLM routing decision as a training example."""
+    try:
+        with _decision_log_lock:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"text": message, "route": route}, ensure_ascii=False) + "\n")
+    except OSError as e:
+        logger.warning(f"Could not log router decision: {e}")
+
+
+def default_model_path() -> str:
+    return AstroConfig.RouterConfig.ROUTER_MODEL_PATH or os.path.join(
+        AstroConfig.AppSettings.CACHE_DIR, "router_model.json"
+    )
+
+
+def default_decision_log_path() -> str:
+    return os.path.join(AstroConfig.AppSettings.CACHE_DIR, "router_decisions.jsonl")
+
+
+# Global intent classifier and routing counters
+intent_classifier = IntentClassifier(model_path=default_model_path())
+router_stats = RouterStats()
@@ -0,0 +1,167 @@
+"""Deterministic place-name resolution: cache, offline gazetteer, geocode_cache table, then Nominatim"""
+
+import logging
+import math
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from tools.gazetteer import gazetteer, normalize_place
+from tools.geocode_cache import geocode_cache
+from tools.geocoding_tools import geocode_candidates, reverse_geocode
+
+logger = logging.getLogger(__name__)
+
+# Callback choosing among ambiguous candidates: (place, candidates) -> index, or None to keep the first
+Disambiguator = Callable[[str, Sequence[Dict[str, Any]]], Awaitable[Optional[int]]]
+
+# Candidates within this fraction of the top match's relevance count as equally relevant
+AMBIGUITY_IMPORTANCE_RATIO = 0.8
+# Equally relevant candidates closer than this are the same place
+AMBIGUITY_DISTANCE_KM = 50.0
+
+# Sources worth persisting in the geocode_cache table (gazetteer matches are free to repeat)
+PERSISTED_SOURCES = ("geocoder", "llm")
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great-circle distance in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * 6371.0 * math.asin(math.sqrt(a))
+
+
+def is_ambiguous(normalized: str, candidates: Sequence[Dict[str, Any]], weight: str = "importance") -> bool:
+    """Whether the top candidates are equally relevant, far apart and the query is unqualified.
+
+    Args:
+        normalized: Normalized query
+        candidates: Location data, most relevant first
+        weight: Relevance field ("importance" for the geocoder, "population" for the gazetteer)
+    """
+    if len(candidates) < 2 or "," in normalized:
+        return False
+    top, runner_up = candidates[0], candidates[1]
+    if runner_up.get(weight, 0.0) < AMBIGUITY_IMPORTANCE_RATIO * top.get(weight, 0.0):
+        return False
+    distance = haversine_km(top["latitude"], top["longitude"], runner_up["latitude"], runner_up["longitude"])
+    return distance > AMBIGUITY_DISTANCE_KM
+
+
+class LocationResolver:
+    """Memory cache -> gazetteer -> stored cache -> geocoder -> fuzzy gazetteer (-> LLM for ambiguous names)."""
+
+    def __init__(self, candidate_limit: int = 5):
+        self.candidate_limit = candidate_limit
+        self._lock = threading.Lock()
+        self.resolutions: Dict[str, int] = {}
+        self.seconds: Dict[str, float] = {}
+
+    def _record(self, source: str, started: float) -> None:
+        with self._lock:
+            self.resolutions[source] = self.resolutions.get(source, 0) + 1
+            self.seconds[source] = self.seconds.get(source, 0.0) + time.perf_counter() - started
+
+    async def resolve(self, place: str, disambiguate: Optional[Disambiguator] = None) -> Dict[str, Any]:
+        """Resolve a place name to location data.
+
+        Args:
+            place: Place of birth as entered (e.g., "Bangalore, India")
+            disambiguate: Optional callback for names with several equally likely matches
+
+        Returns:
+            Location data dictionary with "source", or a geocoder error dictionary
+        """
+        started = time.perf_counter()
+        normalized = normalize_place(place)
+        if not normalized:
+            return {"success": False, "error": "Place name is empty", "address": place}
+
+        key = geocode_cache.place_key(normalized)
+        cached = geocode_cache.get_memory(key)
+        if cached is not None:
+            self._record("cache", started)
+            return {**cached, "source": "cache"}
+
+        places = [match.to_location() for match in gazetteer.lookup(normalized)]
+        if places:
+            return await self._choose(place, normalized, places, "population", "gazetteer", disambiguate, started)
+
+        cached = await geocode_cache.get_stored(key)
+        if cached is not None:
+            self._record("cache", started)
+            return {**cached, "source": "cache"}
+
+        result = await geocode_candidates(place, limit=self.candidate_limit)
+        if result.get("success"):
+            return await self._choose(place, normalized, result["candidates"], "importance", "geocoder", disambiguate, started)
+
+        places = [match.to_location() for match in gazetteer.fuzzy(normalized)]
+        if places:
+            logger.info(f"Geocoding '{place}' failed, using fuzzy gazetteer match {places[0]['place_name']}")
+            return await self._finish(normalized, places[0], "fuzzy", started)
+        return result
+
+    async def _choose(
+        self,
+        place: str,
+        normalized: str,
+        candidates: List[Dict[str, Any]],
+        weight: str,
+        source: str,
+        disambiguate: Optional[Disambiguator],
+        started: float
+    ) -> Dict[str, Any]:
+        """The most relevant candidate, or the disambiguator's pick when the name is ambiguous."""
+        if disambiguate is not None and is_ambiguous(normalized, candidates, weight):
+            logger.info(f"Ambiguous place '{place}': {len(candidates)} candidates, asking for disambiguation")
+            try:
+                index = await disambiguate(place, candidates)
+            except Exception as e:
+                logger.warning(f"Place disambiguation failed, using the most relevant match: {e}")
+                index = None
+            if index is not None and 0 <= index < len(candidates):
+                return await self._finish(normalized, candidates[index], "llm", started)
+
+        return await self._finish(normalized, candidates[0], source, started)
+
+    async def _finish(self, normalized: str, location: Dict[str, Any], source: str, started: float) -> Dict[str, Any]:
+        key = geocode_cache.place_key(normalized)
+        if source in PERSISTED_SOURCES:
+            await geocode_cache.set(key, location)
+        else:
+            geocode_cache.remember(key, location)
+        self._record(source, started)
+        return {**location, "source": source}
+
+    async def resolve_coordinates(self, latitude: float, longitude: float) -> Dict[str, Any]:
+        """Location data for known coordinates (place details via reverse geocoding when available)."""
+        started = time.perf_counter()
+        key = geocode_cache.coordinates_key(latitude, longitude)
+        result = await geocode_cache.get(key)
+        if result is None:
+            result = await reverse_geocode(latitude, longitude)
+            if result.get("success"):
+                await geocode_cache.set(key, result)
+            else:
+                logger.warning(f"Reverse geocoding failed, keeping the given coordinates: {result.get('error')}")
+                result = {"success": True, "place_name": "", "city": "", "state": "", "country": ""}
+        self._record("coordinates", started)
+        return {**result, "latitude": float(latitude), "longitude": float(longitude), "source": "coordinates"}
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "resolutions": dict(self.resolutions),
+                "mean_ms": {
+                    source: round(self.seconds[source] / count * 1000, 3)
+                    for source, count in self.resolutions.items()
+                },
+                "cache": geocode_cache.stats(),
+            }
+
+
+# Global location resolver instance
+location_resolver = LocationResolver()
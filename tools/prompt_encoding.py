@@ -0,0 +1,213 @@
+"""Compact text encoding of chart and dasha data for LLM prompts"""
+
+import json
+import logging
+import random
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from config import AstroConfig
+from tools.chart_report import format_dms
+from tools.vedastro_tools import PLANET_NAMES
+
+logger = logging.getLogger(__name__)
+
+# Sections encode_chart() renders, in prompt order
+CHART_SECTIONS = ("lagna", "rashi", "planetary_positions", "house_positions", "shadbala", "divisional_charts")
+
+# Rough characters per token for Gemini on English/JSON text (for savings estimates only)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _degrees(value: Optional[float]) -> str:
+    # Whole minutes are enough for interpretation ("04° 33′")
+    return format_dms(value).rsplit(" ", 1)[0] if value is not None else "-"
+
+
+def encode_lagna(lagna: Mapping[str, Any], rashi: Optional[Mapping[str, Any]] = None) -> str:
+    """Lagna (and Moon sign) on one line each."""
+    lines = [f"Lagna: {lagna.get('sign', '-')} {_degrees(lagna.get('sign_degrees'))}, lord {lagna.get('lord', '-')}"]
+    if rashi:
+        lines.append(f"Rashi (Moon sign): {rashi.get('sign', '-')}, {rashi.get('nakshatra', '-')} pada {rashi.get('pada', '-')}")
+    return "\n".join(lines)
+
+
+def encode_planets(positions: Mapping[str, Any]) -> str:
+    """One line per planet: sign, degrees, nakshatra-pada, house, dignity."""
+    lines = ["Planets (planet | sign deg | nakshatra-pada | house | dignity):"]
+    for name in PLANET_NAMES:
+        planet = positions.get(name)
+        if not planet:
+            continue
+        dignity = (planet.get("dignities") or {}).get("dignity", "-")
+        lines.append(
+            f"{name} | {planet.get('sign', '-')} {_degrees(planet.get('sign_degrees'))} | "
+            f"{planet.get('nakshatra', '-')}-{planet.get('pada', '-')} | H{planet.get('house', '-')} | {dignity}"
+        )
+    return "\n".join(lines)
+
+
+def encode_houses(houses: Iterable[Mapping[str, Any]]) -> str:
+    """One line per house: sign and occupants (whole-sign houses)."""
+    lines = ["Houses (house | sign | occupants):"]
+    for house in houses:
+        occupants = ", ".join(house.get("occupants") or []) or "-"
+        lines.append(f"H{house.get('house')} | {house.get('sign', '-')} | {occupants}")
+    return "\n".join(lines)
+
+
+def encode_shadbala(shadbala: Mapping[str, Any]) -> str:
+    """Shadbala in rupas on one line, plus any non-zero component scores."""
+    rupas, components = [], []
+    for name, values in shadbala.items():
+        if not isinstance(values, Mapping) or values.get("rupas") is None:
+            continue
+        rupas.append(f"{name} {values['rupas']:.2f}")
+        parts = [f"{key} {value:g}" for key, value in values.items() if key not in ("total", "rupas") and value]
+        if parts:
+            components.append(f"{name}: {', '.join(parts)}")
+    if not rupas:
+        return ""
+    lines = [f"Shadbala (rupas): {', '.join(rupas)}"]
+    if components:
+        lines.append("Shadbala components (virupas): " + "; ".join(components))
+    return "\n".join(lines)
+
+
+def encode_divisional_charts(charts: Mapping[str, Any]) -> str:
+    """One line per varga: ascendant sign, then each planet's sign and house."""
+    lines = ["Divisional charts (varga: Asc sign; planet sign/house):"]
+    for key, chart in charts.items():
+        if not isinstance(chart, Mapping) or "planets" not in chart:
+            continue
+        planets = chart.get("planets") or {}
+        placements = ", ".join(
+            f"{name} {planets[name].get('sign', '-')}/{planets[name].get('house', '-')}"
+            for name in PLANET_NAMES if name in planets
+        )
+        ascendant = (chart.get("ascendant") or {}).get("sign", "-")
+        lines.append(f"{key.upper()} {chart.get('name', '')}: Asc {ascendant}; {placements}")
+    return "\n".join(lines) if len(lines) > 1 else ""
+
+
+def encode_chart(chart_data: Mapping[str, Any], sections: Iterable[str] = CHART_SECTIONS) -> str:
+    """Chart data as compact text, limited to the given sections."""
+    sections = set(sections)
+    blocks = []
+    if "lagna" in sections and chart_data.get("lagna"):
+        blocks.append(encode_lagna(chart_data["lagna"], chart_data.get("rashi") if "rashi" in sections else None))
+    if "planetary_positions" in sections and chart_data.get("planetary_positions"):
+        blocks.append(encode_planets(chart_data["planetary_positions"]))
+    if "house_positions" in sections and chart_data.get("house_positions"):
+        blocks.append(encode_houses(chart_data["house_positions"]))
+    if "shadbala" in sections and chart_data.get("shadbala"):
+        blocks.append(encode_shadbala(chart_data["shadbala"]))
+    if "divisional_charts" in sections and chart_data.get("divisional_charts"):
+        blocks.append(encode_divisional_charts(chart_data["divisional_charts"]))
+    return "\n\n".join(block for block in blocks if block)
+
+
+def _date(value: Any) -> str:
+    if isinstance(value, datetime):
+        return f"{value:%Y-%m-%d}"
+    return str(value)[:10] if value else "-"
+
+
+def _period(period: Optional[Mapping[str, Any]]) -> str:
+    if not period:
+        return "-"
+    return f"{period.get('planet', '-')} {_date(period.get('start'))}..{_date(period.get('end'))}"
+
+
+def encode_dasha(dasha_info: Mapping[str, Any]) -> str:
+    """Dasha dict (DashaTimeline.to_dict or the chart's mahadasha summary) as compact text."""
+    lines = []
+    if dasha_info.get("system"):
+        balance = dasha_info.get("balance_at_birth") or {}
+        lines.append(
+            f"System: {dasha_info['system']}; birth nakshatra {dasha_info.get('birth_nakshatra', '-')}; "
+            f"balance at birth {balance.get('planet', '-')} {balance.get('years', '-')} y"
+        )
+    if dasha_info.get("reference_date"):
+        lines.append(f"Reference date: {dasha_info['reference_date']}")
+    for key, label in (
+        ("current_dasha", "Mahadasha"),
+        ("current_antardasha", "Antardasha"),
+        ("current_pratyantardasha", "Pratyantardasha"),
+    ):
+        if key in dasha_info:
+            lines.append(f"Current {label}: {_period(dasha_info[key])}")
+    if dasha_info.get("upcoming_dashas"):
+        lines.append("Upcoming Mahadashas: " + ", ".join(_period(p) for p in dasha_info["upcoming_dashas"]))
+    if dasha_info.get("upcoming_antardashas"):
+        lines.append("Upcoming Antardashas (MD-AD start..end): " + ", ".join(
+            f"{p.get('mahadasha', '-')}-{_period(p)}" for p in dasha_info["upcoming_antardashas"]
+        ))
+    return "\n".join(lines)
+
+
+class PromptCompactionStats:
+    """Per-node prompt build counts and estimated tokens of the measured builds, before and after compaction."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._nodes: Dict[str, Dict[str, int]] = {}
+
+    def _totals(self, node: str) -> Dict[str, int]:
+        return self._nodes.setdefault(node, {"calls": 0, "measured": 0, "verbose_tokens": 0, "compact_tokens": 0})
+
+    def count(self, node: str) -> None:
+        with self._lock:
+            self._totals(node)["calls"] += 1
+
+    def record(self, node: str, verbose_tokens: int, compact_tokens: int) -> None:
+        with self._lock:
+            totals = self._totals(node)
+            totals["measured"] += 1
+            totals["verbose_tokens"] += verbose_tokens
+            totals["compact_tokens"] += compact_tokens
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {
+                node: {**totals, "tokens_saved": totals["verbose_tokens"] - totals["compact_tokens"]}
+                for node, totals in sorted(self._nodes.items())
+            }
+
+
+# Global prompt compaction counters
+prompt_compaction_stats = PromptCompactionStats()
+
+
+def report_compaction(
+    node: str,
+    compact: str,
+    verbose_payload: Any,
+    sample_rate: Optional[float] = None
+) -> Optional[int]:
+    """Record tokens saved versus the indented-JSON form of the same payload.
+
+    Serializing the verbose form costs about as much as the prompt build
+    itself, so only a sample of calls (PROMPT_COMPACTION_SAMPLE_RATE) is
+    measured, or every call when DEBUG logging is on.
+
+    Returns:
+        Estimated tokens saved for this call, or None if it was not measured
+    """
+    prompt_compaction_stats.count(node)
+    if sample_rate is None:
+        sample_rate = AstroConfig.PromptEncodingConfig.PROMPT_COMPACTION_SAMPLE_RATE
+    if not logger.isEnabledFor(logging.DEBUG) and random.random() >= sample_rate:
+        return None
+
+    verbose_tokens = estimate_tokens(json.dumps(verbose_payload, indent=2, default=str))
+    compact_tokens = estimate_tokens(compact)
+    prompt_compaction_stats.record(node, verbose_tokens, compact_tokens)
+    saved = verbose_tokens - compact_tokens
+    logger.debug(f"Prompt compaction ({node}): ~{verbose_tokens} -> ~{compact_tokens} tokens (~{saved} saved)")
+    return saved
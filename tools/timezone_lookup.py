@@ -0,0 +1,202 @@
+"""Timezone lookup from coordinates (grid index + TimezoneFinder) and historical UTC offsets"""
+
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+
+from config import AstroConfig
+from tools.gazetteer import gazetteer
+
+logger = logging.getLogger(__name__)
+
+# Grid built by scripts/build_timezone_grid.py and shipped with the code
+BUNDLED_GRID_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "timezone_grid.npy")
+
+# Grid cell values: zone index, with BOUNDARY_FLAG set when the cell straddles zones
+BOUNDARY_FLAG = 0x8000
+NO_ZONE = 0x7FFF
+
+# Sources precise enough to read a birth time in (the others are approximations)
+CHART_TIMEZONE_SOURCES = ("grid", "timezonefinder")
+
+# Nearest-place fallback radius (without grid or timezonefinder)
+NEAREST_PLACE_MAX_KM = 300.0
+
+# Last-resort regions: (min_lat, max_lat, min_lon, max_lon, zone)
+_FALLBACK_BOXES = (
+    (6.0, 37.0, 68.0, 97.0, "Asia/Kolkata"),  # India and nearby regions
+    (24.0, 50.0, -85.0, -66.0, "America/New_York"),  # USA - Eastern
+    (24.0, 50.0, -102.0, -85.0, "America/Chicago"),  # USA - Central
+    (24.0, 50.0, -115.0, -102.0, "America/Denver"),  # USA - Mountain
+    (24.0, 50.0, -125.0, -115.0, "America/Los_Angeles"),  # USA - Pacific
+    (49.0, 61.0, -8.0, 2.0, "Europe/London"),  # UK
+    (35.0, 55.0, 5.0, 25.0, "Europe/Berlin"),  # Europe - Central
+    (-45.0, -10.0, 113.0, 154.0, "Australia/Sydney"),  # Australia - Sydney
+)
+
+
+def grid_metadata_path(grid_path: str) -> str:
+    """Zone names and resolution stored next to the grid (.npy -> .json)."""
+    return os.path.splitext(grid_path)[0] + ".json"
+
+
+class TimezoneLookup:
+    """Grid index + shared TimezoneFinder, both loaded once on first use."""
+
+    def __init__(self, grid_path: Optional[str] = None, precision: int = 4, memo_size: int = 4096):
+        self.grid_path = grid_path
+        self.precision = precision
+        self._lock = threading.Lock()
+        self._grid_loaded = False
+        self._grid: Optional[np.ndarray] = None
+        self._zones: List[str] = []
+        self._resolution = 0.0
+        self._finder: Any = None
+        self._finder_loaded = False
+        self._sources: Dict[str, int] = {}
+        self._lookup = lru_cache(maxsize=memo_size)(self._resolve)
+
+    def _load_grid(self) -> None:
+        with self._lock:
+            if self._grid_loaded:
+                return
+            self._grid_loaded = True
+            if not self.grid_path or not os.path.exists(self.grid_path):
+                return
+            try:
+                with open(grid_metadata_path(self.grid_path), encoding="utf-8") as f:
+                    metadata = json.load(f)
+                self._grid = np.load(self.grid_path, mmap_mode="r")
+                self._zones = metadata["zones"]
+                self._resolution = float(metadata["resolution"])
+                logger.info(f"Timezone grid loaded: {self._grid.shape} cells of {self._resolution}°, {len(self._zones)} zones")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning(f"Could not load timezone grid {self.grid_path}: {e}")
+                self._grid = None
+
+    def _get_finder(self) -> Any:
+        """The shared TimezoneFinder, or None if timezonefinder is not installed."""
+        if not self._finder_loaded:
+            with self._lock:
+                if not self._finder_loaded:
+                    try:
+                        from timezonefinder import TimezoneFinder
+                        self._finder = TimezoneFinder()
+                    except ImportError:
+                        logger.debug("timezonefinder not available, using grid/gazetteer timezone lookup")
+                    except Exception as e:
+                        logger.warning(f"Could not create TimezoneFinder: {e}")
+                    self._finder_loaded = True
+        return self._finder
+
+    def warm(self) -> None:
+        """Load the grid and the TimezoneFinder ahead of the first lookup."""
+        self._load_grid()
+        self._get_finder()
+
+    def _grid_cell(self, latitude: float, longitude: float) -> Optional[int]:
+        if not self._grid_loaded:
+            self._load_grid()
+        if self._grid is None:
+            return None
+        rows, cols = self._grid.shape
+        row = min(int((latitude + 90.0) / self._resolution), rows - 1)
+        col = min(int((longitude + 180.0) / self._resolution), cols - 1)
+        return int(self._grid[row, col])
+
+    def _resolve(self, latitude: float, longitude: float) -> Tuple[str, str]:
+        """(zone, source) for rounded coordinates."""
+        cell = self._grid_cell(latitude, longitude)
+        if cell is not None and not cell & BOUNDARY_FLAG and cell != NO_ZONE:
+            return self._zones[cell], "grid"
+
+        finder = self._get_finder()
+        if finder is not None:
+            try:
+                zone = finder.timezone_at(lat=latitude, lng=longitude)
+                if zone:
+                    return zone, "timezonefinder"
+            except Exception as e:
+                logger.warning(f"Error using timezonefinder: {e}, falling back to simple lookup")
+
+        if cell is not None and cell & ~BOUNDARY_FLAG != NO_ZONE:
+            return self._zones[cell & ~BOUNDARY_FLAG], "grid_boundary"
+
+        place = gazetteer.nearest(latitude, longitude, NEAREST_PLACE_MAX_KM)
+        if place is not None and place.timezone:
+            return place.timezone, "gazetteer"
+
+        for min_lat, max_lat, min_lon, max_lon, zone in _FALLBACK_BOXES:
+            if min_lat <= latitude <= max_lat and min_lon <= longitude <= max_lon:
+                return zone, "region"
+
+        logger.warning(f"Unknown timezone for coordinates {latitude}, {longitude}, defaulting to UTC")
+        return "UTC", "default"
+
+    def lookup(self, latitude: float, longitude: float) -> Tuple[str, str]:
+        """(IANA timezone, source) for coordinates.
+
+        Source is "grid" or "timezonefinder" (precise), or "grid_boundary",
+        "gazetteer", "region" or "default" (approximate).
+        """
+        zone, source = self._lookup(round(float(latitude), self.precision), round(float(longitude), self.precision))
+        self._sources[source] = self._sources.get(source, 0) + 1
+        return zone, source
+
+    def timezone_at(self, latitude: float, longitude: float) -> str:
+        """IANA timezone for coordinates (e.g., "Asia/Kolkata")."""
+        return self.lookup(latitude, longitude)[0]
+
+    def chart_timezone(self, latitude: float, longitude: float) -> Optional[str]:
+        """Timezone to read a birth time in, or None when only an approximate one is known."""
+        zone, source = self.lookup(latitude, longitude)
+        if source in CHART_TIMEZONE_SOURCES:
+            return zone
+        logger.warning(
+            f"Timezone for ({latitude}, {longitude}) is only approximate ({zone} from {source}), "
+            f"reading the birth time as IST"
+        )
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        info = self._lookup.cache_info()
+        return {
+            "grid": None if self._grid is None else {"shape": list(self._grid.shape), "resolution": self._resolution},
+            "timezonefinder": self._finder is not None,
+            "sources": dict(self._sources),
+            "memo": {"entries": info.currsize, "hits": info.hits, "misses": info.misses},
+        }
+
+
+@lru_cache(maxsize=256)
+def get_zone(name: str) -> ZoneInfo:
+    """Cached ZoneInfo (raises ZoneInfoNotFoundError for unknown names)."""
+    return ZoneInfo(name)
+
+
+def utc_offset_hours(timezone: str, local_datetime: datetime) -> float:
+    """UTC offset in hours of an IANA zone at a naive local date and time (historical rules included).
+
+    Raises:
+        ValueError: If the timezone is unknown
+    """
+    try:
+        zone = get_zone(timezone)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {timezone}") from e
+    return local_datetime.replace(tzinfo=zone).utcoffset().total_seconds() / 3600.0
+
+
+def default_grid_path() -> str:
+    return AstroConfig.LocationConfig.TIMEZONE_GRID_PATH or BUNDLED_GRID_PATH
+
+
+# Global timezone lookup instance
+timezone_lookup = TimezoneLookup(grid_path=default_grid_path())
@@ -0,0 +1,479 @@
+"""Gochara (transit) ingress table and daily ephemeris grid for the grahas"""
+
+import logging
+import os
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from config import AstroConfig
+from tools.vedastro_tools import PLANET_NAMES, ZODIAC_SIGNS
+
+logger = logging.getLogger(__name__)
+
+# Planets tracked by the table (index = planet code stored in the table)
+TRANSIT_PLANETS = ["Jupiter", "Saturn", "Rahu", "Ketu"]
+
+TRANSIT_TABLE_VERSION = 1
+
+EPHEMERIS_GRID_DTYPE = np.dtype([
+    ("day", np.float64),  # days since 1970-01-01 UTC (midnight)
+    ("longitudes", np.float32, (len(PLANET_NAMES),)),
+])
+
+TRANSIT_DTYPE = np.dtype([
+    ("planet", np.int8),
+    ("sign", np.int8),
+    ("start", np.float64),  # days since 1970-01-01 UTC
+    ("end", np.float64),
+])
+
+# IST offset used when rendering dates (all user-facing times in the app are IST)
+_IST_OFFSET_DAYS = 5.5 / 24.0
+_UNIX_EPOCH_JD = 2440587.5
+_EPOCH = datetime(1970, 1, 1)
+# Bisection steps: 1 day / 2**12 ~= 21 seconds
+_BISECTION_STEPS = 12
+
+DateLike = Union[datetime, date, str]
+
+
+def _to_days(when: DateLike) -> float:
+    """Convert a datetime/date/ISO string (IST) to days since the epoch in UTC."""
+    if isinstance(when, str):
+        when = datetime.fromisoformat(when)
+    elif not isinstance(when, datetime):
+        when = datetime(when.year, when.month, when.day)
+    return (when - _EPOCH).total_seconds() / 86400.0 - _IST_OFFSET_DAYS
+
+
+def _to_ist_datetime(days: float) -> datetime:
+    """Convert days since the epoch (UTC) to a naive IST datetime."""
+    return _EPOCH + timedelta(days=float(days) + _IST_OFFSET_DAYS)
+
+
+def _format_date(dt: datetime) -> str:
+    return f"{dt:%B} {dt.day}, {dt.year}"
+
+
+# ---------------------------------------------------------------------------
+# Table construction (runs in a chart engine worker)
+# ---------------------------------------------------------------------------
+
+# Ephemeris targets per planet (same bodies jyotishganit observes)
+_EPHEMERIS_BODIES = {
+    "Sun": "sun",
+    "Moon": "moon",
+    "Mars": "mars",
+    "Mercury": "mercury",
+    "Jupiter": "jupiter barycenter",
+    "Venus": "venus",
+    "Saturn": "saturn barycenter",
+}
+
+
+class _SiderealLongitudes:
+    """Vectorized sidereal longitudes of the planets, matching jyotishganit.
+
+    Rahu and Ketu are always included; `planets` selects the bodies observed
+    from the ephemeris (default: the slow transit planets).
+    """
+
+    def __init__(self, planets: Sequence[str] = ("Jupiter", "Saturn")):
+        from jyotishganit.core.astronomical import get_ephemeris, get_timescale, _get_spica
+
+        self.ts = get_timescale()
+        self.eph = get_ephemeris()
+        self.earth = self.eph["earth"]
+        self.spica = _get_spica()
+        self.bodies = {name: self.eph[_EPHEMERIS_BODIES[name]] for name in planets if name in _EPHEMERIS_BODIES}
+
+    def ephemeris_span_days(self) -> tuple:
+        """First and last day (since the epoch) covered by every ephemeris segment."""
+        start_jd = max(s.spk_segment.start_jd for s in self.eph.segments)
+        end_jd = min(s.spk_segment.end_jd for s in self.eph.segments)
+        return start_jd - _UNIX_EPOCH_JD, end_jd - _UNIX_EPOCH_JD
+
+    def __call__(self, days: np.ndarray) -> Dict[str, np.ndarray]:
+        t = self.ts.utc(1970, 1, 1 + days)
+
+        # True Chitra Paksha: Spica's apparent longitude minus 180 degrees
+        _, spica_lon, _ = self.earth.at(t).observe(self.spica).apparent().ecliptic_latlon()
+        ayanamsa = (spica_lon.degrees - 180.0) % 360.0
+
+        longitudes = {}
+        for name, body in self.bodies.items():
+            _, lon, _ = self.earth.at(t).observe(body).apparent().ecliptic_latlon()
+            longitudes[name] = (lon.degrees - ayanamsa) % 360.0
+
+        # Mean lunar node
+        T = (t.tt - 2451545.0) / 36525.0
+        rahu = ((125.04452 - 1934.136261 * T) % 360.0 - ayanamsa) % 360.0
+        longitudes["Rahu"] = rahu
+        longitudes["Ketu"] = (rahu + 180.0) % 360.0
+        return longitudes
+
+
+def _refine_ingresses(positions: _SiderealLongitudes, planet: str, lo: np.ndarray, hi: np.ndarray, lo_signs: np.ndarray) -> np.ndarray:
+    """Bisect every [lo, hi] bracket (all at once) down to the sign-change instant."""
+    for _ in range(_BISECTION_STEPS):
+        mid = (lo + hi) / 2.0
+        mid_signs = (positions(mid)[planet] // 30).astype(np.int8)
+        same = mid_signs == lo_signs
+        lo = np.where(same, mid, lo)
+        hi = np.where(same, hi, mid)
+    return hi
+
+
+def compute_transit_table(start_year: int, end_year: int) -> np.ndarray:
+    """Compute all sign ingresses of the transit planets between two years.
+
+    The span is clipped to the loaded ephemeris (de421 covers 1899-07-29 to 2053-10-09).
+
+    Returns:
+        Structured array with TRANSIT_DTYPE, sorted by planet then start
+    """
+    positions = _SiderealLongitudes()
+    eph_start, eph_end = positions.ephemeris_span_days()
+    span_start = max((datetime(start_year, 1, 1) - _EPOCH).days, int(np.ceil(eph_start)) + 1)
+    span_end = min((datetime(end_year + 1, 1, 1) - _EPOCH).days, int(np.floor(eph_end)) - 1)
+    if span_end <= span_start:
+        raise ValueError(f"Transit span {start_year}-{end_year} is outside the ephemeris range")
+
+    days = np.arange(span_start, span_end + 1, dtype=np.float64)
+    daily = positions(days)
+
+    rows = []
+    for code, planet in enumerate(TRANSIT_PLANETS):
+        signs = (daily[planet] // 30).astype(np.int8)
+        change = np.nonzero(signs[1:] != signs[:-1])[0]
+        ingresses = _refine_ingresses(positions, planet, days[change], days[change + 1], signs[change])
+
+        starts = np.concatenate(([days[0]], ingresses))
+        ends = np.concatenate((ingresses, [days[-1]]))
+        planet_rows = np.empty(len(starts), dtype=TRANSIT_DTYPE)
+        planet_rows["planet"] = code
+        planet_rows["sign"] = np.concatenate(([signs[0]], signs[change + 1]))
+        planet_rows["start"] = starts
+        planet_rows["end"] = ends
+        rows.append(planet_rows)
+
+    return np.concatenate(rows)
+
+
+def transit_table_path(start_year: Optional[int] = None, end_year: Optional[int] = None) -> str:
+    """Location of the .npy table for a span."""
+    start_year = start_year or AstroConfig.TransitConfig.TRANSIT_START_YEAR
+    end_year = end_year or AstroConfig.TransitConfig.TRANSIT_END_YEAR
+    return os.path.join(
+        AstroConfig.AppSettings.CACHE_DIR,
+        f"transit_ingress_v{TRANSIT_TABLE_VERSION}_{start_year}_{end_year}.npy"
+    )
+
+
+def build_transit_table_file(start_year: Optional[int] = None, end_year: Optional[int] = None) -> str:
+    """Compute the table and save it (no-op if it already exists). Returns the path."""
+    start_year = start_year or AstroConfig.TransitConfig.TRANSIT_START_YEAR
+    end_year = end_year or AstroConfig.TransitConfig.TRANSIT_END_YEAR
+    path = transit_table_path(start_year, end_year)
+    if os.path.exists(path):
+        return path
+
+    table = compute_transit_table(start_year, end_year)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    # Write to a temp file and rename so readers never see a partial table
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, table)
+    os.replace(tmp_path, path)
+    logger.info(f"Transit table built: {len(table)} intervals ({start_year}-{end_year}) -> {path}")
+    return path
+
+
+def compute_ephemeris_grid(start_year: int, end_year: int) -> np.ndarray:
+    """Sample the sidereal longitudes of all nine grahas once a day.
+
+    The span is clipped to the loaded ephemeris like compute_transit_table().
+
+    Returns:
+        Structured array with EPHEMERIS_GRID_DTYPE: one row per UTC midnight,
+        longitudes in PLANET_NAMES order
+    """
+    positions = _SiderealLongitudes(PLANET_NAMES)
+    eph_start, eph_end = positions.ephemeris_span_days()
+    span_start = max((datetime(start_year, 1, 1) - _EPOCH).days, int(np.ceil(eph_start)) + 1)
+    span_end = min((datetime(end_year + 1, 1, 1) - _EPOCH).days, int(np.floor(eph_end)) - 1)
+    if span_end <= span_start:
+        raise ValueError(f"Ephemeris grid span {start_year}-{end_year} is outside the ephemeris range")
+
+    days = np.arange(span_start, span_end + 1, dtype=np.float64)
+    longitudes = positions(days)
+
+    grid = np.empty(len(days), dtype=EPHEMERIS_GRID_DTYPE)
+    grid["day"] = days
+    grid["longitudes"] = np.column_stack([longitudes[name] for name in PLANET_NAMES])
+    return grid
+
+
+def ephemeris_grid_path(start_year: Optional[int] = None, end_year: Optional[int] = None) -> str:
+    """Location of the .npy ephemeris grid for a span."""
+    start_year = start_year or AstroConfig.TransitConfig.TRANSIT_START_YEAR
+    end_year = end_year or AstroConfig.TransitConfig.TRANSIT_END_YEAR
+    return os.path.join(
+        AstroConfig.AppSettings.CACHE_DIR,
+        f"ephemeris_grid_v{TRANSIT_TABLE_VERSION}_{start_year}_{end_year}.npy"
+    )
+
+
+def build_ephemeris_grid_file(start_year: Optional[int] = None, end_year: Optional[int] = None) -> str:
+    """Compute the daily grid and save it (no-op if it already exists). Returns the path."""
+    start_year = start_year or AstroConfig.TransitConfig.TRANSIT_START_YEAR
+    end_year = end_year or AstroConfig.TransitConfig.TRANSIT_END_YEAR
+    path = ephemeris_grid_path(start_year, end_year)
+    if os.path.exists(path):
+        return path
+
+    grid = compute_ephemeris_grid(start_year, end_year)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(tmp_path, grid)
+    os.replace(tmp_path, path)
+    logger.info(f"Ephemeris grid built: {len(grid)} days ({start_year}-{end_year}) -> {path}")
+    return path
+
+
+# ---------------------------------------------------------------------------
+# Lookup
+# ---------------------------------------------------------------------------
+
+class TransitTable:
+    """Read-only interval index over the memory-mapped ingress table.
+
+    One row per sidereal sign ingress of Jupiter, Saturn, Rahu and Ketu
+    (planet, sign, start, end), sampled daily from the JPL ephemeris
+    jyotishganit uses (True Chitra Paksha ayanamsa, mean nodes) and refined by
+    bisection to ~20 seconds. Rows are sorted by planet and start, so "where is
+    Saturn on date D" is a searchsorted. The table is built once in a chart
+    engine worker at startup and saved as .npy under CACHE_DIR.
+    """
+
+    __slots__ = ("table", "_slices")
+
+    def __init__(self, table: np.ndarray):
+        self.table = table
+        planets = table["planet"]
+        self._slices = {
+            name: (int(np.searchsorted(planets, code, "left")), int(np.searchsorted(planets, code, "right")))
+            for code, name in enumerate(TRANSIT_PLANETS)
+        }
+
+    @classmethod
+    def load(cls, path: str) -> "TransitTable":
+        return cls(np.load(path, mmap_mode="r"))
+
+    def _rows(self, planet: str) -> np.ndarray:
+        if planet not in self._slices:
+            raise ValueError(f"Unknown transit planet: {planet}. Expected one of {TRANSIT_PLANETS}")
+        lo, hi = self._slices[planet]
+        return self.table[lo:hi]
+
+    def sign_at(self, planet: str, when: DateLike) -> Optional[str]:
+        """Sidereal sign of a planet at a date (IST), or None outside the table span."""
+        signs = self.signs_at(planet, [when])
+        return signs[0]
+
+    def signs_at(self, planet: str, whens: Sequence[DateLike]) -> List[Optional[str]]:
+        """Vectorized sign lookup for many dates."""
+        rows = self._rows(planet)
+        days = np.fromiter((_to_days(w) for w in whens), dtype=np.float64)
+        idx = np.searchsorted(rows["start"], days, side="right") - 1
+        valid = (idx >= 0) & (days < rows["end"][np.clip(idx, 0, len(rows) - 1)])
+        return [ZODIAC_SIGNS[rows["sign"][i]] if ok else None for i, ok in zip(idx, valid)]
+
+    def transits_between(self, planet: str, start: DateLike, end: DateLike) -> List[Dict[str, Any]]:
+        """All sign periods of a planet overlapping [start, end), in order."""
+        rows = self._rows(planet)
+        start_days, end_days = _to_days(start), _to_days(end)
+        lo = max(int(np.searchsorted(rows["start"], start_days, side="right")) - 1, 0)
+        hi = int(np.searchsorted(rows["start"], end_days, side="left"))
+        return [
+            {
+                "planet": planet,
+                "sign": ZODIAC_SIGNS[int(row["sign"])],
+                "start": _to_ist_datetime(row["start"]),
+                "end": _to_ist_datetime(row["end"]),
+            }
+            for row in rows[lo:hi]
+        ]
+
+    @property
+    def span(self) -> tuple:
+        """(first, last) datetime covered by the table (IST)."""
+        return _to_ist_datetime(self.table["start"].min()), _to_ist_datetime(self.table["end"].max())
+
+
+class EphemerisGrid:
+    """Daily sidereal longitudes of all grahas with linear interpolation in between.
+
+    Saved by the same startup step as the ingress table; the transit-to-natal
+    event engine (tools/transit_events.py) reads it instead of skyfield.
+    Interpolation works on the shortest arc between samples, so the 360 -> 0
+    wrap and retrograde stations are handled. With one sample per day the
+    error is well under 0.1 degree even for the Moon.
+    """
+
+    __slots__ = ("days", "longitudes")
+
+    def __init__(self, grid: np.ndarray):
+        self.days = grid["day"]
+        self.longitudes = grid["longitudes"]
+
+    @classmethod
+    def load(cls, path: str) -> "EphemerisGrid":
+        return cls(np.load(path, mmap_mode="r"))
+
+    @property
+    def span(self) -> tuple:
+        """(first, last) datetime covered by the grid (IST)."""
+        return _to_ist_datetime(self.days[0]), _to_ist_datetime(self.days[-1])
+
+    def positions(self, days: np.ndarray) -> np.ndarray:
+        """Sidereal longitudes at many instants.
+
+        Args:
+            days: Float days since 1970-01-01 UTC (see days_from_dates)
+
+        Returns:
+            float array of shape (n, 9), columns in PLANET_NAMES order
+
+        Raises:
+            ValueError: If any instant is outside the grid span
+        """
+        days = np.asarray(days, dtype=np.float64)
+        first, last = float(self.days[0]), float(self.days[-1])
+        if days.size and (days.min() < first or days.max() > last):
+            start, end = self.span
+            raise ValueError(f"Transit dates must be between {start:%Y-%m-%d} and {end:%Y-%m-%d}")
+
+        # Rows are consecutive days, so the bracketing row is a direct index
+        x = days - first
+        i = np.clip(np.floor(x).astype(np.int64), 0, len(self.days) - 2)
+        frac = (x - i)[:, None]
+        lon0 = self.longitudes[i].astype(np.float64)
+        lon1 = self.longitudes[i + 1].astype(np.float64)
+        delta = (lon1 - lon0 + 180.0) % 360.0 - 180.0
+        return (lon0 + frac * delta) % 360.0
+
+
+def days_from_dates(whens: Any) -> np.ndarray:
+    """Convert IST datetimes/dates/ISO strings (or a datetime64 array) to UTC days since the epoch."""
+    if isinstance(whens, np.ndarray) and np.issubdtype(whens.dtype, np.datetime64):
+        ist_days = (whens - np.datetime64("1970-01-01")).astype("timedelta64[us]").astype(np.float64) / 86400e6
+        return ist_days - _IST_OFFSET_DAYS
+    if isinstance(whens, (datetime, date, str)):
+        whens = [whens]
+    return np.fromiter((_to_days(w) for w in whens), dtype=np.float64)
+
+
+_transit_table: Optional[TransitTable] = None
+_ephemeris_grid: Optional[EphemerisGrid] = None
+
+
+def get_transit_table() -> Optional[TransitTable]:
+    """Return the loaded table, memory-mapping it from disk if it has been built."""
+    global _transit_table
+    if _transit_table is None:
+        path = transit_table_path()
+        if os.path.exists(path):
+            _transit_table = TransitTable.load(path)
+    return _transit_table
+
+
+def get_ephemeris_grid() -> Optional[EphemerisGrid]:
+    """Return the loaded ephemeris grid, memory-mapping it from disk if it has been built."""
+    global _ephemeris_grid
+    if _ephemeris_grid is None:
+        path = ephemeris_grid_path()
+        if os.path.exists(path):
+            _ephemeris_grid = EphemerisGrid.load(path)
+    return _ephemeris_grid
+
+
+async def prepare_transit_table() -> Optional[TransitTable]:
+    """Build the ingress table and ephemeris grid in a chart engine worker if needed, then load them."""
+    from tools.chart_engine import chart_engine
+
+    if get_ephemeris_grid() is None:
+        try:
+            await chart_engine.run(build_ephemeris_grid_file)
+            get_ephemeris_grid()
+        except Exception as e:
+            logger.error(f"Failed to build ephemeris grid: {e}", exc_info=True)
+
+    if get_transit_table() is None:
+        try:
+            await chart_engine.run(build_transit_table_file)
+        except Exception as e:
+            logger.error(f"Failed to build transit table: {e}", exc_info=True)
+            return None
+    # Drop any static-fallback (None) renders cached before the table existed
+    _build_gochara_transits.cache_clear()
+    return get_transit_table()
+
+
+# ---------------------------------------------------------------------------
+# Prompt context
+# ---------------------------------------------------------------------------
+
+def _format_planet_transits(table: TransitTable, planet: str, start: DateLike, end: DateLike) -> str:
+    periods = table.transits_between(planet, start, end)
+    start_dt = datetime.fromisoformat(start) if isinstance(start, str) else start
+    lines = [f"{planet} Gochara (Transits):"]
+    for period in periods:
+        if period["start"] <= start_dt:
+            lines.append(f"- {period['sign']}: Till {_format_date(period['end'])}")
+        else:
+            lines.append(
+                f"- {period['sign']}: From {_format_date(period['start'])} "
+                f"to {_format_date(period['end'])}"
+            )
+    return "\n".join(lines)
+
+
+@lru_cache(maxsize=64)
+def _build_gochara_transits(start_iso: str, end_iso: str, planets: tuple) -> Optional[str]:
+    table = get_transit_table()
+    if table is None:
+        return None
+    return "\n\n".join(_format_planet_transits(table, planet, start_iso, end_iso) for planet in planets)
+
+
+def build_gochara_transits(
+    start: Optional[DateLike] = None,
+    end: Optional[DateLike] = None,
+    planets: Sequence[str] = tuple(TRANSIT_PLANETS)
+) -> Optional[str]:
+    """Render the transit periods of the slow planets for a window.
+
+    Args:
+        start: Window start (default: today)
+        end: Window end (default: start + GOCHARA_YEARS_AHEAD years)
+        planets: Planets to include
+
+    Returns:
+        Transit text in the same format as the old hand-written GOCHARA_* blocks,
+        or None if the transit table has not been built
+    """
+    start_dt = datetime.fromisoformat(start) if isinstance(start, str) else start
+    if start_dt is None:
+        start_dt = date.today()
+    if not isinstance(start_dt, datetime):
+        start_dt = datetime(start_dt.year, start_dt.month, start_dt.day)
+    if end is None:
+        end_dt = start_dt + timedelta(days=round(AstroConfig.TransitConfig.GOCHARA_YEARS_AHEAD * 365.25))
+    else:
+        end_dt = datetime.fromisoformat(end) if isinstance(end, str) else end
+        if not isinstance(end_dt, datetime):
+            end_dt = datetime(end_dt.year, end_dt.month, end_dt.day)
+    return _build_gochara_transits(start_dt.isoformat(), end_dt.isoformat(), tuple(planets))
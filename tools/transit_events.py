@@ -0,0 +1,365 @@
+"""Transit-to-natal events (conjunctions, graha drishti, house ingresses) over the ephemeris grid"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import AstroConfig
+from tools.transit_engine import (
+    DateLike,
+    EphemerisGrid,
+    _to_days,
+    _to_ist_datetime,
+    days_from_dates,
+    get_ephemeris_grid,
+)
+from tools.vedastro_tools import PLANET_NAMES, ZODIAC_SIGNS
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPES = ("conjunction", "aspect", "house_ingress")
+
+# Natal points transits are compared against (planets in PLANET_NAMES order, then the ascendant)
+NATAL_POINTS = PLANET_NAMES + ["Lagna"]
+
+# Transiting planets scanned by default. The Moon changes sign every ~2.5 days,
+# which is too fast to matter for forecasts and too fast for a daily scan.
+DEFAULT_EVENT_PLANETS = [name for name in PLANET_NAMES if name != "Moon"]
+
+# Graha drishti: signs aspected, counted from the planet's own sign (1 = same sign)
+GRAHA_DRISHTI = {
+    "Sun": (7,), "Moon": (7,), "Mercury": (7,), "Venus": (7,),
+    "Mars": (4, 7, 8),
+    "Jupiter": (5, 7, 9),
+    "Saturn": (3, 7, 10),
+    "Rahu": (5, 7, 9),
+    "Ketu": (5, 7, 9),
+}
+
+# _DRISHTI[planet index, sign count] -> True if the planet aspects that sign
+_DRISHTI = np.zeros((len(PLANET_NAMES), 13), dtype=bool)
+for _index, _name in enumerate(PLANET_NAMES):
+    _DRISHTI[_index, list(GRAHA_DRISHTI[_name])] = True
+
+_ORDINALS = {3: "3rd", 4: "4th", 5: "5th", 7: "7th", 8: "8th", 9: "9th", 10: "10th"}
+
+
+class NatalPoints:
+    """Natal longitudes and signs of the planets and Lagna."""
+
+    __slots__ = ("names", "longitudes", "signs", "lagna_sign")
+
+    def __init__(self, names: List[str], longitudes: np.ndarray, signs: np.ndarray, lagna_sign: int):
+        self.names = names
+        self.longitudes = longitudes  # NaN where only the sign is known
+        self.signs = signs
+        self.lagna_sign = lagna_sign
+
+    @classmethod
+    def from_chart_data(cls, chart_data: Optional[Dict[str, Any]]) -> Optional["NatalPoints"]:
+        """Build natal points from a comprehensive chart result (None if the Lagna is missing)."""
+        if not chart_data:
+            return None
+        lagna = chart_data.get("lagna") or {}
+        if lagna.get("sign") not in ZODIAC_SIGNS:
+            return None
+
+        positions = chart_data.get("planetary_positions") or {}
+        names, longitudes, signs = [], [], []
+        for name in NATAL_POINTS:
+            point = lagna if name == "Lagna" else positions.get(name) or {}
+            sign = point.get("sign")
+            if sign not in ZODIAC_SIGNS:
+                continue
+            sign_index = ZODIAC_SIGNS.index(sign)
+            degrees = point.get("sign_degrees")
+            names.append(name)
+            signs.append(sign_index)
+            longitudes.append(sign_index * 30.0 + float(degrees) if degrees is not None else np.nan)
+
+        return cls(
+            names=names,
+            longitudes=np.array(longitudes, dtype=np.float64),
+            signs=np.array(signs, dtype=np.int64),
+            lagna_sign=ZODIAC_SIGNS.index(lagna["sign"]),
+        )
+
+
+def _planet_indexes(planets: Optional[Sequence[str]]) -> np.ndarray:
+    planets = DEFAULT_EVENT_PLANETS if planets is None else planets
+    unknown = [p for p in planets if p not in PLANET_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown planets: {unknown}. Expected names from {PLANET_NAMES}")
+    return np.array([PLANET_NAMES.index(p) for p in planets], dtype=np.int64)
+
+
+def _require_grid(grid: Optional[EphemerisGrid]) -> EphemerisGrid:
+    grid = grid or get_ephemeris_grid()
+    if grid is None:
+        raise RuntimeError("Ephemeris grid has not been built yet")
+    return grid
+
+
+def evaluate_transits(
+    natal: NatalPoints,
+    whens: Any,
+    planets: Optional[Sequence[str]] = None,
+    orb: Optional[float] = None,
+    grid: Optional[EphemerisGrid] = None
+) -> Dict[str, np.ndarray]:
+    """Vectorized transit state for many instants.
+
+    Args:
+        natal: Natal points to compare against
+        whens: Date(s) in IST - datetime/date/ISO string, a sequence of them, or a datetime64 array
+        planets: Transiting planets (default: DEFAULT_EVENT_PLANETS)
+        orb: Conjunction orb in degrees (default from config)
+        grid: Ephemeris grid (default: the global one)
+
+    Returns:
+        Dictionary of arrays, n = instants, p = transit planets, q = natal points:
+        days (n,), longitudes (n, p), signs (n, p), houses (n, p),
+        separation (n, p, q), conjunction (n, p, q), aspect (n, p, q),
+        aspect_count (n, p, q) - sign count of the aspect from the transit planet
+    """
+    return _evaluate_days(natal, days_from_dates(whens), planets, orb, grid)
+
+
+def _evaluate_days(
+    natal: NatalPoints,
+    days: np.ndarray,
+    planets: Optional[Sequence[str]],
+    orb: Optional[float],
+    grid: Optional[EphemerisGrid]
+) -> Dict[str, np.ndarray]:
+    grid = _require_grid(grid)
+    orb = AstroConfig.TransitConfig.TRANSIT_CONJUNCTION_ORB if orb is None else orb
+    planet_index = _planet_indexes(planets)
+
+    longitudes = grid.positions(days)[:, planet_index]
+    signs = (longitudes // 30).astype(np.int64)
+
+    separation = np.abs((longitudes[:, :, None] - natal.longitudes[None, None, :] + 180.0) % 360.0 - 180.0)
+    aspect_count = (natal.signs[None, None, :] - signs[:, :, None]) % 12 + 1
+    aspect = _DRISHTI[planet_index[None, :, None], aspect_count]
+
+    return {
+        "days": days,
+        "longitudes": longitudes,
+        "signs": signs,
+        "houses": (signs - natal.lagna_sign) % 12 + 1,
+        "separation": separation,
+        # NaN separations (natal degree unknown) compare False
+        "conjunction": separation <= orb,
+        "aspect": aspect,
+        "aspect_count": aspect_count,
+    }
+
+
+def _mask_intervals(mask: np.ndarray):
+    """Runs of True along axis 0 for every column of a 2-D mask.
+
+    Returns:
+        (columns, starts, ends) index arrays; ends are exclusive
+    """
+    n = mask.shape[0]
+    padded = np.zeros((mask.shape[1], n + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask.T
+    edges = np.diff(padded, axis=1)
+    columns, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return columns, starts, ends
+
+
+def scan_transit_events(
+    natal: NatalPoints,
+    start: DateLike,
+    end: DateLike,
+    step_days: float = 1.0,
+    planets: Optional[Sequence[str]] = None,
+    event_types: Sequence[str] = EVENT_TYPES,
+    orb: Optional[float] = None,
+    grid: Optional[EphemerisGrid] = None
+) -> List[Dict[str, Any]]:
+    """Find all transit-to-natal events in a window.
+
+    Every check is a NumPy broadcast over (time, transit planet, natal point):
+    conjunction within an orb, sign-based graha drishti (7th for all, plus
+    Mars 4th/8th, Jupiter/Rahu/Ketu 5th/9th, Saturn 3rd/10th) and whole-sign
+    house ingress from the natal Lagna. The boolean masks are then turned into
+    start/end intervals. All datetimes are naive IST.
+
+    Args:
+        natal: Natal points to compare against
+        start: Window start (IST)
+        end: Window end (IST)
+        step_days: Sampling step; event boundaries are accurate to one step
+        planets: Transiting planets (default: DEFAULT_EVENT_PLANETS)
+        event_types: Subset of EVENT_TYPES to report
+        orb: Conjunction orb in degrees (default from config)
+        grid: Ephemeris grid (default: the global one)
+
+    Returns:
+        Events sorted by start date. Conjunctions and aspects have start/end
+        (clipped to the window, with ongoing_at_start / ongoing_at_end flags);
+        conjunctions also carry the date and orb of the closest approach.
+        House ingresses have the date of the first sample in the new house.
+    """
+    start_days, end_days = _to_days(start), _to_days(end)
+    if end_days <= start_days:
+        raise ValueError("Transit scan end must be after start")
+    planet_names = list(DEFAULT_EVENT_PLANETS if planets is None else planets)
+
+    days = np.arange(start_days, end_days + step_days / 2, step_days)
+    state = _evaluate_days(natal, days, planet_names, orb, grid)
+    n, p, q = state["separation"].shape
+
+    def _date(i: int) -> datetime:
+        return _to_ist_datetime(days[min(i, n - 1)])
+
+    events: List[Dict[str, Any]] = []
+    for event_type in ("conjunction", "aspect"):
+        if event_type not in event_types:
+            continue
+        mask = state[event_type].reshape(n, p * q)
+        columns, starts, ends = _mask_intervals(mask)
+        for column, s, e in zip(columns.tolist(), starts.tolist(), ends.tolist()):
+            planet, point = divmod(column, q)
+            event = {
+                "type": event_type,
+                "transit_planet": planet_names[planet],
+                "natal_point": natal.names[point],
+                "start": _date(s),
+                "end": _date(e),
+                "ongoing_at_start": s == 0,
+                "ongoing_at_end": e == n,
+            }
+            if event_type == "conjunction":
+                separations = state["separation"][s:e, planet, point]
+                closest = int(np.argmin(separations))
+                event["exact"] = _date(s + closest)
+                event["orb"] = round(float(separations[closest]), 2)
+            else:
+                count = int(state["aspect_count"][s, planet, point])
+                event["aspect"] = _ORDINALS.get(count, f"{count}th")
+            events.append(event)
+
+    if "house_ingress" in event_types:
+        houses = state["houses"]
+        times, planets_changed = np.nonzero(houses[1:] != houses[:-1])
+        for t, planet in zip(times.tolist(), planets_changed.tolist()):
+            events.append({
+                "type": "house_ingress",
+                "transit_planet": planet_names[planet],
+                "house": int(houses[t + 1, planet]),
+                "sign": ZODIAC_SIGNS[int(state["signs"][t + 1, planet])],
+                "start": _date(t + 1),
+            })
+
+    events.sort(key=lambda event: (event["start"], event["type"], event["transit_planet"]))
+    return events
+
+
+def transits_at(
+    natal: NatalPoints,
+    when: DateLike,
+    planets: Optional[Sequence[str]] = None,
+    orb: Optional[float] = None,
+    grid: Optional[EphemerisGrid] = None
+) -> Dict[str, Any]:
+    """Positions of the transiting planets at one instant and the natal points they hit."""
+    planet_names = list(PLANET_NAMES if planets is None else planets)
+    state = evaluate_transits(natal, when, planets=planet_names, orb=orb, grid=grid)
+
+    positions = {}
+    for i, planet in enumerate(planet_names):
+        longitude = float(state["longitudes"][0, i])
+        positions[planet] = {
+            "sign": ZODIAC_SIGNS[int(state["signs"][0, i])],
+            "sign_degrees": round(longitude % 30.0, 4),
+            "house": int(state["houses"][0, i]),
+        }
+
+    events = []
+    for planet, point in zip(*np.nonzero(state["conjunction"][0])):
+        events.append({
+            "type": "conjunction",
+            "transit_planet": planet_names[planet],
+            "natal_point": natal.names[point],
+            "orb": round(float(state["separation"][0, planet, point]), 2),
+        })
+    for planet, point in zip(*np.nonzero(state["aspect"][0])):
+        count = int(state["aspect_count"][0, planet, point])
+        events.append({
+            "type": "aspect",
+            "transit_planet": planet_names[planet],
+            "natal_point": natal.names[point],
+            "aspect": _ORDINALS.get(count, f"{count}th"),
+        })
+    return {"transit_positions": positions, "events": events}
+
+
+def _format_event(event: Dict[str, Any]) -> str:
+    def _fmt(dt: datetime) -> str:
+        return f"{dt:%Y-%m-%d}"
+
+    planet = event["transit_planet"]
+    if event["type"] == "house_ingress":
+        return f"- {_fmt(event['start'])}: {planet} enters house {event['house']} ({event['sign']})"
+
+    span = f"{_fmt(event['start'])} to {_fmt(event['end'])}"
+    if event["type"] == "conjunction":
+        return (
+            f"- {span}: {planet} conjunct natal {event['natal_point']} "
+            f"(exact {_fmt(event['exact'])}, orb {event['orb']}°)"
+        )
+    return f"- {span}: {planet} {event['aspect']} aspect on natal {event['natal_point']}"
+
+
+def format_transit_events(
+    chart_data: Optional[Dict[str, Any]],
+    start: Optional[DateLike] = None,
+    days: int = 365,
+    planets: Optional[Sequence[str]] = None,
+    event_types: Sequence[str] = EVENT_TYPES
+) -> Optional[str]:
+    """Render the transit events over a natal chart as a prompt context block.
+
+    Args:
+        chart_data: Comprehensive chart result (needs lagna and planetary_positions)
+        start: Window start (default: today)
+        days: Window length in days
+        planets: Transiting planets (default: the slow planets, whose transits matter for timing)
+        event_types: Subset of EVENT_TYPES to include
+
+    Returns:
+        Text block, or None if the chart or the ephemeris grid is unavailable
+    """
+    natal = NatalPoints.from_chart_data(chart_data)
+    if natal is None or get_ephemeris_grid() is None:
+        return None
+
+    start_dt = datetime.fromisoformat(start) if isinstance(start, str) else start
+    if start_dt is None:
+        start_dt = datetime.now()
+    elif not isinstance(start_dt, datetime):
+        start_dt = datetime(start_dt.year, start_dt.month, start_dt.day)
+    end_dt = start_dt + timedelta(days=days)
+
+    try:
+        events = scan_transit_events(
+            natal, start_dt, end_dt,
+            planets=planets or AstroConfig.TransitConfig.TRANSIT_EVENT_PLANETS,
+            event_types=event_types
+        )
+    except ValueError as e:
+        logger.warning(f"Could not scan transit events: {e}")
+        return None
+
+    lines = [f"**TRANSIT EVENTS OVER THE NATAL CHART ({start_dt:%Y-%m-%d} to {end_dt:%Y-%m-%d}):**"]
+    lines.extend(_format_event(event) for event in events)
+    if len(lines) == 1:
+        lines.append("- No major transit events in this period")
+    return "\n".join(lines)
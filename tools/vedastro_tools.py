@@ -8,10 +8,11 @@ and provides complete birth chart generation with all divisional charts.
 
 **IMPORTANT**: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
 This simplifies timezone handling and avoids confusion. All birth times should be
-provided in IST format, regardless of the actual location of birth.
+provided in IST format, regardless of the actual location of birth (unless
+CHART_LOCAL_TIMEZONE is set, which reads them in the birthplace's own zone).
 """
 
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable
 from datetime import datetime, date, timedelta
 import logging
 import re
@@ -21,11 +22,22 @@ try:
 except ImportError:
     calculate_birth_chart = None
 
+from config import AstroConfig
+from tools.chart_engine import ChartEngine, chart_engine
+from tools.chart_cache import chart_cache, make_chart_key
+from tools.timezone_lookup import timezone_lookup, utc_offset_hours
+
 logger = logging.getLogger(__name__)
 
 # Planet order in jyotishganit: Sun, Moon, Mars, Mercury, Jupiter, Venus, Saturn, Rahu, Ketu
 PLANET_NAMES = ["Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn", "Rahu", "Ketu"]
 
+# Zodiac signs in order (sign index 0 = Aries)
+ZODIAC_SIGNS = [
+    "Aries", "Taurus", "Gemini", "Cancer", "Leo", "Virgo",
+    "Libra", "Scorpio", "Sagittarius", "Capricorn", "Aquarius", "Pisces"
+]
+
 # Nakshatra names in order
 NAKSHATRAS = [
     "Ashwini", "Bharani", "Kritika", "Rohini", "Mrigashira", "Ardra", "Punarvasu",
@@ -55,6 +67,43 @@ DASHA_PERIODS = {
 # Dasha sequence
 DASHA_SEQUENCE = ["Ketu", "Venus", "Sun", "Moon", "Mars", "Rahu", "Jupiter", "Saturn", "Mercury"]
 
+# Divisional charts extracted into the comprehensive chart by default: none - vargas are
+# materialized on demand from the D1 positions by DivisionalChartSet (tools/divisional_charts.py)
+DEFAULT_DIVISIONAL_CHARTS: List[str] = []
+
+# Commonly used divisional charts (D1-D12)
+COMMON_DIVISIONAL_CHARTS = ['d1', 'd2', 'd3', 'd4', 'd7', 'd9', 'd10', 'd12']
+
+# Sign lords
+SIGN_LORDS = {
+    "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury",
+    "Cancer": "Moon", "Leo": "Sun", "Virgo": "Mercury",
+    "Libra": "Venus", "Scorpio": "Mars", "Sagittarius": "Jupiter",
+    "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
+}
+
+# Available divisional charts in jyotishganit
+DIVISIONAL_CHART_NAMES = {
+    'd1': 'Rasi', 'd2': 'Hora', 'd3': 'Drekkana', 'd4': 'Chaturthamsa',
+    'd7': 'Saptamsa', 'd9': 'Navamsa', 'd10': 'Dasamsa', 'd12': 'Dwadasamsa',
+    'd16': 'Shodasamsa', 'd20': 'Vimsamsa', 'd24': 'Chaturvimsamsa', 'd27': 'Bhamsha',
+    'd30': 'Trimsamsa', 'd60': 'Shashtiamsa'
+}
+
+# Shadbala components: (output key, jyotishganit key)
+SHADBALA_FIELDS = (
+    ("total", "Total"),
+    ("rupas", "Rupas"),
+    ("sthanabala", "Sthanabala"),        # Positional strength
+    ("kaalabala", "Kaalabala"),          # Temporal strength
+    ("digbala", "Digbala"),              # Directional strength
+    ("cheshtabala", "Cheshtabala"),      # Motional strength
+    ("naisargikabala", "Naisargikabala"),  # Natural strength
+    ("drikbala", "Drikbala"),            # Aspectual strength
+)
+
+PANCHANGA_FIELDS = ("tithi", "nakshatra", "yoga", "karana", "vaara")
+
 
 def _parse_datetime(date_str: str, time_str: str) -> datetime:
     """Parse date and time strings into naive datetime object.
@@ -76,12 +125,19 @@ def _parse_datetime(date_str: str, time_str: str) -> datetime:
     return dt
 
 
-def _get_timezone_offset() -> float:
-    """Get IST (Indian Standard Time) timezone offset in hours from UTC.
+def _get_timezone_offset(birth_datetime: datetime, timezone: Optional[str] = None) -> float:
+    """Get the timezone offset in hours from UTC.
     
-    IST is UTC+5:30, so this always returns 5.5.
+    Without a timezone this is IST (UTC+5:30), so it returns 5.5. For an IANA
+    timezone the offset comes from zoneinfo at the given local birth time, so
+    historical rules (daylight saving, Asia/Kolkata's 1942-45 war time) apply.
+    
+    Raises:
+        ValueError: If the timezone is unknown
     """
-    return 5.5  # IST offset is fixed at UTC+5:30
+    if not timezone:
+        return 5.5  # IST offset is fixed at UTC+5:30
+    return utc_offset_hours(timezone, birth_datetime)
 
 
 def _calculate_chart(
@@ -90,11 +146,13 @@ def _calculate_chart(
     latitude: float,
     longitude: float,
     location_name: str,
-    name: Optional[str] = None
+    name: Optional[str] = None,
+    timezone: Optional[str] = None
 ) -> Any:
     """Calculate birth chart using jyotishganit.
     
-    All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
+    Times are assumed to be in IST (Indian Standard Time, Asia/Kolkata) unless
+    an IANA timezone is given.
     """
     if calculate_birth_chart is None:
         raise ImportError(
@@ -123,8 +181,8 @@ def _calculate_chart(
     except Exception as e:
         raise ValueError(f"Failed to parse date/time: {date_of_birth} {time_of_birth}. Error: {e}")
     
-    # Get IST timezone offset (UTC+5:30 = 5.5 hours)
-    timezone_offset = _get_timezone_offset()  # Always 5.5 for IST
+    # IST offset (UTC+5:30 = 5.5 hours) unless a timezone is given
+    timezone_offset = _get_timezone_offset(birth_datetime, timezone)
     
     # Calculate chart
     # jyotishganit works with naive datetime + timezone_offset
@@ -145,6 +203,207 @@ def _calculate_chart(
     return chart
 
 
+def _ayanamsa_data(chart: Any) -> Optional[Dict[str, Any]]:
+    """Convert the jyotishganit Ayanamsa object into plain data."""
+    ayanamsa = getattr(chart, 'ayanamsa', None)
+    if ayanamsa is None:
+        return None
+    return {
+        "name": getattr(ayanamsa, 'name', None),
+        "value": getattr(ayanamsa, 'value', None)
+    }
+
+
+def _planet_position_data(planet: Any) -> Dict[str, Any]:
+    """Convert a D1 PlanetPosition into plain data."""
+    data = {
+        "celestial_body": planet.celestial_body,
+        "sign": planet.sign,
+        "sign_degrees": planet.sign_degrees,
+        "nakshatra": planet.nakshatra,
+        "pada": planet.pada,
+        "house": planet.house,
+        "longitude": planet.sign_degrees,  # Degrees within sign
+    }
+    
+    # Add dignities if available
+    if hasattr(planet, 'dignities'):
+        dignities = planet.dignities
+        data["dignities"] = {
+            "dignity": getattr(dignities, 'dignity', None),
+            "planet_tattva": getattr(dignities, 'planet_tattva', None),
+        }
+    return data
+
+
+def _shadbala_data(planet: Any) -> Dict[str, Any]:
+    """Convert a planet's Shadbala dict into plain data."""
+    shadbala = getattr(planet, 'shadbala', None)
+    if not shadbala:
+        return {"error": "Shadbala data not available"}
+    
+    values = shadbala.get('Shadbala', {}) if isinstance(shadbala, dict) else {}
+    get = values.get
+    return {key: get(source_key, 0) for key, source_key in SHADBALA_FIELDS}
+
+
+def _mahadasha_periods(chart: Any, years_ahead: int = 10) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Current and upcoming mahadashas from the chart's dasha data."""
+    dashas = chart.dashas
+    
+    # Extract current and upcoming mahadashas
+    current_dasha = None
+    upcoming_dashas = []
+    
+    upcoming = getattr(dashas, 'upcoming', None)
+    if upcoming is not None and 'mahadashas' in upcoming:
+        mahadashas = list(upcoming['mahadashas'].items())
+        
+        # First one is current
+        for i, (planet, dasha_info) in enumerate(mahadashas):
+            period = {
+                "planet": planet,
+                "start": dasha_info.get('start'),
+                "end": dasha_info.get('end'),
+                "duration_years": dasha_info.get('duration_years')
+            }
+            if i == 0:
+                current_dasha = period
+            else:
+                upcoming_dashas.append(period)
+    
+    # Limit upcoming dashas by years_ahead
+    return current_dasha, (upcoming_dashas[:years_ahead] if years_ahead else upcoming_dashas)
+
+
+def _panchanga_data(chart: Any) -> Dict[str, Any]:
+    """Convert the chart's Panchanga into plain data."""
+    panchanga = getattr(chart, 'panchanga', None)
+    return {field: getattr(panchanga, field, None) for field in PANCHANGA_FIELDS}
+
+
+def _divisional_chart_data(divisional_chart: Any, chart_key: str) -> Dict[str, Any]:
+    """Convert one jyotishganit DivisionalChart into plain data in a single walk over its houses.
+    
+    DivisionalChart/DivisionalHouse/DivisionalPlanetPosition are dataclasses,
+    so fields are read directly instead of probing with hasattr.
+    """
+    # Planets are stored in house occupants, not as a direct .planets attribute
+    planets_data = {}
+    houses_data = []
+    for house in divisional_chart.houses:
+        house_number = house.number
+        occupants = []
+        for planet_pos in house.occupants:
+            planet_name = planet_pos.celestial_body
+            occupants.append(planet_name)
+            planets_data[planet_name] = {
+                "celestial_body": planet_name,
+                "sign": planet_pos.sign,
+                "house": house_number,
+                "d1_house_placement": planet_pos.d1_house_placement
+            }
+        
+        houses_data.append({
+            "house": house_number,
+            "sign": house.sign,
+            "lord": house.lord,
+            "occupants": occupants,
+            "d1_house_placement": house.d1_house_placement
+        })
+    
+    # Extract ascendant information
+    asc = divisional_chart.ascendant
+    ascendant_data = {"sign": asc.sign, "d1_house_placement": asc.d1_house_placement} if asc else None
+    
+    return {
+        "name": DIVISIONAL_CHART_NAMES[chart_key],
+        "ascendant": ascendant_data,
+        "planets": planets_data,
+        "houses": houses_data
+    }
+
+
+def _divisional_charts_data(chart: Any, chart_types: List[str]) -> Dict[str, Any]:
+    """Convert the requested divisional charts into plain data (errors are reported per chart)."""
+    available = getattr(chart, 'divisional_charts', None)
+    divisional_charts = {}
+    
+    for chart_type in chart_types:
+        chart_key = chart_type.lower()
+        if chart_key not in DIVISIONAL_CHART_NAMES:
+            logger.warning(f"Unknown chart type: {chart_type}, skipping")
+            continue
+        
+        if not available:
+            divisional_charts[chart_key] = {
+                "error": "Divisional charts not available in chart object"
+            }
+            continue
+        
+        try:
+            divisional_chart = available.get(chart_key)
+            if divisional_chart:
+                divisional_charts[chart_key] = _divisional_chart_data(divisional_chart, chart_key)
+            else:
+                divisional_charts[chart_key] = {
+                    "error": f"Chart {chart_key} not available"
+                }
+        except Exception as e:
+            logger.warning(f"Error extracting {chart_key}: {e}")
+            divisional_charts[chart_key] = {
+                "error": str(e)
+            }
+    
+    return divisional_charts
+
+
+def _calculate_and_extract(
+    extractor: Callable[..., Dict[str, Any]],
+    date_of_birth: str,
+    time_of_birth: str,
+    latitude: float,
+    longitude: float,
+    location_name: str,
+    timezone: Optional[str] = None,
+    **extractor_kwargs: Any
+) -> Dict[str, Any]:
+    """Calculate a chart and run an extractor on it.
+    
+    Runs inside a chart engine worker process: the jyotishganit chart object
+    never leaves the worker, only the extractor's plain dict result does.
+    """
+    chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name, timezone=timezone)
+    return extractor(chart, date_of_birth, time_of_birth, location_name, **extractor_kwargs)
+
+
+async def _calculate_in_engine(
+    extractor: Callable[..., Dict[str, Any]],
+    date_of_birth: str,
+    time_of_birth: str,
+    latitude: float,
+    longitude: float,
+    location_name: str,
+    timezone: Optional[str] = None,
+    engine: Optional[ChartEngine] = None,
+    **extractor_kwargs: Any
+) -> Dict[str, Any]:
+    """Calculate a chart in the chart engine (off the event loop) and extract data from it."""
+    try:
+        return await (engine or chart_engine).run(
+            _calculate_and_extract, extractor,
+            date_of_birth, time_of_birth, latitude, longitude, location_name,
+            timezone=timezone,
+            **extractor_kwargs
+        )
+    except Exception as e:
+        logger.error(f"Error calculating chart: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
 async def address_to_geolocation(address: str) -> Dict[str, Any]:
     """
     Note: jyotishganit does not provide address geocoding.
@@ -187,63 +446,26 @@ async def coordinates_to_geolocation(latitude: float, longitude: float) -> Dict[
     }
 
 
-async def get_planetary_positions(
+def _planetary_positions_from_chart(
+    chart: Any,
     date_of_birth: str,
     time_of_birth: str,
-    latitude: float,
-    longitude: float,
-    location_name: str,
-    chart: Optional[Any] = None
+    location_name: str
 ) -> Dict[str, Any]:
-    """
-    Get detailed planetary positions for a given birth time and location.
-    
-    Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
-    
-    Args:
-        date_of_birth: Date in YYYY-MM-DD format
-        time_of_birth: Time in HH:MM format (24-hour) - assumed to be in IST
-        latitude: Birth location latitude
-        longitude: Birth location longitude
-        location_name: Full location name
-        chart: Optional pre-calculated chart object (for optimization)
-    
-    Returns:
-        Dictionary containing planetary positions for all planets
-    """
+    """Extract planetary positions from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
         # Extract planetary positions
         planets = {}
         for i, planet in enumerate(chart.d1_chart.planets):
             planet_name = PLANET_NAMES[i] if i < len(PLANET_NAMES) else f"Planet_{i}"
-            
-            planets[planet_name] = {
-                "celestial_body": planet.celestial_body,
-                "sign": planet.sign,
-                "sign_degrees": planet.sign_degrees,
-                "nakshatra": planet.nakshatra,
-                "pada": planet.pada,
-                "house": planet.house,
-                "longitude": planet.sign_degrees,  # Degrees within sign
-            }
-            
-            # Add dignities if available
-            if hasattr(planet, 'dignities'):
-                planets[planet_name]["dignities"] = {
-                    "dignity": planet.dignities.dignity if hasattr(planet.dignities, 'dignity') else None,
-                    "planet_tattva": planet.dignities.planet_tattva if hasattr(planet.dignities, 'planet_tattva') else None,
-                }
+            planets[planet_name] = _planet_position_data(planet)
         
         return {
             "success": True,
             "planetary_positions": planets,
             "birth_time": f"{date_of_birth} {time_of_birth}",
             "location": location_name,
-            "ayanamsa": chart.ayanamsa if hasattr(chart, 'ayanamsa') else None
+            "ayanamsa": _ayanamsa_data(chart)
         }
     except Exception as e:
         logger.error(f"Error getting planetary positions: {e}", exc_info=True)
@@ -253,7 +475,7 @@ async def get_planetary_positions(
         }
 
 
-async def get_house_positions(
+async def get_planetary_positions(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
@@ -262,7 +484,7 @@ async def get_house_positions(
     chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get house positions and cusps for a given birth time and location.
+    Get detailed planetary positions for a given birth time and location.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -275,13 +497,24 @@ async def get_house_positions(
         chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing house cusps and positions
+        Dictionary containing planetary positions for all planets
     """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _planetary_positions_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return await _calculate_in_engine(
+        _planetary_positions_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name
+    )
+
+
+def _house_positions_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str
+) -> Dict[str, Any]:
+    """Extract house positions from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
         # Get Lagna (Ascendant) - first house
         lagna_house = chart.d1_chart.houses[0]
         
@@ -325,7 +558,7 @@ async def get_house_positions(
         }
 
 
-async def get_lagna_details(
+async def get_house_positions(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
@@ -334,7 +567,7 @@ async def get_lagna_details(
     chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get detailed Lagna (Ascendant) information.
+    Get house positions and cusps for a given birth time and location.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -347,37 +580,42 @@ async def get_lagna_details(
         chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing Lagna details including sign, degree, nakshatra, etc.
+        Dictionary containing house cusps and positions
     """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _house_positions_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return await _calculate_in_engine(
+        _house_positions_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name
+    )
+
+
+def _lagna_details_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str
+) -> Dict[str, Any]:
+    """Extract Lagna details from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
         # Get Lagna (first house)
         lagna_house = chart.d1_chart.houses[0]
         
         # Get Lagna lord (sign lord)
-        lagna_lord = None
-        sign_lords = {
-            "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury",
-            "Cancer": "Moon", "Leo": "Sun", "Virgo": "Mercury",
-            "Libra": "Venus", "Scorpio": "Mars", "Sagittarius": "Jupiter",
-            "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-        }
-        lagna_lord = sign_lords.get(lagna_house.sign)
+        lagna_lord = SIGN_LORDS.get(lagna_house.sign)
         
         return {
             "success": True,
             "lagna": {
                 "sign": lagna_house.sign,
+                "sign_degrees": getattr(lagna_house, 'sign_degrees', None),
                 "longitude": getattr(lagna_house, 'longitude', None),
                 "lord": lagna_lord,
                 "house": 1
             },
             "birth_time": f"{date_of_birth} {time_of_birth}",
             "location": location_name,
-            "ayanamsa": chart.ayanamsa if hasattr(chart, 'ayanamsa') else None
+            "ayanamsa": _ayanamsa_data(chart)
         }
     except Exception as e:
         logger.error(f"Error getting Lagna details: {e}", exc_info=True)
@@ -387,17 +625,16 @@ async def get_lagna_details(
         }
 
 
-async def get_dasha_details(
+async def get_lagna_details(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
     longitude: float,
     location_name: str,
-    years_ahead: int = 10,
     chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get Dasha (planetary period) details for a given birth time.
+    Get detailed Lagna (Ascendant) information.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -407,51 +644,34 @@ async def get_dasha_details(
         latitude: Birth location latitude
         longitude: Birth location longitude
         location_name: Full location name
-        years_ahead: Number of years to calculate ahead (default: 10)
         chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing current and upcoming Dasha periods
+        Dictionary containing Lagna details including sign, degree, nakshatra, etc.
     """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _lagna_details_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return await _calculate_in_engine(
+        _lagna_details_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name
+    )
+
+
+def _dasha_details_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str,
+    years_ahead: int = 10
+) -> Dict[str, Any]:
+    """Extract Dasha details from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
-        # Get Dasha information
-        dashas = chart.dashas
-        
-        # Extract current and upcoming mahadashas
-        current_dasha = None
-        upcoming_dashas = []
-        
-        if hasattr(dashas, 'upcoming') and 'mahadashas' in dashas.upcoming:
-            mahadashas = dashas.upcoming['mahadashas']
-            
-            # First one is current
-            if mahadashas:
-                first_key = list(mahadashas.keys())[0]
-                first_dasha = mahadashas[first_key]
-                current_dasha = {
-                    "planet": first_key,
-                    "start": first_dasha.get('start'),
-                    "end": first_dasha.get('end'),
-                    "duration_years": first_dasha.get('duration_years')
-                }
-                
-                # Get upcoming dashas (limit by years_ahead)
-                for planet, dasha_info in list(mahadashas.items())[1:]:
-                    upcoming_dashas.append({
-                        "planet": planet,
-                        "start": dasha_info.get('start'),
-                        "end": dasha_info.get('end'),
-                        "duration_years": dasha_info.get('duration_years')
-                    })
+        current_dasha, upcoming_dashas = _mahadasha_periods(chart, years_ahead)
         
         return {
             "success": True,
             "current_dasha": current_dasha,
-            "upcoming_dashas": upcoming_dashas[:years_ahead] if years_ahead else upcoming_dashas,
+            "upcoming_dashas": upcoming_dashas,
             "years_ahead": years_ahead,
             "birth_time": f"{date_of_birth} {time_of_birth}",
             "location": location_name
@@ -464,90 +684,156 @@ async def get_dasha_details(
         }
 
 
-async def get_events_at_time(
-    birth_date: str,
-    birth_time: str,
-    check_date: str,
-    check_time: str,
+async def get_dasha_details(
+    date_of_birth: str,
+    time_of_birth: str,
     latitude: float,
     longitude: float,
     location_name: str,
-    event_tags: Optional[List[str]] = None
+    years_ahead: int = 10,
+    chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Note: jyotishganit does not provide event calculations at specific times.
-    This would require calculating transits and aspects manually.
+    Get Dasha (planetary period) details for a given birth time.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
     Args:
-        birth_date: Birth date in YYYY-MM-DD format
-        birth_time: Birth time in HH:MM format (assumed to be in IST)
-        check_date: Date to check events for in YYYY-MM-DD format
-        check_time: Time to check events for in HH:MM format (assumed to be in IST)
-        latitude: Location latitude
-        longitude: Location longitude
+        date_of_birth: Date in YYYY-MM-DD format
+        time_of_birth: Time in HH:MM format (24-hour) - assumed to be in IST
+        latitude: Birth location latitude
+        longitude: Birth location longitude
         location_name: Full location name
-        event_tags: Optional list of event tags to filter
+        years_ahead: Number of years to calculate ahead (default: 10)
+        chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary indicating that manual calculation is needed
+        Dictionary containing current and upcoming Dasha periods
     """
-    logger.warning("get_events_at_time requires manual transit calculations with jyotishganit.")
-    return {
-        "success": False,
-        "error": "jyotishganit does not provide event calculations. Calculate transits manually by comparing birth chart with current chart.",
-        "check_time": f"{check_date} {check_time}",
-        "birth_time": f"{birth_date} {birth_time}",
-        "location": location_name,
-        "note": "Calculate a new chart for check_time and compare planetary positions with birth chart"
-    }
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _dasha_details_from_chart(chart, date_of_birth, time_of_birth, location_name, years_ahead=years_ahead)
+    return await _calculate_in_engine(
+        _dasha_details_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name,
+        years_ahead=years_ahead
+    )
 
 
-async def get_chart_summary(
-    date_of_birth: str,
-    time_of_birth: str,
+async def get_events_at_time(
+    birth_date: str,
+    birth_time: str,
+    check_date: str,
+    check_time: str,
     latitude: float,
     longitude: float,
     location_name: str,
-    chart: Optional[Any] = None
+    event_tags: Optional[List[str]] = None,
+    check_end_date: Optional[str] = None,
+    chart_data: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    Get a comprehensive chart summary including all key astrological data.
+    Get transit-to-natal events (gochara over the birth chart) at a time or over a date range.
+    
+    Transiting positions come from the precomputed ephemeris grid (see
+    tools/transit_events.py), so no chart is recalculated for the check time.
+    The natal chart is taken from chart_data or from the (cached) comprehensive chart.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
     Args:
-        date_of_birth: Date in YYYY-MM-DD format
-        time_of_birth: Time in HH:MM format (24-hour) - assumed to be in IST
-        latitude: Birth location latitude
-        longitude: Birth location longitude
+        birth_date: Birth date in YYYY-MM-DD format
+        birth_time: Birth time in HH:MM format (assumed to be in IST)
+        check_date: Date to check events for in YYYY-MM-DD format
+        check_time: Time to check events for in HH:MM format (assumed to be in IST)
+        latitude: Location latitude
+        longitude: Location longitude
         location_name: Full location name
-        chart: Optional pre-calculated chart object (for optimization)
+        event_tags: Optional list of event types ("conjunction", "aspect", "house_ingress")
+                    and/or planet names to filter by
+        check_end_date: Optional end date (YYYY-MM-DD) to scan events from check time
+                        until this date at daily resolution
+        chart_data: Optional comprehensive chart result for the birth details
     
     Returns:
-        Dictionary containing comprehensive chart summary
+        Dictionary with transit positions and active events at check time,
+        plus events within the range if check_end_date is given
     """
+    from tools.transit_engine import get_ephemeris_grid, prepare_transit_table
+    from tools.transit_events import EVENT_TYPES, NatalPoints, scan_transit_events, transits_at
+    
+    check = f"{check_date} {check_time}"
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
+        check_dt = _parse_datetime(check_date, check_time)
         
+        if chart_data is None:
+            chart_data = await get_comprehensive_chart(birth_date, birth_time, latitude, longitude, location_name)
+            if not chart_data.get("success", False):
+                return {
+                    "success": False,
+                    "error": f"Failed to calculate birth chart: {chart_data.get('error', 'Unknown error')}"
+                }
+        natal = NatalPoints.from_chart_data(chart_data)
+        if natal is None:
+            return {"success": False, "error": "Birth chart has no Lagna/planetary positions"}
+        
+        if get_ephemeris_grid() is None:
+            await prepare_transit_table()
+        
+        # Tags can name event types and/or planets
+        tags = {tag.lower() for tag in event_tags} if event_tags else set()
+        event_types = [t for t in EVENT_TYPES if t in tags] or list(EVENT_TYPES)
+        tagged_planets = [p for p in PLANET_NAMES if p.lower() in tags]
+        
+        def _matches(event: Dict[str, Any]) -> bool:
+            return event["type"] in event_types and (
+                not tagged_planets
+                or event["transit_planet"] in tagged_planets
+                or event.get("natal_point") in tagged_planets
+            )
+        
+        current = transits_at(natal, check_dt)
+        result = {
+            "success": True,
+            "check_time": check,
+            "birth_time": f"{birth_date} {birth_time}",
+            "location": location_name,
+            "transit_positions": current["transit_positions"],
+            "events": [event for event in current["events"] if _matches(event)],
+        }
+        
+        if check_end_date:
+            end_dt = _parse_datetime(check_end_date, check_time)
+            result["range_end"] = check_end_date
+            result["range_events"] = [
+                event for event in scan_transit_events(natal, check_dt, end_dt, event_types=event_types)
+                if _matches(event)
+            ]
+        return result
+    except Exception as e:
+        logger.error(f"Error getting events at time: {e}", exc_info=True)
+        return {
+            "success": False,
+            "error": str(e),
+            "check_time": check,
+            "birth_time": f"{birth_date} {birth_time}",
+            "location": location_name
+        }
+
+
+def _chart_summary_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str
+) -> Dict[str, Any]:
+    """Extract a chart summary from a calculated chart."""
+    try:
         # Get Lagna
         lagna_house = chart.d1_chart.houses[0]
-        sign_lords = {
-            "Aries": "Mars", "Taurus": "Venus", "Gemini": "Mercury",
-            "Cancer": "Moon", "Leo": "Sun", "Virgo": "Mercury",
-            "Libra": "Venus", "Scorpio": "Mars", "Sagittarius": "Jupiter",
-            "Capricorn": "Saturn", "Aquarius": "Saturn", "Pisces": "Jupiter"
-        }
         
         # Get Moon (Rashi)
         moon = chart.d1_chart.planets[1]  # Moon is index 1
         
-        # Get Panchanga
-        panchanga = chart.panchanga if hasattr(chart, 'panchanga') else None
-        
         # Get planetary positions summary
         planets_summary = {}
         for i, planet in enumerate(chart.d1_chart.planets):
@@ -573,23 +859,17 @@ async def get_chart_summary(
             "success": True,
             "lagna": {
                 "sign": lagna_house.sign,
-                "lord": sign_lords.get(lagna_house.sign)
+                "lord": SIGN_LORDS.get(lagna_house.sign)
             },
             "rashi": {
                 "sign": moon.sign,
                 "nakshatra": moon.nakshatra,
                 "pada": moon.pada
             },
-            "panchanga": {
-                "tithi": panchanga.tithi if panchanga and hasattr(panchanga, 'tithi') else None,
-                "nakshatra": panchanga.nakshatra if panchanga and hasattr(panchanga, 'nakshatra') else None,
-                "yoga": panchanga.yoga if panchanga and hasattr(panchanga, 'yoga') else None,
-                "karana": panchanga.karana if panchanga and hasattr(panchanga, 'karana') else None,
-                "vaara": panchanga.vaara if panchanga and hasattr(panchanga, 'vaara') else None,
-            },
+            "panchanga": _panchanga_data(chart),
             "planetary_positions": planets_summary,
             "house_positions": houses_summary,
-            "ayanamsa": chart.ayanamsa if hasattr(chart, 'ayanamsa') else None,
+            "ayanamsa": _ayanamsa_data(chart),
             "birth_time": f"{date_of_birth} {time_of_birth}",
             "location": location_name
         }
@@ -601,7 +881,7 @@ async def get_chart_summary(
         }
 
 
-async def get_shadbala_details(
+async def get_chart_summary(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
@@ -610,7 +890,7 @@ async def get_shadbala_details(
     chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get Shadbala (six-fold strength) details for all planets.
+    Get a comprehensive chart summary including all key astrological data.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -623,35 +903,29 @@ async def get_shadbala_details(
         chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing Shadbala calculations for all planets
+        Dictionary containing comprehensive chart summary
     """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _chart_summary_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return await _calculate_in_engine(
+        _chart_summary_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name
+    )
+
+
+def _shadbala_details_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str
+) -> Dict[str, Any]:
+    """Extract Shadbala details from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
         # Extract Shadbala for all planets
         shadbala_data = {}
         for i, planet in enumerate(chart.d1_chart.planets):
             planet_name = PLANET_NAMES[i] if i < len(PLANET_NAMES) else f"Planet_{i}"
-            
-            if hasattr(planet, 'shadbala') and planet.shadbala:
-                shadbala = planet.shadbala.get('Shadbala', {}) if isinstance(planet.shadbala, dict) else {}
-                
-                shadbala_data[planet_name] = {
-                    "total": shadbala.get('Total', 0),
-                    "rupas": shadbala.get('Rupas', 0),
-                    "sthanabala": shadbala.get('Sthanabala', 0),  # Positional strength
-                    "kaalabala": shadbala.get('Kaalabala', 0),    # Temporal strength
-                    "digbala": shadbala.get('Digbala', 0),        # Directional strength
-                    "cheshtabala": shadbala.get('Cheshtabala', 0), # Motional strength
-                    "naisargikabala": shadbala.get('Naisargikabala', 0), # Natural strength
-                    "drikbala": shadbala.get('Drikbala', 0)       # Aspectual strength
-                }
-            else:
-                shadbala_data[planet_name] = {
-                    "error": "Shadbala data not available"
-                }
+            shadbala_data[planet_name] = _shadbala_data(planet)
         
         return {
             "success": True,
@@ -667,17 +941,16 @@ async def get_shadbala_details(
         }
 
 
-async def get_divisional_charts(
+async def get_shadbala_details(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
     longitude: float,
     location_name: str,
-    chart_types: Optional[List[str]] = None,
     chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get specific divisional charts (D1-D60) based on chart types.
+    Get Shadbala (six-fold strength) details for all planets.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -687,103 +960,33 @@ async def get_divisional_charts(
         latitude: Birth location latitude
         longitude: Birth location longitude
         location_name: Full location name
-        chart_types: List of chart types to retrieve (e.g., ['d1', 'd9', 'd10'])
-                     If None, returns all available divisional charts
         chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing requested divisional charts with planetary positions
+        Dictionary containing Shadbala calculations for all planets
     """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _shadbala_details_from_chart(chart, date_of_birth, time_of_birth, location_name)
+    return await _calculate_in_engine(
+        _shadbala_details_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name
+    )
+
+
+def _divisional_charts_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str,
+    chart_types: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Extract divisional charts from a calculated chart."""
     try:
-        # Use provided chart or calculate new one (always uses IST)
-        if chart is None:
-            chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
-        # Available divisional charts in jyotishganit
-        available_charts = {
-            'd1': 'Rasi', 'd2': 'Hora', 'd3': 'Drekkana', 'd4': 'Chaturthamsa',
-            'd7': 'Saptamsa', 'd9': 'Navamsa', 'd10': 'Dasamsa', 'd12': 'Dwadasamsa',
-            'd16': 'Shodasamsa', 'd24': 'Chaturvimsamsa', 'd27': 'Bhamsha',
-            'd30': 'Trimsamsa', 'd60': 'Shashtiamsa'
-        }
-        
         # If no chart types specified, get all available
         if chart_types is None:
-            chart_types = list(available_charts.keys())
+            chart_types = list(DIVISIONAL_CHART_NAMES.keys())
         
-        divisional_charts = {}
-        
-        for chart_type in chart_types:
-            chart_key = chart_type.lower()
-            if chart_key not in available_charts:
-                logger.warning(f"Unknown chart type: {chart_type}, skipping")
-                continue
-            
-            try:
-                # Get divisional chart from chart.divisional_charts
-                if hasattr(chart, 'divisional_charts') and chart.divisional_charts:
-                    divisional_chart = chart.divisional_charts.get(chart_key)
-                    
-                    if divisional_chart:
-                        # Extract planetary positions from divisional chart houses
-                        # Planets are stored in house occupants, not as a direct .planets attribute
-                        planets_data = {}
-                        
-                        # Iterate through all houses to collect planets from occupants
-                        for house in divisional_chart.houses:
-                            if hasattr(house, 'occupants') and house.occupants:
-                                for planet_pos in house.occupants:
-                                    if hasattr(planet_pos, 'celestial_body'):
-                                        planet_name = planet_pos.celestial_body
-                            planets_data[planet_name] = {
-                                            "celestial_body": planet_pos.celestial_body,
-                                            "sign": planet_pos.sign if hasattr(planet_pos, 'sign') else None,
-                                            "house": house.number if hasattr(house, 'number') else None,
-                                            "d1_house_placement": planet_pos.d1_house_placement if hasattr(planet_pos, 'd1_house_placement') else None
-                            }
-                        
-                        # Extract house data
-                        houses_data = []
-                        for house in divisional_chart.houses:
-                            occupants = []
-                            if hasattr(house, 'occupants') and house.occupants:
-                                occupants = [p.celestial_body for p in house.occupants if hasattr(p, 'celestial_body')]
-                            houses_data.append({
-                                "house": house.number if hasattr(house, 'number') else None,
-                                "sign": house.sign if hasattr(house, 'sign') else None,
-                                "lord": house.lord if hasattr(house, 'lord') else None,
-                                "occupants": occupants,
-                                "d1_house_placement": house.d1_house_placement if hasattr(house, 'd1_house_placement') else None
-                            })
-                        
-                        # Extract ascendant information
-                        ascendant_data = None
-                        if hasattr(divisional_chart, 'ascendant') and divisional_chart.ascendant:
-                            asc = divisional_chart.ascendant
-                            ascendant_data = {
-                                "sign": asc.sign if hasattr(asc, 'sign') else None,
-                                "d1_house_placement": asc.d1_house_placement if hasattr(asc, 'd1_house_placement') else None
-                            }
-                        
-                        divisional_charts[chart_key] = {
-                            "name": available_charts[chart_key],
-                            "ascendant": ascendant_data,
-                            "planets": planets_data,
-                            "houses": houses_data
-                        }
-                    else:
-                        divisional_charts[chart_key] = {
-                            "error": f"Chart {chart_key} not available"
-                        }
-                else:
-                    divisional_charts[chart_key] = {
-                        "error": "Divisional charts not available in chart object"
-                    }
-            except Exception as e:
-                logger.warning(f"Error extracting {chart_key}: {e}")
-                divisional_charts[chart_key] = {
-                    "error": str(e)
-                }
+        divisional_charts = _divisional_charts_data(chart, chart_types)
         
         return {
             "success": True,
@@ -799,18 +1002,17 @@ async def get_divisional_charts(
         }
 
 
-async def get_comprehensive_chart(
+async def get_divisional_charts(
     date_of_birth: str,
     time_of_birth: str,
     latitude: float,
     longitude: float,
     location_name: str,
-    years_ahead: int = 10,
-    divisional_charts: Optional[List[str]] = None
+    chart_types: Optional[List[str]] = None,
+    chart: Optional[Any] = None
 ) -> Dict[str, Any]:
     """
-    Get comprehensive chart data including Lagna, Dasha, Shadbala, and Divisional Charts.
-    This is the main tool that combines all chart calculations.
+    Get specific divisional charts (D1-D60) based on chart types.
     
     Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata).
     
@@ -820,73 +1022,117 @@ async def get_comprehensive_chart(
         latitude: Birth location latitude
         longitude: Birth location longitude
         location_name: Full location name
-        years_ahead: Number of years for Dasha calculations (default: 10)
-        divisional_charts: List of divisional charts to include (e.g., ['d9', 'd10'])
-                          If None, includes commonly used charts: ['d1', 'd2', 'd3', 'd4', 'd7', 'd9', 'd10', 'd12']
+        chart_types: List of chart types to retrieve (e.g., ['d1', 'd9', 'd10'])
+                     If None, returns all available divisional charts
+        chart: Optional pre-calculated chart object (for optimization)
     
     Returns:
-        Dictionary containing comprehensive chart data with all components
+        Dictionary containing requested divisional charts with planetary positions
+    """
+    # Use provided chart or calculate new one in the chart engine (always uses IST)
+    if chart is not None:
+        return _divisional_charts_from_chart(chart, date_of_birth, time_of_birth, location_name, chart_types=chart_types)
+    return await _calculate_in_engine(
+        _divisional_charts_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name,
+        chart_types=chart_types
+    )
+
+
+def _comprehensive_chart_from_chart(
+    chart: Any,
+    date_of_birth: str,
+    time_of_birth: str,
+    location_name: str,
+    years_ahead: int = 10,
+    divisional_charts: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """Extract all chart components from a single calculated chart.
+    
+    Single pass: the D1 planets and houses are walked once and every section
+    (positions, shadbala, houses, lagna, rashi, panchanga, dasha, vargas) is
+    filled from the shared lookup tables above, instead of running each
+    per-component extractor over the chart again. The payload is the same.
     """
     try:
-        # OPTIMIZATION: Calculate chart once and reuse it for all operations
-        logger.info("Calculating birth chart (optimized - single calculation, using IST)")
-        chart = _calculate_chart(date_of_birth, time_of_birth, latitude, longitude, location_name)
-        
-        # Get all components using the same chart object - check each for success
-        planetary_data = await get_planetary_positions(date_of_birth, time_of_birth, latitude, longitude, location_name, chart=chart)
-        if not planetary_data.get("success", False):
-            error_msg = planetary_data.get("error", "Unknown error getting planetary positions")
-            logger.error(f"Failed to get planetary positions: {error_msg}")
-            return {
-                "success": False,
-                "error": f"Failed to get planetary positions: {error_msg}"
-            }
+        d1_chart = chart.d1_chart
         
-        lagna_data = await get_lagna_details(date_of_birth, time_of_birth, latitude, longitude, location_name, chart=chart)
-        if not lagna_data.get("success", False):
-            error_msg = lagna_data.get("error", "Unknown error getting lagna details")
-            logger.error(f"Failed to get lagna details: {error_msg}")
-            return {
-                "success": False,
-                "error": f"Failed to get lagna details: {error_msg}"
-            }
+        # Required components - planets, lagna and houses
+        planetary_positions = {}
+        shadbala = {}
+        shadbala_ok = True
+        for i, planet in enumerate(d1_chart.planets):
+            planet_name = PLANET_NAMES[i] if i < len(PLANET_NAMES) else f"Planet_{i}"
+            planetary_positions[planet_name] = _planet_position_data(planet)
+            if shadbala_ok:
+                try:
+                    shadbala[planet_name] = _shadbala_data(planet)
+                except Exception as e:
+                    logger.error(f"Error getting Shadbala details: {e}", exc_info=True)
+                    shadbala, shadbala_ok = {}, False
         
-        house_data = await get_house_positions(date_of_birth, time_of_birth, latitude, longitude, location_name, chart=chart)
-        if not house_data.get("success", False):
-            error_msg = house_data.get("error", "Unknown error getting house positions")
-            logger.error(f"Failed to get house positions: {error_msg}")
-            return {
-                "success": False,
-                "error": f"Failed to get house positions: {error_msg}"
+        house_positions = [
+            {
+                "house": i + 1,
+                "sign": house.sign,
+                "occupants": [p.celestial_body for p in house.occupants] if hasattr(house, 'occupants') else []
             }
+            for i, house in enumerate(d1_chart.houses)
+        ]
+        
+        lagna_house = d1_chart.houses[0]
+        lagna = {
+            "sign": lagna_house.sign,
+            "sign_degrees": getattr(lagna_house, 'sign_degrees', None),
+            "longitude": getattr(lagna_house, 'longitude', None),
+            "lord": SIGN_LORDS.get(lagna_house.sign),
+            "house": 1
+        }
         
         # Optional components - continue even if they fail
-        dasha_data = await get_dasha_details(date_of_birth, time_of_birth, latitude, longitude, location_name, years_ahead, chart=chart)
-        shadbala_data = await get_shadbala_details(date_of_birth, time_of_birth, latitude, longitude, location_name, chart=chart)
+        try:
+            current_dasha, upcoming_dashas = _mahadasha_periods(chart, years_ahead)
+        except Exception as e:
+            logger.error(f"Error getting Dasha details: {e}", exc_info=True)
+            current_dasha, upcoming_dashas = None, []
         
         # Default divisional charts if not specified
         if divisional_charts is None:
-            divisional_charts = ['d1', 'd2', 'd3', 'd4', 'd7', 'd9', 'd10', 'd12']
+            divisional_charts = DEFAULT_DIVISIONAL_CHARTS
         
-        divisional_data = await get_divisional_charts(date_of_birth, time_of_birth, latitude, longitude, location_name, divisional_charts, chart=chart)
+        try:
+            divisional_data = _divisional_charts_data(chart, divisional_charts)
+        except Exception as e:
+            logger.error(f"Error getting divisional charts: {e}", exc_info=True)
+            divisional_data = {}
         
-        # Get chart summary for Panchanga
-        chart_summary = await get_chart_summary(date_of_birth, time_of_birth, latitude, longitude, location_name, chart=chart)
+        # Rashi (Moon sign) and Panchanga
+        try:
+            moon = d1_chart.planets[1]  # Moon is index 1
+            rashi = {
+                "sign": moon.sign,
+                "nakshatra": moon.nakshatra,
+                "pada": moon.pada
+            }
+            panchanga = _panchanga_data(chart)
+            ayanamsa = _ayanamsa_data(chart)
+        except Exception as e:
+            logger.error(f"Error getting chart summary: {e}", exc_info=True)
+            rashi, panchanga, ayanamsa = {}, {}, None
         
         return {
             "success": True,
-            "lagna": lagna_data.get("lagna", {}),
+            "lagna": lagna,
             "dasha": {
-                "current_dasha": dasha_data.get("current_dasha") if dasha_data.get("success") else None,
-                "upcoming_dashas": dasha_data.get("upcoming_dashas", []) if dasha_data.get("success") else []
+                "current_dasha": current_dasha,
+                "upcoming_dashas": upcoming_dashas
             },
-            "shadbala": shadbala_data.get("shadbala", {}) if shadbala_data.get("success") else {},
-            "planetary_positions": planetary_data.get("planetary_positions", {}),
-            "house_positions": house_data.get("house_details", []),
-            "divisional_charts": divisional_data.get("divisional_charts", {}) if divisional_data.get("success") else {},
-            "panchanga": chart_summary.get("panchanga", {}) if chart_summary.get("success") else {},
-            "rashi": chart_summary.get("rashi", {}) if chart_summary.get("success") else {},
-            "ayanamsa": chart_summary.get("ayanamsa"),
+            "shadbala": shadbala,
+            "planetary_positions": planetary_positions,
+            "house_positions": house_positions,
+            "divisional_charts": divisional_data,
+            "panchanga": panchanga,
+            "rashi": rashi,
+            "ayanamsa": ayanamsa,
             "birth_time": f"{date_of_birth} {time_of_birth}",
             "location": location_name
         }
@@ -898,6 +1144,109 @@ async def get_comprehensive_chart(
         }
 
 
+def _current_dasha_summary(
+    chart_data: Dict[str, Any],
+    date_of_birth: str,
+    time_of_birth: str,
+    years_ahead: int
+) -> Dict[str, Any]:
+    """Running and upcoming mahadashas as of today, from the Moon position.
+    
+    Used for every get_comprehensive_chart() result, fresh or cached (cached
+    charts store no dasha), so both return the same section.
+    """
+    from tools.dasha_engine import dasha_timeline_for_birth
+    
+    timeline = dasha_timeline_for_birth(date_of_birth, time_of_birth, chart_data=chart_data)
+    if timeline is None:
+        return {"current_dasha": None, "upcoming_dashas": []}
+    dasha = timeline.to_dict(years_ahead=years_ahead)
+    return {"current_dasha": dasha["current_dasha"], "upcoming_dashas": dasha["upcoming_dashas"]}
+
+
+async def get_comprehensive_chart(
+    date_of_birth: str,
+    time_of_birth: str,
+    latitude: float,
+    longitude: float,
+    location_name: str,
+    years_ahead: int = 10,
+    divisional_charts: Optional[List[str]] = None,
+    timezone: Optional[str] = None,
+    engine: Optional[ChartEngine] = None
+) -> Dict[str, Any]:
+    """
+    Get comprehensive chart data including Lagna, Dasha, Shadbala, and Divisional Charts.
+    This is the main tool that combines all chart calculations.
+    
+    The chart is calculated once in a chart engine worker process and all
+    components are extracted there, so the event loop is never blocked.
+    Successful results are cached by birth data (see tools/chart_cache.py),
+    so repeat requests for the same chart skip jyotishganit entirely.
+    
+    Note: All times are assumed to be in IST (Indian Standard Time, Asia/Kolkata),
+    unless a timezone is given or CHART_LOCAL_TIMEZONE is set.
+    
+    Args:
+        date_of_birth: Date in YYYY-MM-DD format
+        time_of_birth: Time in HH:MM format (24-hour) - assumed to be in IST
+        latitude: Birth location latitude
+        longitude: Birth location longitude
+        location_name: Full location name
+        years_ahead: Number of years for Dasha calculations (default: 10)
+        divisional_charts: List of divisional charts to include (e.g., ['d9', 'd10'])
+                          If None, none are extracted - use DivisionalChartSet.from_chart_data()
+                          to compute just the vargas a report needs from the D1 positions
+        timezone: IANA timezone of the birth time (default: fixed IST, or the
+                  birthplace's zone when CHART_LOCAL_TIMEZONE is set and it is
+                  known precisely)
+        engine: Chart engine to calculate in (default: the order pool)
+    
+    Returns:
+        Dictionary containing comprehensive chart data with all components,
+        including "timezone" (the zone the birth time was read in, None for IST)
+    """
+    if divisional_charts is None:
+        divisional_charts = DEFAULT_DIVISIONAL_CHARTS
+    
+    birth_time = f"{date_of_birth} {time_of_birth}"
+    try:
+        if timezone is None and AstroConfig.LocationConfig.CHART_LOCAL_TIMEZONE:
+            timezone = timezone_lookup.chart_timezone(latitude, longitude)
+        cache_key = make_chart_key(
+            date_of_birth, time_of_birth, latitude, longitude, divisional_charts, years_ahead, timezone=timezone
+        )
+    except (TypeError, ValueError):
+        # Invalid coordinates - let _calculate_chart report the validation error
+        cache_key = None
+    
+    if cache_key:
+        cached = await chart_cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Birth chart cache hit ({cache_key[:12]})")
+            result = chart_cache.with_request_fields(cached, birth_time, location_name)
+            result["dasha"] = _current_dasha_summary(result, date_of_birth, time_of_birth, years_ahead)
+            return result
+    
+    # OPTIMIZATION: Calculate chart once (in the chart engine) and reuse it for all operations
+    logger.info(f"Calculating birth chart (optimized - single calculation in chart engine, using {timezone or 'IST'})")
+    result = await _calculate_in_engine(
+        _comprehensive_chart_from_chart, date_of_birth, time_of_birth, latitude, longitude, location_name,
+        timezone=timezone,
+        engine=engine,
+        years_ahead=years_ahead,
+        divisional_charts=divisional_charts
+    )
+    
+    if result.get("success"):
+        result["timezone"] = timezone
+        # Same dasha section as a cache hit (jyotishganit's upcoming list is grouped by antardasha)
+        result["dasha"] = _current_dasha_summary(result, date_of_birth, time_of_birth, years_ahead)
+        if cache_key:
+            await chart_cache.set(cache_key, result)
+    return result
+
+
 async def get_today_date() -> Dict[str, Any]:
     """
     Get today's date in a standardized format.
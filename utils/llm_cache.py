@@ -0,0 +1,187 @@
+"""Exact-match cache for node LLM responses"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Mapping, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, message_to_dict, messages_from_dict
+
+from config import AstroConfig
+from tools.chart_cache import _DiskStore
+from utils.lru_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached response (e.g. after a message serialization change)
+LLM_CACHE_VERSION = 1
+
+
+def _message_payload(message: BaseMessage) -> Dict[str, Any]:
+    """The parts of a message that affect the response (ids and metadata excluded)."""
+    payload: Dict[str, Any] = {"type": message.type, "content": message.content}
+    tool_calls = getattr(message, "tool_calls", None)
+    if tool_calls:
+        payload["tool_calls"] = [{"name": call["name"], "args": call["args"]} for call in tool_calls]
+    if message.type == "tool":
+        payload["name"] = getattr(message, "name", None)
+    return payload
+
+
+def _model_payload(llm: Any) -> Dict[str, Any]:
+    """Model settings of a chat model or a tool-bound runnable wrapping one."""
+    model = getattr(llm, "bound", llm)
+    return {
+        "model": getattr(model, "model", None),
+        "temperature": getattr(model, "temperature", None),
+        "max_output_tokens": getattr(model, "max_output_tokens", None),
+        "bound": getattr(llm, "kwargs", None),
+    }
+
+
+class LLMResponseCache:
+    """Two-tier (memory LRU + SQLite) cache of LLM responses with per-node TTLs.
+
+    Keys hash the model settings, the node's prompt version and the full
+    message list, so any change to the chart, date or conversation misses.
+    TTLs come from LLM_CACHE_NODE_TTLS (falling back to LLM_CACHE_TTL_SECONDS);
+    0 disables caching for a node. Hits, misses and bypasses are counted per node.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl_seconds: float,
+        node_ttl_seconds: Optional[Mapping[str, float]] = None,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 20000,
+        enabled: bool = True
+    ):
+        self.enabled = enabled
+        self.default_ttl_seconds = default_ttl_seconds
+        self.node_ttl_seconds = dict(node_ttl_seconds or {})
+        self._memory = LRUCache(max_entries)
+        self._disk = _DiskStore(disk_path, disk_max_entries, table="llm_response_cache") if disk_path else None
+        self._node_stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def make_key(llm: Any, messages: Sequence[BaseMessage], prompt_version: int = 1) -> str:
+        """Hex sha256 of (model settings, prompt version, messages)."""
+        payload = {
+            "v": LLM_CACHE_VERSION,
+            "llm": _model_payload(llm),
+            "prompt_version": prompt_version,
+            "messages": [_message_payload(m) for m in messages],
+        }
+        encoded = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, node: str) -> float:
+        return self.node_ttl_seconds.get(node, self.default_ttl_seconds)
+
+    def _count(self, node: str, outcome: str) -> None:
+        counters = self._node_stats.setdefault(node, {"hits": 0, "misses": 0, "bypassed": 0})
+        counters[outcome] += 1
+
+    async def _lookup(self, key: str, ttl: float) -> Optional[BaseMessage]:
+        entry = self._memory.get(key)
+        if entry is None and self._disk is not None:
+            try:
+                entry = await asyncio.to_thread(self._disk.get, key)
+            except Exception as e:
+                logger.warning(f"LLM cache disk lookup failed: {e}")
+                return None
+            if entry is not None:
+                self._memory.set(key, entry)
+        if entry is None or time.time() - entry["created_at"] > ttl:
+            return None
+        return messages_from_dict([entry["message"]])[0]
+
+    async def _store(self, key: str, response: BaseMessage) -> None:
+        entry = {"message": message_to_dict(response), "created_at": time.time()}
+        self._memory.set(key, entry)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.set, key, entry)
+            except Exception as e:
+                logger.warning(f"LLM cache disk write failed: {e}")
+
+    async def ainvoke(
+        self,
+        node: str,
+        llm: Any,
+        messages: Sequence[BaseMessage],
+        prompt_version: int = 1,
+        bypass: bool = False
+    ) -> BaseMessage:
+        """llm.ainvoke(messages), answered from the cache when an identical call is fresh.
+
+        Args:
+            node: Node name, used for its TTL and hit-rate counters
+            llm: Chat model (or tool-bound runnable) to call on a miss
+            messages: Full message list sent to the model
+            prompt_version: The node's system prompt version (bump when the prompt changes meaning)
+            bypass: Skip the lookup and the store for this call
+
+        Returns:
+            Model response message
+        """
+        ttl = self.ttl_for(node)
+        if bypass or not self.enabled or ttl <= 0:
+            self._count(node, "bypassed")
+            return await llm.ainvoke(messages)
+
+        key = self.make_key(llm, messages, prompt_version)
+        cached = await self._lookup(key, ttl)
+        if cached is not None:
+            self._count(node, "hits")
+            logger.debug(f"LLM cache hit for {node}")
+            return cached
+
+        self._count(node, "misses")
+        response = await llm.ainvoke(messages)
+        if response.content or getattr(response, "tool_calls", None):
+            await self._store(key, response)
+        return response
+
+    def clear(self) -> None:
+        """Drop the in-memory tier (the disk tier is left intact)."""
+        self._memory.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-node hit rates plus the memory tier counters."""
+        nodes = {}
+        for node, counters in sorted(self._node_stats.items()):
+            lookups = counters["hits"] + counters["misses"]
+            nodes[node] = {**counters, "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0}
+        stats = {"enabled": self.enabled, "memory": self._memory.stats(), "nodes": nodes}
+        if self._disk is not None:
+            stats["disk"] = {"path": self._disk.path, "evictions": self._disk.evictions}
+        return stats
+
+
+def _parse_node_ttls(spec: str) -> Dict[str, float]:
+    """Parse "router=604800,chat=0" into {node: seconds}."""
+    ttls = {}
+    for item in spec.split(","):
+        node, _, seconds = item.partition("=")
+        if node.strip() and seconds.strip():
+            ttls[node.strip()] = float(seconds)
+    return ttls
+
+
+# Global LLM response cache instance
+llm_cache = LLMResponseCache(
+    max_entries=AstroConfig.LLMCacheConfig.LLM_CACHE_MAX_ENTRIES,
+    default_ttl_seconds=AstroConfig.LLMCacheConfig.LLM_CACHE_TTL_SECONDS,
+    node_ttl_seconds=_parse_node_ttls(AstroConfig.LLMCacheConfig.LLM_CACHE_NODE_TTLS),
+    disk_path=(
+        os.path.join(AstroConfig.AppSettings.CACHE_DIR, "llm_cache.sqlite3")
+        if AstroConfig.LLMCacheConfig.LLM_CACHE_DISK_ENABLED else None
+    ),
+    disk_max_entries=AstroConfig.LLMCacheConfig.LLM_CACHE_DISK_MAX_ENTRIES,
+    enabled=AstroConfig.LLMCacheConfig.LLM_CACHE_ENABLED,
+)
@@ -0,0 +1,187 @@
+"""Process-wide registry of Gemini chat clients"""
+
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Sequence, Tuple
+
+import utils.llm_init  # noqa: F401 - resolves ChatGoogleGenerativeAI forward references
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from config import AstroConfig
+
+logger = logging.getLogger(__name__)
+
+RegistryKey = Tuple[str, float, int, Optional[Hashable]]
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _finish_close(closing: Awaitable) -> None:
+    try:
+        await closing
+    except Exception as e:
+        logger.warning(f"Failed to close LLM client transport: {e}")
+
+
+def _close_transports(client: Any) -> Optional[Awaitable]:
+    """Close a client's sync transport and start closing its async one.
+
+    Returns:
+        The async transport's pending close, if it has to be awaited
+    """
+    if not isinstance(client, ChatGoogleGenerativeAI):
+        return None  # tool-bound runnables share the base client's transports
+    closing = None
+    try:
+        if client.async_client is not None:
+            closing = client.async_client.transport.close()
+        client.client.transport.close()
+    except Exception as e:
+        logger.warning(f"Failed to close LLM client transport: {e}")
+    return closing if inspect.isawaitable(closing) else None
+
+
+class LLMRegistry:
+    """Shared ChatGoogleGenerativeAI instances (and their tool-bound runnables).
+
+    One client per (model, temperature, max_tokens, tool binding), so nodes
+    with the same settings share a gRPC channel instead of paying for a new
+    connection per call. Async clients are bound to their event loop, so an
+    entry requested from another loop is rebuilt. main.py calls warm() at
+    startup and close() at shutdown.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[RegistryKey, Tuple[Any, Optional[asyncio.AbstractEventLoop]]] = {}
+        self._created = 0
+        self._reused = 0
+
+    @staticmethod
+    def make_key(
+        model: Optional[str] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        tools_key: Optional[Hashable] = None
+    ) -> RegistryKey:
+        """Registry key, with unset values taken from the Gemini settings in config."""
+        return (
+            model or AstroConfig.AppSettings.GEMINI_MODEL,
+            AstroConfig.AppSettings.GEMINI_TEMPERATURE if temperature is None else float(temperature),
+            AstroConfig.AppSettings.GEMINI_MAX_TOKENS if max_tokens is None else int(max_tokens),
+            tools_key,
+        )
+
+    def get(
+        self,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        model: Optional[str] = None,
+        tools_key: Optional[Hashable] = None,
+        tools: Optional[Callable[[], Sequence[Any]]] = None
+    ) -> Any:
+        """Shared client for these settings, created on first use.
+
+        Args:
+            temperature: Sampling temperature (default GEMINI_TEMPERATURE)
+            max_tokens: Output token limit (default GEMINI_MAX_TOKENS)
+            model: Gemini model name (default GEMINI_MODEL)
+            tools_key: Name of the tool set bound to the client (None for no tools)
+            tools: Factory for the tools to bind; only called when the entry is created
+
+        Returns:
+            ChatGoogleGenerativeAI, or the runnable returned by bind_tools() when tools_key is set
+        """
+        key = self.make_key(model, temperature, max_tokens, tools_key)
+        loop = _running_loop()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (entry[1] is loop or loop is None):
+                self._reused += 1
+                return entry[0]
+
+            if tools_key is not None:
+                if tools is None:
+                    raise ValueError(f"tools factory required to create LLM client with tools_key={tools_key!r}")
+                client = self._get_base(key[:3] + (None,), loop).bind_tools(tools())
+            else:
+                client = self._create(key)
+            self._store(key, client, loop)
+            return client
+
+    def _get_base(self, key: RegistryKey, loop: Optional[asyncio.AbstractEventLoop]) -> ChatGoogleGenerativeAI:
+        """Untooled client for a key (caller holds the lock)."""
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] is loop:
+            return entry[0]
+        client = self._create(key)
+        self._store(key, client, loop)
+        return client
+
+    def _store(self, key: RegistryKey, client: Any, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Add an entry (caller holds the lock), closing the transports of the one it replaces."""
+        replaced = self._entries.get(key)
+        self._entries[key] = (client, loop)
+        if replaced is None:
+            return
+
+        old_client, old_loop = replaced
+        closing = _close_transports(old_client)
+        if closing is None:
+            return
+        # A grpc.aio channel can only be closed on the loop it was created on
+        if old_loop is not None and not old_loop.is_closed():
+            asyncio.run_coroutine_threadsafe(_finish_close(closing), old_loop)
+        elif inspect.iscoroutine(closing):
+            closing.close()  # its loop is gone, and the channel with it
+
+    def _create(self, key: RegistryKey) -> ChatGoogleGenerativeAI:
+        model, temperature, max_tokens, _ = key
+        self._created += 1
+        logger.debug(f"Creating LLM client: model={model}, temperature={temperature}, max_tokens={max_tokens}")
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            google_api_key=AstroConfig.AppSettings.GOOGLE_AI_API_KEY,
+        )
+
+    def warm(self, settings: Sequence[Dict[str, Any]] = ({},)) -> int:
+        """Create clients ahead of the first request (call from the server's event loop).
+
+        Args:
+            settings: Keyword arguments for get() per client to create
+
+        Returns:
+            Number of clients in the registry
+        """
+        for kwargs in settings:
+            self.get(**kwargs)
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"clients": len(self._entries), "created": self._created, "reused": self._reused}
+
+    async def close(self) -> None:
+        """Close every client's transports and empty the registry."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+
+        for client, _ in entries:
+            closing = _close_transports(client)
+            if closing is not None:
+                await _finish_close(closing)
+
+
+# Global LLM client registry
+llm_registry = LLMRegistry()